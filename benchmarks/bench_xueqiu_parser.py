@@ -0,0 +1,106 @@
+"""
+雪球页面解析微基准
+比较正则快速解析（parse_price）和完整 DOM 解析（_parse_price_dom）在保存的页面上的耗时
+
+pages/ 中自带的 synthetic_*.html 是按雪球个股页结构整理的合成页面，只用于粗略比较两种解析的开销；
+快速解析在真实页面上的正确性和耗时需要先用 --record 保存真实页面（xueqiu_<代码>.html）再运行。
+
+运行:
+    python benchmarks/bench_xueqiu_parser.py --record SZ159915 SH510300
+    python benchmarks/bench_xueqiu_parser.py
+    python benchmarks/bench_xueqiu_parser.py --pages 目录 --repeat 200
+"""
+import argparse
+import asyncio
+import sys
+import timeit
+from pathlib import Path
+from typing import List
+
+# 允许直接运行本脚本
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.crawler import XueqiuCrawler  # noqa: E402
+
+DEFAULT_PAGES_DIR = Path(__file__).resolve().parent / 'pages'
+
+
+def measure(func, repeat: int) -> float:
+    """多次运行取最快一轮的平均耗时（秒），减少系统抖动的影响"""
+    number = max(1, repeat // 5)
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def format_duration(seconds: float) -> str:
+    """格式化耗时，如 12.3 µs、45.6 ms"""
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} µs"
+    return f"{seconds * 1e3:.2f} ms"
+
+
+def record_pages(crawler: XueqiuCrawler, etf_codes: List[str], pages_dir: Path) -> int:
+    """
+    从雪球下载真实页面保存到页面目录
+
+    参数:
+        crawler: 雪球爬虫
+        etf_codes: ETF代码列表
+        pages_dir: 页面目录
+
+    返回:
+        失败的数量
+    """
+    pages_dir.mkdir(parents=True, exist_ok=True)
+    failed = 0
+    for etf_code in etf_codes:
+        html = asyncio.run(crawler.fetch_page(etf_code))
+        if not html:
+            print(f"下载失败: {etf_code}")
+            failed += 1
+            continue
+        path = pages_dir / f"xueqiu_{etf_code}.html"
+        path.write_text(html, encoding='utf-8')
+        print(f"已保存: {path} ({len(html) / 1024:.0f}KB)")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="雪球页面解析微基准")
+    parser.add_argument('--pages', default=str(DEFAULT_PAGES_DIR),
+                        help="保存的页面目录（*.html，文件名为 xueqiu_<代码>.html，synthetic_<代码>.html 为合成页面）")
+    parser.add_argument('--repeat', type=int, default=100, help="每种解析方式的运行次数")
+    parser.add_argument('--record', nargs='+', metavar='代码', help="先下载这些ETF的真实页面保存到页面目录")
+    args = parser.parse_args()
+
+    crawler = XueqiuCrawler()
+    if args.record and record_pages(crawler, args.record, Path(args.pages)):
+        return 1
+
+    pages = sorted(Path(args.pages).glob('*.html'))
+    if not pages:
+        print(f"没有找到页面: {args.pages}")
+        return 1
+
+    print(f"{'页面':<32}{'大小':>10}{'快速解析':>14}{'DOM解析':>14}{'加速':>10}  价格")
+
+    for page in pages:
+        html = page.read_text(encoding='utf-8')
+        etf_code = page.stem.split('_')[-1]
+
+        fast_price = crawler.parse_price(html, etf_code)
+        dom_price = crawler._parse_price_dom(html, etf_code)
+        if fast_price != dom_price:
+            print(f"  警告: {page.name} 两种解析结果不一致: {fast_price} != {dom_price}")
+
+        fast = measure(lambda: crawler.parse_price(html, etf_code), args.repeat)
+        dom = measure(lambda: crawler._parse_price_dom(html, etf_code), max(5, args.repeat // 10))
+
+        print(f"{page.name:<32}{len(html) / 1024:>8.0f}KB{format_duration(fast):>14}"
+              f"{format_duration(dom):>14}{dom / fast:>9.0f}x  {fast_price}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,384 @@
+"""
+性能基准套件
+在 10 / 1k / 100k 行的合成数据上测量存储、解析和分析的耗时，结果保存为 JSON，可与基线对比
+
+覆盖:
+    - 表存储 read_all / count / append / next_id，价格历史的写入和范围查询（CSV 或 SQLite 后端）
+    - ETFListStorage.get_all_etfs / etf_exists / get_etf_name（观察列表）
+    - ETFTransactionStorage.get_all_etf_transactions / save_etf_transaction（交易数据）
+    - 腾讯、东方财富响应解析
+    - check_date_range、process_group_trading_analysis
+
+运行:
+    python benchmarks/run_benchmarks.py                          # 运行并保存到 benchmarks/results/latest.json
+    python benchmarks/run_benchmarks.py --save-baseline          # 同时保存为基线
+    python benchmarks/run_benchmarks.py --compare                # 运行并与基线对比，变慢超过阈值时返回 1
+    python benchmarks/run_benchmarks.py --compare --from 结果.json # 不运行，直接对比已保存的结果
+    python benchmarks/run_benchmarks.py --sizes 10,1000 --only storage
+    python benchmarks/run_benchmarks.py --backend sqlite --compare  # 用 SQLite 后端运行，与 CSV 的基线对比
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+# 允许直接运行本脚本
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+DEFAULT_SIZES = (10, 1000, 100000)
+
+PRICE_FIELDS = ['id', 'etf_code', 'etf_name', 'price', 'record_time', 'created_at']
+ETF_LIST_FIELDS = ['etf_code', 'etf_name', 'url', 'group', 'added_at']
+TRANSACTION_FIELDS = ['etf_code', 'transaction_price', 'transaction_quantity', 'updated_at']
+
+
+def measure(func: Callable, repeat: int, min_round: float = 0.05) -> float:
+    """
+    多次运行取最快一轮的平均耗时（秒），减少系统抖动的影响
+
+    参数:
+        func: 被测函数
+        repeat: 轮数
+        min_round: 每轮最短耗时（秒），据此决定每轮调用次数
+    """
+    single = timeit.timeit(func, number=1)
+    number = max(1, int(min_round / single)) if single > 0 else 1000
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def format_duration(seconds: float) -> str:
+    """格式化耗时，如 12.3 µs、45.6 ms、1.23 s"""
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+
+# ---------------------------------------------------------------------------
+# 合成数据
+# ---------------------------------------------------------------------------
+
+def make_codes(size: int) -> List[Tuple[str, str]]:
+    """生成 (ETF代码, 组别)，每 4 只中有 1 只美股"""
+    codes = []
+    for index in range(size):
+        if index % 4 == 3:
+            codes.append((f"US{index:06d}", '美股'))
+        else:
+            prefix = 'SH' if index % 2 == 0 else 'SZ'
+            codes.append((f"{prefix}{500000 + index:06d}", 'A股'))
+    return codes
+
+
+def write_csv(path: Path, fieldnames: List[str], rows: List[Dict]):
+    import csv
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def generate_data(size: int, rng: random.Random) -> Dict:
+    """
+    生成观察列表、交易数据和价格历史文件（写到 CSV_FILES 指向的临时数据目录），并返回内存中的数据。
+    使用 SQLite 后端时再把这些文件迁移到数据库
+
+    返回:
+        {'codes': [...], 'prices': {代码: 价格}, 'transactions': {代码: 上次交易价}}
+    """
+    from config.app import CSV_FILES, STORAGE_CONFIG
+
+    codes = make_codes(size)
+    prices = {code: round(rng.uniform(0.5, 200), 3) for code, _ in codes}
+    # 约一半的ETF有交易数据，交易价在当前价 ±12% 内，覆盖各个提醒区间
+    transactions = {
+        code: round(prices[code] * rng.uniform(0.88, 1.12), 3)
+        for code, _ in codes if rng.random() < 0.5
+    }
+
+    write_csv(Path(CSV_FILES['etf_list']), ETF_LIST_FIELDS, [
+        {'etf_code': code, 'etf_name': f"合成ETF{index}", 'url': f"https://xueqiu.com/S/{code}",
+         'group': group, 'added_at': '2024-01-01 09:30:00'}
+        for index, (code, group) in enumerate(codes)
+    ])
+    write_csv(Path(CSV_FILES['user_transactions']), TRANSACTION_FIELDS, [
+        {'etf_code': code, 'transaction_price': price, 'transaction_quantity': 100 * rng.randint(1, 50),
+         'updated_at': '2024-01-01 15:00:00'}
+        for code, price in transactions.items()
+    ])
+    write_csv(Path(CSV_FILES['price_history']), PRICE_FIELDS, [
+        {'id': index + 1, 'etf_code': code, 'etf_name': f"合成ETF{index}", 'price': prices[code],
+         'record_time': f"2024-01-{1 + index % 28:02d} {index % 24:02d}:00:00",
+         'created_at': f"2024-01-{1 + index % 28:02d} {index % 24:02d}:00:00"}
+        for index, (code, _) in enumerate(codes)
+    ])
+    if STORAGE_CONFIG['backend'] == 'sqlite':
+        from src.storage_sqlite import migrate_csv_to_sqlite
+        migrate_csv_to_sqlite(overwrite=True)
+    return {'codes': codes, 'prices': prices, 'transactions': transactions}
+
+
+def tencent_line(code: str, name: str, price: float) -> str:
+    """生成一行腾讯API响应"""
+    fields = [''] * 50
+    fields[0] = '1'
+    fields[1] = name
+    fields[2] = code[2:]
+    fields[3] = f"{price:.3f}"
+    fields[4] = f"{price * 0.99:.3f}"
+    fields[5] = f"{price * 0.995:.3f}"
+    fields[9] = f"{price * 0.999:.3f}"
+    fields[19] = f"{price * 1.001:.3f}"
+    fields[30] = '20240102150000'
+    fields[33] = f"{price * 1.01:.3f}"
+    fields[34] = f"{price * 0.98:.3f}"
+    fields[36] = '123456'
+    fields[37] = '7890.12'
+    return f'v_{code.lower()}="{"~".join(fields)}";'
+
+
+def eastmoney_item(code: str, price: float) -> Dict:
+    """生成东方财富接口中单只证券的字段（fltt=2，价格为浮点数）"""
+    return {
+        'f12': code[2:], 'f13': 1 if code.startswith('SH') else 0, 'f14': code,
+        'f2': price, 'f18': round(price * 0.99, 3), 'f17': round(price * 0.995, 3),
+        'f15': round(price * 1.01, 3), 'f16': round(price * 0.98, 3), 'f5': 123456, 'f6': 7.89e7,
+        'f31': round(price * 0.999, 3), 'f32': round(price * 1.001, 3), 'f124': 1704178800
+    }
+
+
+def eastmoney_single(price: float) -> Dict:
+    """生成东方财富单只行情接口（stock/get）的响应，价格为整数（×1000）"""
+    raw = int(price * 1000)
+    return {
+        'rc': 0,
+        'data': {
+            'f43': raw, 'f60': int(raw * 0.99), 'f46': int(raw * 0.995), 'f44': int(raw * 1.01),
+            'f45': int(raw * 0.98), 'f47': 123456, 'f48': 7.89e7, 'f19': raw - 1, 'f39': raw + 1,
+            'f86': 1704178800
+        }
+    }
+
+
+# ---------------------------------------------------------------------------
+# 基准用例
+# ---------------------------------------------------------------------------
+
+def build_cases(size: int, data: Dict, workdir: Path) -> List[Tuple[str, Callable]]:
+    """
+    构建某个规模下的基准用例
+
+    返回:
+        [(用例名称, 被测函数), ...]
+    """
+    from src.storage import price_storage, etf_list_storage, etf_transaction_storage, CSVStorage
+    from config.app import STORAGE_CONFIG
+    from src.calculator import check_date_range
+    from src.crawler_tencent import TencentCrawler
+    from src.crawler_eastmoney import EastMoneyCrawler
+    from main import process_group_trading_analysis
+
+    codes = data['codes']
+    prices = data['prices']
+    transactions = data['transactions']
+    a_share = [code for code, group in codes if group == 'A股']
+    last_code = codes[-1][0]
+
+    # CSV 的追加写在副本上进行，不影响其他用例的数据规模（SQLite 追加的行数相对于表很小，直接写入）
+    table = price_storage.table
+    append_table = table
+    if STORAGE_CONFIG['backend'] == 'csv':
+        append_path = workdir / f"append_{size}.csv"
+        shutil.copy(table.file_path, append_path)
+        append_table = CSVStorage(str(append_path))
+    append_row = {'id': None, 'etf_code': last_code, 'etf_name': '合成ETF', 'price': 1.0,
+                  'record_time': '2024-02-01 09:30:00', 'created_at': '2024-02-01 09:30:00'}
+
+    tencent = TencentCrawler()
+    eastmoney = EastMoneyCrawler()
+    tencent_response = '\n'.join(tencent_line(code, f"合成ETF{index}", prices[code]) for index, code in enumerate(a_share))
+    tencent_lines = tencent._split_batch_response(tencent_response)
+    tencent_items = [(line, code) for code, line in zip(a_share, tencent_lines.values())]
+    eastmoney_payloads = [(eastmoney_single(prices[code]), code) for code in a_share]
+    eastmoney_batch = {'rc': 0, 'data': {'diff': [eastmoney_item(code, prices[code]) for code in a_share]}}
+
+    price_pairs = [(prices[code], price) for code, price in transactions.items()]
+    etf_list = {code: {'code': code, 'name': f"合成ETF{index}", 'url': '', 'group': group}
+                for index, (code, group) in enumerate(codes)}
+    transaction_data = {code: {'code': code, 'price': price, 'quantity': 100} for code, price in transactions.items()}
+    current_prices = {code: {'price': price, 'name': code, 'quote_info': None} for code, price in prices.items()}
+
+    return [
+        ('storage.table.read_all', table.read_all),
+        ('storage.table.count', table.count),
+        ('storage.table.append', lambda: append_table.append(append_row, PRICE_FIELDS)),
+        ('storage.table.next_id', table.next_id),
+        ('storage.price_history.range', lambda: price_storage.get_history_between(
+            '2024-01-08 00:00:00', '2024-01-14 23:59:59', etf_code=last_code)),
+        ('storage.etf_list.get_all_etfs', etf_list_storage.get_all_etfs),
+        ('storage.etf_list.get_all_etfs_group', lambda: etf_list_storage.get_all_etfs(group='美股')),
+        ('storage.etf_list.etf_exists', lambda: etf_list_storage.etf_exists(last_code)),
+        ('storage.etf_list.get_etf_name', lambda: etf_list_storage.get_etf_name(last_code)),
+        ('storage.transactions.get_all', etf_transaction_storage.get_all_etf_transactions),
+        ('storage.transactions.save', lambda: etf_transaction_storage.save_etf_transaction(last_code, 1.0, 100)),
+        ('parse.tencent.split_batch', lambda: tencent._split_batch_response(tencent_response)),
+        ('parse.tencent.quote', lambda: [tencent._parse_quote_from_response(line, code) for line, code in tencent_items]),
+        ('parse.eastmoney.quote', lambda: [eastmoney._parse_quote_from_api(payload, code, name=code)
+                                           for payload, code in eastmoney_payloads]),
+        ('parse.eastmoney.batch', lambda: eastmoney._parse_quotes_from_batch_api(eastmoney_batch)),
+        ('analysis.check_date_range', lambda: [check_date_range(current, last) for current, last in price_pairs]),
+        ('analysis.process_group', lambda: process_group_trading_analysis(etf_list, transaction_data, current_prices)),
+        # 写入价格历史，放在最后，不影响其他用例的数据规模
+        ('storage.price_history.add', lambda: price_storage.add_price_record(last_code, '合成ETF', 1.0)),
+    ]
+
+
+def run(sizes: List[int], repeat: int, only: str = None, seed: int = 42) -> Dict:
+    """
+    运行全部基准
+
+    返回:
+        {'meta': {...}, 'results': {用例名称: {规模: 每次调用耗时（秒）}}}
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    workdir = Path(os.environ['DATA_DIR'])
+
+    for size in sizes:
+        print(f"\n规模 {size} 行:")
+        data = generate_data(size, random.Random(seed))
+        for name, func in build_cases(size, data, workdir):
+            if only and only not in name:
+                continue
+            seconds = measure(func, repeat)
+            results.setdefault(name, {})[str(size)] = seconds
+            print(f"  {name:<40}{format_duration(seconds):>12}{format_duration(seconds / size):>12}/行")
+
+    return {'meta': collect_meta(sizes, repeat, seed), 'results': results}
+
+
+def collect_meta(sizes: List[int], repeat: int, seed: int) -> Dict:
+    """记录运行环境，便于判断两份结果是否可比"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sizes': sizes,
+        'repeat': repeat,
+        'seed': seed,
+        'backend': os.environ.get('STORAGE_BACKEND', 'csv')
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> int:
+    """
+    对比两份结果，打印每个用例、每个规模的耗时变化
+
+    参数:
+        current: 本次结果
+        baseline: 基线结果
+        threshold: 变慢超过该比例（如 0.2 表示 20%）视为退化
+
+    返回:
+        退化的用例数
+    """
+    base_meta = baseline.get('meta', {})
+    print(f"\n与基线对比（基线: {base_meta.get('created_at')}，提交 {base_meta.get('commit')}，"
+          f"后端 {base_meta.get('backend', 'csv')} -> {current['meta'].get('backend', 'csv')}；阈值 +{threshold:.0%}）")
+    print(f"{'用例':<40}{'规模':>8}{'基线':>12}{'本次':>12}{'变化':>10}")
+
+    regressions = 0
+    for name, by_size in current['results'].items():
+        for size, seconds in by_size.items():
+            base = baseline.get('results', {}).get(name, {}).get(size)
+            if base is None:
+                print(f"{name:<40}{size:>8}{'-':>12}{format_duration(seconds):>12}{'新增':>10}")
+                continue
+            change = seconds / base - 1
+            mark = ''
+            if change > threshold:
+                regressions += 1
+                mark = '  退化'
+            elif change < -threshold:
+                mark = '  提升'
+            print(f"{name:<40}{size:>8}{format_duration(base):>12}{format_duration(seconds):>12}{change:>+10.0%}{mark}")
+
+    if regressions:
+        print(f"\n有 {regressions} 项变慢超过 {threshold:.0%}")
+    else:
+        print("\n没有超过阈值的退化")
+    return regressions
+
+
+def save(result: Dict, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"结果已保存: {path}")
+
+
+def parse_sizes(value: str) -> List[int]:
+    return [int(size) for size in value.split(',') if size.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="存储、解析和分析的性能基准")
+    parser.add_argument('--sizes', type=parse_sizes, default=list(DEFAULT_SIZES), help="数据规模（行数），逗号分隔")
+    parser.add_argument('--repeat', type=int, default=5, help="每个用例的测量轮数，取最快一轮")
+    parser.add_argument('--backend', choices=['csv', 'sqlite'], default='csv', help="存储后端")
+    parser.add_argument('--only', help="只运行名称中包含该字符串的用例，如 storage、parse.tencent")
+    parser.add_argument('--seed', type=int, default=42, help="合成数据的随机种子")
+    parser.add_argument('--output', default=str(RESULTS_DIR / 'latest.json'), help="结果文件")
+    parser.add_argument('--baseline', default=str(RESULTS_DIR / 'baseline.json'), help="基线文件")
+    parser.add_argument('--save-baseline', action='store_true', help="同时把结果保存为基线")
+    parser.add_argument('--compare', action='store_true', help="与基线对比，有退化时返回 1")
+    parser.add_argument('--from', dest='from_file', help="不运行基准，直接用已保存的结果与基线对比")
+    parser.add_argument('--threshold', type=float, default=0.2, help="退化阈值（比例），默认 0.2")
+    args = parser.parse_args()
+
+    if args.from_file:
+        result = json.loads(Path(args.from_file).read_text(encoding='utf-8'))
+    else:
+        # 合成数据写到临时目录；必须在导入项目模块之前设置，config 在导入时读取环境变量
+        workdir = tempfile.mkdtemp(prefix='etf_bench_')
+        os.environ['DATA_DIR'] = workdir
+        os.environ['LOG_DIR'] = workdir
+        os.environ.setdefault('LOG_LEVEL', 'WARNING')
+        os.environ['LOG_ENQUEUE'] = 'false'
+        os.environ['STORAGE_BACKEND'] = args.backend
+        try:
+            result = run(args.sizes, args.repeat, args.only, args.seed)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        save(result, Path(args.output))
+        if args.save_baseline:
+            save(result, Path(args.baseline))
+
+    if args.compare:
+        baseline_path = Path(args.baseline)
+        if not baseline_path.exists():
+            print(f"没有找到基线文件: {baseline_path}，可先使用 --save-baseline 保存")
+            return 1
+        baseline = json.loads(baseline_path.read_text(encoding='utf-8'))
+        return 1 if compare(result, baseline, args.threshold) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
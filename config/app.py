@@ -15,9 +15,12 @@ PROJECT_ROOT = Path(__file__).parent.parent
 data_dir = os.getenv('DATA_DIR', './data')
 log_dir = os.getenv('LOG_DIR', './logs')
 
-# 确保目录存在
-Path(data_dir).mkdir(exist_ok=True)
-Path(log_dir).mkdir(exist_ok=True)
+
+def ensure_directories():
+    """创建数据目录和日志目录（由程序入口调用，导入配置时不创建目录）"""
+    Path(data_dir).mkdir(parents=True, exist_ok=True)
+    Path(log_dir).mkdir(parents=True, exist_ok=True)
+
 
 # ETF 配置（支持多只ETF）
 ETF_CONFIG = {
@@ -112,16 +115,144 @@ CSV_FILES = {
     'etf_list': os.path.join(data_dir, os.getenv('ETF_LIST_FILE', 'etf_list.csv'))
 }
 
+# 存储后端配置
+STORAGE_CONFIG = {
+    'backend': os.getenv('STORAGE_BACKEND', 'csv').lower(),  # csv: 每张表一个CSV文件; sqlite: 单个SQLite数据库
+    'sqlite_file': os.path.join(data_dir, os.getenv('SQLITE_FILE', 'etf_tracker.db')),
+    'sqlite_timeout': float(os.getenv('SQLITE_TIMEOUT', '10'))  # 等待其他进程释放写锁的时间（秒）
+}
+
 # HTTP 配置
 HTTP_CONFIG = {
     'user_agent': os.getenv('USER_AGENT', 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'),
     'timeout': int(os.getenv('REQUEST_TIMEOUT', '30')),
-    'delay': float(os.getenv('REQUEST_DELAY', '1.0'))
+    'batch_size': int(os.getenv('BATCH_SIZE', '60')),  # 批量请求时每个请求包含的最大代码数
+    'max_concurrency': int(os.getenv('MAX_CONCURRENCY', '8')),  # 并发获取时同时进行的最大请求数
+    # 连接池配置（每个主机一个长连接池）
+    'max_connections': int(os.getenv('HTTP_MAX_CONNECTIONS', '20')),
+    'max_keepalive_connections': int(os.getenv('HTTP_MAX_KEEPALIVE', '10')),
+    'keepalive_expiry': float(os.getenv('HTTP_KEEPALIVE_EXPIRY', '60'))
+}
+
+# 数据源地址（可指向本地行情模拟服务 src/quote_stub_server.py，用于离线压测）
+# QUOTE_STUB_URL 同时覆盖全部数据源，单独设置的地址优先
+_quote_stub_url = os.getenv('QUOTE_STUB_URL', '').rstrip('/')
+ENDPOINT_CONFIG = {
+    'tencent': os.getenv('TENCENT_BASE_URL', _quote_stub_url or 'https://qt.gtimg.cn').rstrip('/'),
+    'eastmoney': os.getenv('EASTMONEY_BASE_URL', _quote_stub_url or 'https://push2.eastmoney.com').rstrip('/'),
+    'eastmoney_search': os.getenv('EASTMONEY_SEARCH_URL', _quote_stub_url or 'https://searchapi.eastmoney.com').rstrip('/'),
+    'yahoo': os.getenv('YAHOO_BASE_URL', _quote_stub_url or 'https://query1.finance.yahoo.com').rstrip('/')
+}
+
+
+def _parse_host_limits(value: str) -> dict:
+    """
+    解析按主机覆盖的限流配置
+
+    格式: "主机=每秒请求数:突发请求数"，多个主机用逗号分隔，
+    如 "qt.gtimg.cn=10:20,push2.eastmoney.com=5:10"
+    """
+    limits = {}
+    for item in value.split(','):
+        if '=' not in item:
+            continue
+        host, limit = item.split('=', 1)
+        rate, _, burst = limit.partition(':')
+        limits[host.strip()] = (float(rate), int(burst or float(rate)))
+    return limits
+
+
+# 限流配置（按主机的令牌桶，所有爬虫共享）
+RATE_LIMIT_CONFIG = {
+    'rate': float(os.getenv('RATE_LIMIT_RATE', '5')),  # 每个主机每秒请求数，0 表示不限流
+    'burst': int(os.getenv('RATE_LIMIT_BURST', '10')),  # 每个主机允许的突发请求数
+    'hosts': _parse_host_limits(os.getenv('RATE_LIMIT_HOSTS', ''))  # 按主机覆盖
+}
+
+# 对冲请求配置：主数据源超过历史延迟分位数仍未返回时，并行请求备用数据源，先返回有效价格者胜出
+# （单只请求和批量请求分别统计延迟，批量获取时两边结果合并）
+HEDGE_CONFIG = {
+    'enabled': os.getenv('HEDGE_ENABLED', 'false').lower() == 'true',
+    'percentile': float(os.getenv('HEDGE_PERCENTILE', '95')),  # 触发对冲的延迟分位数
+    'min_delay': float(os.getenv('HEDGE_MIN_DELAY', '0.2')),  # 对冲等待时间下限（秒）
+    'default_delay': float(os.getenv('HEDGE_DEFAULT_DELAY', '2.0')),  # 样本不足时的等待时间（秒）
+    'window': int(os.getenv('HEDGE_WINDOW', '200')),  # 统计延迟的最近样本数
+    'min_samples': int(os.getenv('HEDGE_MIN_SAMPLES', '20'))  # 使用分位数前需要的最少样本数
+}
+
+# 熔断器配置：数据源最近错误率过高时暂时跳过，冷却后放行一个探测请求
+CIRCUIT_BREAKER_CONFIG = {
+    'window': int(os.getenv('BREAKER_WINDOW', '20')),  # 统计错误率的最近请求数
+    'failure_threshold': float(os.getenv('BREAKER_FAILURE_THRESHOLD', '0.5')),  # 触发熔断的错误率
+    'min_calls': int(os.getenv('BREAKER_MIN_CALLS', '5')),  # 计算错误率前需要的最少请求数
+    'open_seconds': float(os.getenv('BREAKER_OPEN_SECONDS', '60'))  # 熔断持续时间（秒）
+}
+
+# 行情缓存配置：新鲜期内直接使用缓存，过期后在可用期内先返回旧价格并后台刷新
+QUOTE_CACHE_CONFIG = {
+    'ttl': float(os.getenv('QUOTE_CACHE_TTL', '30')),  # 新鲜期（秒）
+    'stale_ttl': float(os.getenv('QUOTE_CACHE_STALE_TTL', '300')),  # 过期后仍可先返回的时间（秒）
+    'max_size': int(os.getenv('QUOTE_CACHE_MAX_SIZE', '1000'))  # 最多缓存的ETF数量
+}
+
+# 交易时段配置：休市期间使用收盘后缓存的价格，不再重复请求
+MARKET_CALENDAR_CONFIG = {
+    'enabled': os.getenv('MARKET_HOURS_ENABLED', 'true').lower() == 'true',
+    'holidays_file': os.path.join(data_dir, os.getenv('MARKET_HOLIDAYS_FILE', 'market_holidays.csv'))
+}
+
+# 东方财富美股市场代码缓存（市场代码几乎不会变化，默认缓存30天）
+SECID_CACHE_CONFIG = {
+    'file': os.path.join(data_dir, os.getenv('SECID_CACHE_FILE', 'eastmoney_secids.json')),
+    'ttl_days': float(os.getenv('SECID_CACHE_TTL_DAYS', '30'))
+}
+
+# 监控模式配置（python main.py watch）
+WATCH_CONFIG = {
+    'interval': float(os.getenv('WATCH_INTERVAL', '60'))  # 轮询间隔（秒）
+}
+
+# 调试样本配置：解析失败时保存原始响应，目录总大小和文件数有上限，超出时删除最旧的文件
+DEBUG_CAPTURE_CONFIG = {
+    'enabled': os.getenv('DEBUG_CAPTURE_ENABLED', 'true').lower() == 'true',
+    'dir': os.getenv('DEBUG_CAPTURE_DIR', os.path.join(log_dir, 'debug')),
+    'max_bytes': int(float(os.getenv('DEBUG_CAPTURE_MAX_MB', '50')) * 1024 * 1024),  # 目录总大小上限
+    'max_files': int(os.getenv('DEBUG_CAPTURE_MAX_FILES', '200')),  # 文件数上限
+    'min_interval': float(os.getenv('DEBUG_CAPTURE_INTERVAL', '300')),  # 同一代码两次保存的最小间隔（秒）
+    'compress': os.getenv('DEBUG_CAPTURE_COMPRESS', 'true').lower() == 'true',  # 使用gzip压缩
+    'queue_size': int(os.getenv('DEBUG_CAPTURE_QUEUE_SIZE', '100'))  # 等待写入的最大样本数，超出时丢弃
+}
+
+# 事件循环阻塞检测（调试用）：事件循环超过阈值没有响应时记录当时的调用位置
+LOOP_MONITOR_CONFIG = {
+    'enabled': os.getenv('LOOP_MONITOR_ENABLED', 'false').lower() == 'true',
+    'threshold': float(os.getenv('LOOP_BLOCK_THRESHOLD', '0.1'))  # 阻塞阈值（秒）
+}
+
+# 运行指标：Prometheus 文本格式文件（供 node_exporter 的 textfile collector 采集），设为空字符串时不导出
+METRICS_CONFIG = {
+    'textfile': os.getenv('METRICS_TEXTFILE', os.path.join(data_dir, 'metrics', 'etf_tracker.prom')),
+    'write_interval': float(os.getenv('METRICS_WRITE_INTERVAL', '15'))  # 两次写文件的最小间隔（秒）
+}
+
+# 性能分析：菜单操作按阶段计时（也可用 main.py --profile / --profile-dump 开启）
+PROFILE_CONFIG = {
+    'enabled': os.getenv('PROFILE', 'false').lower() == 'true',
+    'dump': os.getenv('PROFILE_DUMP', 'false').lower() == 'true',  # 同时运行 cProfile 并保存 pstats 文件
+    'dir': os.getenv('PROFILE_DIR', os.path.join(log_dir, 'profiles'))
+}
+
+# 启动耗时预算：main.py --import-profile 统计导入耗时，超过预算时以非零状态码退出（便于定时任务和CI检查）
+STARTUP_CONFIG = {
+    'import_budget_ms': float(os.getenv('IMPORT_BUDGET_MS', '200'))
 }
 
 # 日志配置
 LOG_CONFIG = {
     'level': os.getenv('LOG_LEVEL', 'INFO'),
+    'profile': os.getenv('LOG_PROFILE', 'verbose').lower(),  # verbose: 输出每次请求; quiet: 只输出每轮汇总和警告
+    'enqueue': os.getenv('LOG_ENQUEUE', 'true').lower() == 'true',  # 在后台线程中写日志
+    'dedup_window': float(os.getenv('LOG_DEDUP_WINDOW', '60')),  # 相同警告/错误的去重窗口（秒），0 表示不去重
     'format': '<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{module}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>'
 }
 
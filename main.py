@@ -2,8 +2,14 @@
 ETF 价格跟踪系统 - 主程序
 交互式菜单版本，支持16只ETF同时监控
 """
+import argparse
+import re
+import signal
+import subprocess
+import threading
 import time
 import sys
+from pathlib import Path
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
@@ -11,9 +17,10 @@ from rich import box
 from typing import Dict, List
 
 from src.logger import logger
-from src.data_source_manager import fetch_etf_price
 from src.storage import etf_transaction_storage, etf_list_storage
-from config.app import ETF_CONFIG
+from src.profiler import profiler
+from config.app import STARTUP_CONFIG, ensure_directories
+# 数据源（httpx、各爬虫）和监控模块在用到时才导入，菜单不需要等待它们加载
 # 初始化
 console = Console()
 
@@ -30,6 +37,7 @@ def print_banner():
     console.print(f"[bold cyan]{banner}[/bold cyan]")
 
 
+@profiler.timed('analysis')
 def process_group_trading_analysis(etf_list, transaction_data, current_prices):
     """
     处理单个组的ETF交易分析
@@ -108,6 +116,49 @@ def process_group_trading_analysis(etf_list, transaction_data, current_prices):
     return {'items': items, 'alerts': alerts}
 
 
+def format_quote_source(quote_info) -> str:
+    """
+    格式化行情的数据来源和时效，如 "tencent · 12秒前"
+
+    参数:
+        quote_info: 行情缓存信息（包含 source 和 age），可以为 None
+
+    返回:
+        用于表格显示的文本
+    """
+    if not quote_info:
+        return "[dim]--[/dim]"
+
+    age = quote_info.get('age', 0)
+    if age < 60:
+        age_text = f"{age:.0f}秒前"
+    elif age < 3600:
+        age_text = f"{age / 60:.0f}分钟前"
+    else:
+        age_text = f"{age / 3600:.1f}小时前"
+    return f"[dim]{quote_info['source']} · {age_text}[/dim]"
+
+
+def format_day_change(quote_info) -> str:
+    """
+    格式化当日涨跌幅（相对昨收价），使用获取价格时已经返回的行情字段，不再额外请求
+
+    参数:
+        quote_info: 行情缓存信息（包含 quote），可以为 None
+
+    返回:
+        用于表格显示的文本
+    """
+    quote = quote_info.get('quote') if quote_info else None
+    if quote is None or quote.change_rate is None:
+        return "[dim]--[/dim]"
+
+    change_rate = quote.change_rate
+    color = "green" if change_rate >= 0 else "red"
+    return f"[{color}]{change_rate:+.2f}%[/{color}]"
+
+
+@profiler.timed('render')
 def render_trading_table(items, alerts, group_name: str):
     """
     渲染交易信号表格
@@ -123,7 +174,9 @@ def render_trading_table(items, alerts, group_name: str):
     table.add_column("上次交易价", style="yellow")
     table.add_column("最新价")
     table.add_column("涨跌幅", style="magenta")
+    table.add_column("今日涨跌")
     table.add_column("接近目标", style="red")
+    table.add_column("数据来源")
 
     for item in items:
         etf_code = item['etf_code']
@@ -164,7 +217,9 @@ def render_trading_table(items, alerts, group_name: str):
                 f"{data['price']:.3f}",
                 current_price_str,
                 change_str,
-                target_text
+                format_day_change(current_data.get('quote_info')),
+                target_text,
+                format_quote_source(current_data.get('quote_info'))
             )
 
         else:
@@ -182,7 +237,9 @@ def render_trading_table(items, alerts, group_name: str):
                 last_price_str,
                 current_price_str,
                 change_str,
-                target_text
+                format_day_change(item['current_data'].get('quote_info')),
+                target_text,
+                format_quote_source(item['current_data'].get('quote_info'))
             )
 
     console.print(table)
@@ -203,67 +260,18 @@ def print_menu():
 │  [bold cyan]3.[/bold cyan] 更新观察列表                                      │
 │     添加新的ETF或删除列表中的ETF                            │
 │                                                             │
+│  [bold cyan]4.[/bold cyan] 数据源状态                                        │
+│     查看各数据源的熔断器状态                                │
+│                                                             │
+│  [bold cyan]5.[/bold cyan] 运行指标                                          │
+│     查看各数据源的请求耗时、成功率和切换次数                │
+│                                                             │
 │  [bold cyan]0.[/bold cyan] 退出程序                                          │
 └─────────────────────────────────────────────────────────────┘
 """
     console.print(menu)
 
 
-def fetch_latest_prices():
-    """
-    选项1：抓取16只ETF的最新价格（一次性）
-    """
-    console.print("\n[bold yellow]正在抓取16只ETF最新价格...[/bold yellow]\n")
-
-    # 创建表格
-    table = Table(box=box.ROUNDED, show_lines=False)
-    table.add_column("#", style="cyan", justify="right", width=3)
-    table.add_column("ETF代码", style="yellow", width=12)
-    table.add_column("ETF名称", style="blue", width=22)
-    table.add_column("最新价格", style="green", justify="right", width=12)
-
-    # 依次抓取16只ETF价格
-    with console.status("正在抓取价格数据...", spinner="dots"):
-        for idx, (etf_code, etf_info) in enumerate(ETF_CONFIG.items(), 1):
-            try:
-                result = fetch_etf_price(etf_code)
-                if result:
-                    price, name = result
-                    table.add_row(
-                        str(idx),
-                        etf_code,
-                        name,
-                        f"[bold]{price:.3f}[/bold] 元"
-                    )
-                else:
-                    table.add_row(
-                        str(idx),
-                        etf_code,
-                        etf_info['name'],
-                        "[red]获取失败[/red]"
-                    )
-            except Exception as e:
-                table.add_row(
-                    str(idx),
-                    etf_code,
-                    etf_info['name'],
-                    "[red]错误[/red]"
-                )
-                logger.error(f"获取{etf_code}价格失败: {e}")
-
-            # 短暂延迟，避免请求过快
-            time.sleep(0.1)
-
-    # 显示结果
-    console.print(Panel(
-        table,
-        title=f"[bold]ETF最新价格[/bold] | 更新时间: {time.strftime('%Y-%m-%d %H:%M:%S')}",
-        box=box.ROUNDED
-    ))
-
-    console.print("\n[green]✓[/green] 价格抓取完成\n")
-
-
 def update_transaction_data():
     """
     选项1：更新上次交易价格和数量
@@ -371,18 +379,60 @@ def update_transaction_data():
         console.print("[red]请输入有效的数字[/red]\n")
 
 
+@profiler.timed('render')
+def render_alerts(alerts, group_name: str):
+    """
+    展示单个组的交易信号面板（按涨跌幅降序）
+
+    参数:
+        alerts: 交易信号列表
+        group_name: 组别名称（A股/美股）
+    """
+    if not alerts:
+        return
+
+    console.print("\n" + "=" * 80)
+    console.print(f"⏰ {group_name}交易信号")
+    console.print("=" * 80 + "\n")
+    # 按涨跌幅降序排序
+    alerts.sort(key=lambda x: x['change_rate'], reverse=True)
+    for alert in alerts:
+        change_color = "green" if alert['change_rate'] >= 0 else "red"
+        change_symbol = "↑" if alert['change_rate'] >= 0 else "↓"
+
+        console.print(Panel(
+            f"[bold]{alert['name']} ({alert['code']})[/bold]\n\n"
+            f"上次交易: {alert['last_price']:.3f} 元 × {alert['quantity']:,} 份 = {alert['last_amount']:,.2f} 元\n"
+            f"最新价格: {alert['current_price']:.3f} 元 × {alert['quantity']:,} 份 = {alert['current_amount']:,.2f} 元\n\n"
+            f"总盈亏: {'+' if alert['change_rate'] >= 0 else ''}{alert['current_amount'] - alert['last_amount']:,.2f} 元\n"
+            f"涨跌幅: [{change_color}]{change_symbol} {abs(alert['change_rate']):.2f}%[/{change_color}]",
+            title=f"{change_symbol} {abs(alert['change_rate']):.2f}%",
+            style=change_color,
+            box=box.ROUNDED
+        ))
+
+        # 操作建议
+        if alert['change_rate'] >= 3:
+            console.print(f"[bold yellow]📈 操作建议: 涨幅较大，可考虑止盈[/bold yellow]\n")
+        elif alert['change_rate'] <= -3:
+            console.print(f"[bold yellow]📉 操作建议: 跌幅较大，建议密切关注[/bold yellow]\n")
+
+
 def analyze_trading_signals():
     """
     选项2：交易信号分析
     先连续展示两个表格，再统一展示交易信号
     """
+    from src.data_source_manager import data_source_manager, fetch_etf_prices
+
     console.print("\n[bold yellow]分析交易信号[/bold yellow]\n")
 
     # --- 获取两个组的数据 ---
-    a_share_etfs = etf_list_storage.get_all_etfs(group="A股")
-    us_stock_etfs = etf_list_storage.get_all_etfs(group="美股")
+    with profiler.stage('storage'):
+        a_share_etfs = etf_list_storage.get_all_etfs(group="A股")
+        us_stock_etfs = etf_list_storage.get_all_etfs(group="美股")
 
-    transaction_data = etf_transaction_storage.get_all_etf_transactions()
+        transaction_data = etf_transaction_storage.get_all_etf_transactions()
 
     # 抓取所有ETF价格（一次抓取，分组展示）
     current_prices = {}
@@ -393,22 +443,32 @@ def analyze_trading_signals():
         progress = console.status("抓取中...")
         progress.start()
 
-        for etf_code in all_etf_codes:
-            try:
-                result = fetch_etf_price(etf_code)
-                if result:
-                    price, name = result
-                    current_prices[etf_code] = {
-                        'price': price,
-                        'name': name
-                    }
-            except Exception as e:
-                logger.error(f"获取{etf_code}价格失败: {e}")
-
-            time.sleep(0.1)  # 避免请求过快
+        try:
+            with profiler.stage('fetch'):
+                results = fetch_etf_prices(all_etf_codes)
+        except Exception as e:
+            logger.error(f"批量获取ETF价格失败: {e}")
+            results = {}
+
+        for etf_code, result in results.items():
+            if result:
+                price, name = result
+                current_prices[etf_code] = {
+                    'price': price,
+                    'name': name,
+                    'quote_info': data_source_manager.get_quote_info(etf_code)
+                }
 
         progress.stop()
 
+        # 休市提示：休市期间显示的是收盘后缓存的价格
+        for status in data_source_manager.get_market_status(all_etf_codes):
+            if not status['is_open'] and status['next_open'] is not None:
+                console.print(
+                    f"[dim]{status['name']}市场休市中，显示最近收盘价，"
+                    f"下一交易时段: {status['next_open'].strftime('%Y-%m-%d %H:%M')} ({status['next_open'].tzinfo})[/dim]"
+                )
+
     # 收集所有交易信号
     all_alerts = {'A股': [], '美股': []}
 
@@ -435,61 +495,8 @@ def analyze_trading_signals():
             all_alerts['美股'] = us_stock_results['alerts']
 
     # --- 统一展示交易信号（分成A股和美股两部分） ---
-    # A股信号
-    if all_alerts['A股']:
-        console.print("\n" + "=" * 80)
-        console.print("⏰ A股交易信号")
-        console.print("=" * 80 + "\n")
-        # 按涨跌幅降序排序
-        all_alerts['A股'].sort(key=lambda x: x['change_rate'], reverse=True)
-        for alert in all_alerts['A股']:
-            change_color = "green" if alert['change_rate'] >= 0 else "red"
-            change_symbol = "↑" if alert['change_rate'] >= 0 else "↓"
-
-            console.print(Panel(
-                f"[bold]{alert['name']} ({alert['code']})[/bold]\n\n"
-                f"上次交易: {alert['last_price']:.3f} 元 × {alert['quantity']:,} 份 = {alert['last_amount']:,.2f} 元\n"
-                f"最新价格: {alert['current_price']:.3f} 元 × {alert['quantity']:,} 份 = {alert['current_amount']:,.2f} 元\n\n"
-                f"总盈亏: {'+' if alert['change_rate'] >= 0 else ''}{alert['current_amount'] - alert['last_amount']:,.2f} 元\n"
-                f"涨跌幅: [{change_color}]{change_symbol} {abs(alert['change_rate']):.2f}%[/{change_color}]",
-                title=f"{change_symbol} {abs(alert['change_rate']):.2f}%",
-                style=change_color,
-                box=box.ROUNDED
-            ))
-
-            # 操作建议
-            if alert['change_rate'] >= 3:
-                console.print(f"[bold yellow]📈 操作建议: 涨幅较大，可考虑止盈[/bold yellow]\n")
-            elif alert['change_rate'] <= -3:
-                console.print(f"[bold yellow]📉 操作建议: 跌幅较大，建议密切关注[/bold yellow]\n")
-
-    # 美股信号
-    if all_alerts['美股']:
-        console.print("\n" + "=" * 80)
-        console.print("⏰ 美股交易信号")
-        console.print("=" * 80 + "\n")
-        # 按涨跌幅降序排序
-        all_alerts['美股'].sort(key=lambda x: x['change_rate'], reverse=True)
-        for alert in all_alerts['美股']:
-            change_color = "green" if alert['change_rate'] >= 0 else "red"
-            change_symbol = "↑" if alert['change_rate'] >= 0 else "↓"
-
-            console.print(Panel(
-                f"[bold]{alert['name']} ({alert['code']})[/bold]\n\n"
-                f"上次交易: {alert['last_price']:.3f} 元 × {alert['quantity']:,} 份 = {alert['last_amount']:,.2f} 元\n"
-                f"最新价格: {alert['current_price']:.3f} 元 × {alert['quantity']:,} 份 = {alert['current_amount']:,.2f} 元\n\n"
-                f"总盈亏: {'+' if alert['change_rate'] >= 0 else ''}{alert['current_amount'] - alert['last_amount']:,.2f} 元\n"
-                f"涨跌幅: [{change_color}]{change_symbol} {abs(alert['change_rate']):.2f}%[/{change_color}]",
-                title=f"{change_symbol} {abs(alert['change_rate']):.2f}%",
-                style=change_color,
-                box=box.ROUNDED
-            ))
-
-            # 操作建议
-            if alert['change_rate'] >= 3:
-                console.print(f"[bold yellow]📈 操作建议: 涨幅较大，可考虑止盈[/bold yellow]\n")
-            elif alert['change_rate'] <= -3:
-                console.print(f"[bold yellow]📉 操作建议: 跌幅较大，建议密切关注[/bold yellow]\n")
+    render_alerts(all_alerts['A股'], "A股")
+    render_alerts(all_alerts['美股'], "美股")
 
     # 如果没有信号，显示提示
     if not all_alerts['A股'] and not all_alerts['美股']:
@@ -678,6 +685,179 @@ def update_etf_watchlist():
         console.print("[red]无效选项[/red]\n")
 
 
+def show_data_source_status():
+    """
+    选项4：查看数据源状态
+    显示各数据源熔断器的状态和最近错误率
+    """
+    from src.data_source_manager import data_source_manager
+
+    console.print("\n[bold yellow]数据源状态[/bold yellow]\n")
+
+    state_labels = {
+        'closed': "[green]正常[/green]",
+        'open': "[red]熔断[/red]",
+        'half_open': "[yellow]半开（探测中）[/yellow]"
+    }
+    source_names = {'tencent': '腾讯财经', 'eastmoney': '东方财富'}
+
+    table = Table(box=box.ROUNDED)
+    table.add_column("数据源", style="cyan")
+    table.add_column("状态")
+    table.add_column("近期错误率", justify="right")
+    table.add_column("统计样本", justify="right")
+    table.add_column("恢复探测", justify="right")
+
+    for status in data_source_manager.get_source_status():
+        retry_text = f"{status['retry_in']:.0f} 秒后" if status['retry_in'] is not None else "[dim]--[/dim]"
+        table.add_row(
+            source_names.get(status['name'], status['name']),
+            state_labels.get(status['state'], status['state']),
+            f"{status['failure_rate']:.0%}",
+            str(status['calls']),
+            retry_text
+        )
+
+    console.print(table)
+
+
+def format_seconds(seconds) -> str:
+    """格式化耗时，如 85ms、1.20s，没有数据时显示 --"""
+    if seconds is None:
+        return "[dim]--[/dim]"
+    if seconds == float('inf'):
+        return ">10s"
+    if seconds < 1:
+        return f"{seconds * 1000:.0f}ms"
+    return f"{seconds:.2f}s"
+
+
+def show_metrics():
+    """
+    选项5：查看运行指标
+    显示本次运行以来各数据源、各市场的请求次数、成功率和耗时分布，以及切换、重试和流量统计
+    """
+    from src.metrics import metrics
+
+    console.print("\n[bold yellow]运行指标[/bold yellow]\n")
+
+    # 单只请求和批量请求中各ETF的结果，按 (数据源, 市场) 汇总
+    outcomes = {}
+    for name in ('etf_requests_total', 'etf_batch_requests_total'):
+        for labels, value in metrics.counter_values(name):
+            key = (labels['source'], labels['market'])
+            counts = outcomes.setdefault(key, {'success': 0, 'failure': 0})
+            counts[labels['outcome']] += value
+    latencies = {
+        (labels['source'], labels['market']): histogram
+        for labels, histogram in metrics.histogram_values('etf_request_duration_seconds')
+    }
+
+    if not outcomes:
+        console.print("[yellow]本次运行还没有发起过行情请求[/yellow]\n")
+        return
+
+    table = Table(title="请求结果与耗时", box=box.ROUNDED)
+    table.add_column("数据源", style="cyan")
+    table.add_column("市场")
+    table.add_column("成功", justify="right")
+    table.add_column("失败", justify="right")
+    table.add_column("成功率", justify="right")
+    table.add_column("耗时样本", justify="right")
+    table.add_column("平均耗时", justify="right")
+    table.add_column("P50", justify="right")
+    table.add_column("P95", justify="right")
+
+    for (source, market), counts in sorted(outcomes.items()):
+        total = counts['success'] + counts['failure']
+        histogram = latencies.get((source, market))
+        rate = counts['success'] / total if total else 0
+        rate_style = "green" if rate >= 0.95 else "yellow" if rate >= 0.8 else "red"
+        table.add_row(
+            source,
+            market,
+            f"{counts['success']:.0f}",
+            f"{counts['failure']:.0f}",
+            f"[{rate_style}]{rate:.0%}[/{rate_style}]",
+            str(histogram.count) if histogram else "0",
+            format_seconds(histogram.sum / histogram.count if histogram else None),
+            format_seconds(histogram.quantile(0.5) if histogram else None),
+            format_seconds(histogram.quantile(0.95) if histogram else None)
+        )
+    console.print(table)
+
+    batches = metrics.histogram_values('etf_batch_duration_seconds')
+    if batches:
+        console.print("\n[bold]批量请求[/bold]")
+        for labels, histogram in sorted(batches, key=lambda item: item[0]['source']):
+            console.print(
+                f"  {labels['source']}: {histogram.count} 次，平均 {format_seconds(histogram.sum / histogram.count)}，"
+                f"P95 {format_seconds(histogram.quantile(0.95))}"
+            )
+
+    console.print("\n[bold]切换与重试[/bold]")
+    fallbacks = metrics.counter_values('etf_fallbacks_total')
+    for labels, value in fallbacks:
+        console.print(f"  {labels['from_source']} -> {labels['to_source']} 切换: {value:.0f} 次")
+    for labels, value in metrics.counter_values('etf_hedged_requests_total'):
+        console.print(f"  {labels['source']} 响应慢并行请求备用数据源: {value:.0f} 次")
+    for labels, value in metrics.counter_values('etf_retries_total'):
+        console.print(f"  {labels['source']} 重试: {value:.0f} 次")
+    if not fallbacks:
+        console.print("  [dim]没有发生过数据源切换[/dim]")
+
+    received = metrics.counter_values('etf_bytes_received_total')
+    if received:
+        console.print("\n[bold]接收流量[/bold]")
+        for labels, value in sorted(received, key=lambda item: -item[1]):
+            console.print(f"  {labels['host']}: {value / 1024:.1f} KB")
+
+    if metrics.textfile:
+        path = metrics.write_textfile()
+        if path is not None:
+            console.print(f"\n[dim]Prometheus 指标文件: {path}[/dim]")
+    console.print()
+
+
+def run_action(action):
+    """
+    执行一个菜单操作，启用性能分析时在结束后显示各阶段耗时
+
+    参数:
+        action: 菜单操作函数
+    """
+    with profiler.action(action.__name__):
+        action()
+    if profiler.last_report is not None:
+        print_profile_report(profiler.last_report)
+
+
+def print_profile_report(report: Dict):
+    """
+    显示一次菜单操作的阶段耗时
+
+    参数:
+        report: StageProfiler 生成的统计结果
+    """
+    total = report['total']
+    table = Table(title=f"性能分析: {report['action']}", box=box.ROUNDED)
+    table.add_column("阶段", style="cyan")
+    table.add_column("耗时", justify="right")
+    table.add_column("占比", justify="right")
+    table.add_column("次数", justify="right")
+
+    for stage in report['stages']:
+        share = stage['seconds'] / total if total else 0
+        table.add_row(stage['label'], format_seconds(stage['seconds']), f"{share:.0%}", str(stage['calls']))
+    other_share = report['other'] / total if total else 0
+    table.add_row("[dim]其他（未归类）[/dim]", format_seconds(report['other']), f"{other_share:.0%}", "")
+    table.add_row("[bold]合计[/bold]", f"[bold]{format_seconds(total)}[/bold]", "100%", "")
+    console.print(table)
+
+    if report['pstats_file'] is not None:
+        console.print(f"[dim]cProfile 结果已保存: {report['pstats_file']}（查看: python -m pstats {report['pstats_file']}）[/dim]")
+
+
 def main():
     """
     主程序入口
@@ -688,25 +868,155 @@ def main():
     # 程序启动时初始化ETF列表（首次运行时从默认配置导入）
     etf_list_storage.init_default_etfs()
 
-    while True:
-        print_menu()
+    # 后台预先解析美股ETF的市场代码（结果缓存在磁盘上）
+    preload_in_background(list(etf_list_storage.get_all_etfs().keys()))
 
-        choice = input("请输入选项编号（0-3）: ").strip()
+    try:
+        while True:
+            print_menu()
+
+            choice = input("请输入选项编号（0-5）: ").strip()
+
+            if choice == '1':
+                run_action(update_transaction_data)
+            elif choice == '2':
+                run_action(analyze_trading_signals)
+            elif choice == '3':
+                run_action(update_etf_watchlist)
+            elif choice == '4':
+                run_action(show_data_source_status)
+            elif choice == '5':
+                run_action(show_metrics)
+            elif choice == '0':
+                console.print("\n[yellow]感谢使用，再见！[/yellow]\n")
+                sys.exit(0)
+            else:
+                console.print("[red]无效选项，请重新输入[/red]\n")
 
-        if choice == '1':
-            update_transaction_data()
-        elif choice == '2':
-            analyze_trading_signals()
-        elif choice == '3':
-            update_etf_watchlist()
-        elif choice == '0':
-            console.print("\n[yellow]感谢使用，再见！[/yellow]\n")
-            sys.exit(0)
-        else:
-            console.print("[red]无效选项，请重新输入[/red]\n")
+            input("\n按回车键继续...")
+
+    finally:
+        # 退出前关闭共享的HTTP连接池
+        # （没有用到过数据源时不导入；后台线程正在导入时，import 会等待导入完成）
+        if 'src.data_source_manager' in sys.modules:
+            from src.data_source_manager import close_data_source_manager
+            close_data_source_manager()
+
+
+def preload_in_background(etf_codes: List[str]):
+    """
+    在后台线程中导入数据源模块并预先解析美股ETF的市场代码，菜单不需要等待
+
+    参数:
+        etf_codes: 自选列表中的ETF代码
+    """
+    def run():
+        from src.data_source_manager import data_source_manager
+        data_source_manager.preload_market_codes(etf_codes)
 
-        input("\n按回车键继续...")
+    threading.Thread(target=run, name='preload', daemon=True).start()
+
+
+def watch(interval: float = None, max_cycles: int = None):
+    """
+    监控模式：无交互界面，按固定间隔轮询自选列表并检查提醒，Ctrl+C 或 SIGTERM 退出
+
+    参数:
+        interval: 轮询间隔（秒）
+        max_cycles: 最多运行的轮数，None 表示一直运行
+    """
+    from src.data_source_manager import data_source_manager
+    from src.watcher import PriceWatcher
+
+    etf_list_storage.init_default_etfs()
+    data_source_manager.preload_market_codes(list(etf_list_storage.get_all_etfs().keys()))
+
+    watcher = PriceWatcher(interval)
+    signal.signal(signal.SIGTERM, lambda signum, frame: watcher.stop())
+
+    try:
+        watcher.run(max_cycles)
+    except KeyboardInterrupt:
+        logger.info("收到中断信号，停止监控")
+    finally:
+        data_source_manager.close()
+
+
+def profile_imports(top: int = 20) -> int:
+    """
+    统计启动时各模块的导入耗时（在子进程中用 python -X importtime 导入 main）
+
+    参数:
+        top: 显示累计耗时最多的模块数
+
+    返回:
+        进程退出码，总导入耗时超过 STARTUP_CONFIG['import_budget_ms'] 时为 1
+    """
+    project_root = Path(__file__).resolve().parent
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'],
+        cwd=project_root, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        console.print(f"[red]导入 main 失败:[/red]\n{completed.stderr[-2000:]}")
+        return completed.returncode
+
+    # 每行格式: "import time:   self [us] | cumulative | imported package"
+    pattern = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)')
+    records = []
+    for line in completed.stderr.splitlines():
+        match = pattern.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append((module, int(self_us) / 1000, int(cumulative_us) / 1000, len(indent) // 2))
+
+    total_ms = next((cumulative for module, _, cumulative, _ in records if module == 'main'), 0.0)
+    table = Table(title=f"导入耗时（累计最多的 {top} 个模块）", box=box.ROUNDED)
+    table.add_column("模块", style="cyan")
+    table.add_column("自身(ms)", justify="right")
+    table.add_column("累计(ms)", justify="right")
+    table.add_column("层级", justify="right")
+    for module, self_ms, cumulative_ms, depth in sorted(records, key=lambda r: r[2], reverse=True)[:top]:
+        table.add_row(module, f"{self_ms:.1f}", f"{cumulative_ms:.1f}", str(depth))
+    console.print(table)
+
+    budget_ms = STARTUP_CONFIG['import_budget_ms']
+    console.print(f"导入 main 共 {total_ms:.1f} ms（子进程总耗时 {wall_ms:.0f} ms，含解释器启动），预算 {budget_ms:.0f} ms")
+    if total_ms > budget_ms:
+        console.print("[red]超出启动耗时预算[/red]")
+        return 1
+    console.print("[green]在启动耗时预算内[/green]")
+    return 0
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """解析命令行参数，不带子命令时进入交互式菜单"""
+    parser = argparse.ArgumentParser(description="ETF价格监控工具")
+    parser.add_argument('--import-profile', action='store_true', help="统计各模块的导入耗时并与启动耗时预算比较")
+    parser.add_argument('--profile', action='store_true', help="每个菜单操作结束后显示各阶段（网络、存储、分析、渲染）耗时")
+    parser.add_argument('--profile-dump', action='store_true', help="同 --profile，并保存每次操作的 cProfile 结果（pstats 文件）")
+    subparsers = parser.add_subparsers(dest='command')
+
+    watch_parser = subparsers.add_parser('watch', help="持续监控自选列表中的ETF价格")
+    watch_parser.add_argument('--interval', type=float, default=None, help="轮询间隔（秒），默认读取 WATCH_INTERVAL")
+    watch_parser.add_argument('--cycles', type=int, default=None, help="运行指定轮数后退出（默认一直运行）")
+
+    return parser.parse_args(argv)
 
 
 if __name__ == '__main__':
-    main()
+    args = parse_args()
+    if args.import_profile:
+        sys.exit(profile_imports())
+
+    if args.profile or args.profile_dump:
+        profiler.enabled = True
+        profiler.dump = profiler.dump or args.profile_dump
+
+    ensure_directories()
+    if args.command == 'watch':
+        watch(args.interval, args.cycles)
+    else:
+        main()
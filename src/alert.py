@@ -8,7 +8,8 @@ from src.storage import alert_status_storage, alert_history_storage
 from src.calculator import check_date_range
 
 
-def check_alert_status(current_price: float, transaction_price: float, transaction_id: int) -> Dict[str, any]:
+def check_alert_status(current_price: float, transaction_price: float, transaction_id: int,
+                       etf_code: str = None) -> Dict[str, any]:
     """
     判断当前价格是否落在关键区间（基于上次交易价格），并实现提醒去重
 
@@ -16,6 +17,7 @@ def check_alert_status(current_price: float, transaction_price: float, transacti
         current_price: 当前价格
         transaction_price: 上次交易价格
         transaction_id: 交易记录 ID
+        etf_code: ETF代码（记录在提醒状态中）
 
     返回:
         dict: 包含区间判断结果和是否需要提醒
@@ -52,7 +54,8 @@ def check_alert_status(current_price: float, transaction_price: float, transacti
         transaction_id=transaction_id,
         last_price=current_price,
         in_range=in_range,
-        range_type=matched_range
+        range_type=matched_range,
+        etf_code=etf_code
     )
 
     # 5. 如果需要提醒，记录提醒历史
@@ -92,7 +95,8 @@ def get_alert_status(transaction_id: int) -> Optional[Dict[str, any]]:
         return None
 
 
-def update_alert_status(transaction_id: int, last_price: float, in_range: bool, range_type: str = None):
+def update_alert_status(transaction_id: int, last_price: float, in_range: bool, range_type: str = None,
+                        etf_code: str = None):
     """
     更新提醒状态记录
 
@@ -101,13 +105,15 @@ def update_alert_status(transaction_id: int, last_price: float, in_range: bool,
         last_price: 上次分析时的价格
         in_range: 是否在区间内
         range_type: 区间类型
+        etf_code: ETF代码
     """
     try:
         alert_status_storage.update_status(
             transaction_id=transaction_id,
             last_price=last_price,
             in_range=in_range,
-            range_type=range_type
+            range_type=range_type,
+            etf_code=etf_code
         )
         logger.debug(f"更新提醒状态: transaction_id={transaction_id}, in_range={in_range}")
     except Exception as e:
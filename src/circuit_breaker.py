@@ -0,0 +1,153 @@
+"""
+熔断器模块
+按数据源统计最近的请求结果，错误率过高时暂时跳过该数据源
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+from src.logger import logger
+from config.app import CIRCUIT_BREAKER_CONFIG
+
+
+class CircuitBreaker:
+    """
+    单个数据源的熔断器
+
+    状态说明:
+        closed: 正常，所有请求放行
+        open: 熔断，所有请求直接跳过，直到冷却时间结束
+        half_open: 半开，只放行一个探测请求，由探测请求的结果决定恢复还是重新熔断
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, window: int = None, failure_threshold: float = None,
+                 min_calls: int = None, open_seconds: float = None):
+        """
+        初始化熔断器
+
+        参数:
+            name: 数据源名称
+            window: 统计错误率的最近请求数
+            failure_threshold: 触发熔断的错误率（0-1）
+            min_calls: 计算错误率前需要的最少请求数
+            open_seconds: 熔断后等待多久进入半开状态（秒）
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold or CIRCUIT_BREAKER_CONFIG['failure_threshold']
+        self.min_calls = min_calls or CIRCUIT_BREAKER_CONFIG['min_calls']
+        self.open_seconds = open_seconds or CIRCUIT_BREAKER_CONFIG['open_seconds']
+        self.outcomes = deque(maxlen=window or CIRCUIT_BREAKER_CONFIG['window'])
+        self.state = self.CLOSED
+        self.opened_at = None
+        # 每次放行都发一个递增的许可编号，结果按编号归属：
+        # 半开状态只认探测请求的编号，熔断前发出、迟到的结果不会影响新的状态
+        self._next_ticket = 1
+        self._probe_ticket = None
+        self._closed_since = 1
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> Optional[int]:
+        """
+        判断是否放行本次请求
+
+        返回:
+            许可编号（调用 record/release 时传回），None 表示应直接跳过
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.open_seconds:
+                    return None
+                self.state = self.HALF_OPEN
+                self._probe_ticket = None
+                logger.info(f"数据源 {self.name} 熔断冷却结束，进入半开状态")
+
+            if self.state == self.HALF_OPEN and self._probe_ticket is not None:
+                return None
+
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            if self.state == self.HALF_OPEN:
+                self._probe_ticket = ticket
+            return ticket
+
+    def record(self, ticket: int, success: bool):
+        """
+        记录一次请求结果
+
+        参数:
+            ticket: allow_request 返回的许可编号
+            success: 请求是否成功
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                # 只有探测请求的结果决定半开状态的去向
+                if ticket != self._probe_ticket:
+                    return
+                self._probe_ticket = None
+                if success:
+                    self.state = self.CLOSED
+                    self._closed_since = self._next_ticket
+                    self.outcomes.clear()
+                    logger.info(f"数据源 {self.name} 探测成功，恢复正常")
+                else:
+                    self._open()
+                    logger.warning(f"数据源 {self.name} 探测失败，继续熔断 {self.open_seconds:.0f} 秒")
+                return
+
+            # 熔断期间迟到的结果、以及恢复之前发出的请求结果都不计入错误率
+            if self.state == self.OPEN or ticket < self._closed_since:
+                return
+
+            self.outcomes.append(success)
+            if len(self.outcomes) >= self.min_calls and self.failure_rate >= self.failure_threshold:
+                self._open()
+                logger.warning(f"数据源 {self.name} 错误率 {self.failure_rate:.0%}，熔断 {self.open_seconds:.0f} 秒")
+
+    def release(self, ticket: int):
+        """
+        请求被取消、没有结果时调用；如果是半开状态的探测请求，释放探测名额
+
+        参数:
+            ticket: allow_request 返回的许可编号
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN and ticket == self._probe_ticket:
+                self._probe_ticket = None
+
+    def _open(self):
+        """进入熔断状态（调用方需持有锁）"""
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+
+    @property
+    def failure_rate(self) -> float:
+        """最近请求的错误率"""
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取熔断器当前状态
+
+        返回:
+            {name, state, failure_rate, calls, retry_in}，retry_in 为距离半开探测的剩余秒数
+        """
+        with self._lock:
+            retry_in = None
+            if self.state == self.OPEN:
+                retry_in = max(0.0, self.open_seconds - (time.monotonic() - self.opened_at))
+            return {
+                'name': self.name,
+                'state': self.state,
+                'failure_rate': self.failure_rate,
+                'calls': len(self.outcomes),
+                'retry_in': retry_in
+            }
+
+
+__all__ = ['CircuitBreaker']
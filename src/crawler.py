@@ -3,22 +3,47 @@
 从雪球网站爬取 ETF 价格
 """
 import asyncio
-import time
+import re
 import httpx
-from bs4 import BeautifulSoup
-from datetime import datetime
 from typing import Dict, Optional, Tuple
 from src.logger import logger
+from src.http_client import HTTPClientRegistry
+from src.rate_limiter import rate_limiter
+from src.debug_capture import debug_capture
 from config.app import HTTP_CONFIG, ETF_CONFIG
 
 
 class XueqiuCrawler:
     """雪球爬虫类"""
 
-    def __init__(self):
+    # 页面内嵌的行情对象，如 SNB.data.quote = {...}、"quote":{...}、quote: {...}
+    # （只取不含嵌套对象的部分，页面中指数、相关个股等其他数据块里的 current 不会被匹配到；
+    # 用后向断言排除 xxx_quote 等键名，放在字面量之后，不影响正则的前缀快速查找）
+    _QUOTE_BLOCK_PATTERN = re.compile(r"""quote(?<!\wquote)["']?\s*[:=]\s*\{([^{}]*)\}""")
+
+    # 行情对象中的代码，如 "symbol":"SZ159915"
+    _SYMBOL_PATTERN = re.compile(r"""["']?symbol["']?\s*:\s*["']([^"']+)["']""")
+
+    # 行情对象中的当前价，如 "current":2.154、"current": "3.346"、'current': '3.346'、 current: "3.346"
+    _CURRENT_PATTERNS = (
+        re.compile(r'"current"\s*:\s*"?([0-9]+(?:\.[0-9]+)?)\b'),
+        re.compile(r"'current'\s*:\s*'([0-9]+(?:\.[0-9]+)?)'"),
+        re.compile(r'(?:^|[\s,])current\s*:\s*"([0-9]+(?:\.[0-9]+)?)"'),
+    )
+
+    # 价格相关的 meta 标签，如 <meta name="current-price" content="2.154">
+    _META_PRICE_PATTERN = re.compile(
+        r'<meta\s+name="[^"]*price[^"]*"\s+content="([^"]+)"', re.IGNORECASE
+    )
+
+    # 价格格式（允许小数）
+    _PRICE_PATTERN = re.compile(r'^\d+\.?\d*$')
+
+    def __init__(self, http_clients: HTTPClientRegistry = None):
         self.base_url = "https://xueqiu.com"
+        # 共享的长连接客户端（未传入时使用独立的注册表）
+        self.http_clients = http_clients or HTTPClientRegistry()
         self.timeout = HTTP_CONFIG['timeout']
-        self.delay = HTTP_CONFIG['delay']
         self.headers = {
             'User-Agent': HTTP_CONFIG['user_agent'],
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
@@ -43,16 +68,16 @@ class XueqiuCrawler:
         url = f"{self.base_url}/S/{etf_code}"
 
         try:
-            # 添加延迟，避免触发反爬虫
-            await asyncio.sleep(self.delay)
+            # 按主机限流，避免触发反爬虫
+            await rate_limiter.acquire_async(url)
 
-            async with httpx.AsyncClient(timeout=self.timeout, headers=self.headers) as client:
-                logger.info(f"正在请求: {url}")
-                response = await client.get(url)
-                response.raise_for_status()
+            client = self.http_clients.get_async_client(url)
+            logger.info(f"正在请求: {url}")
+            response = await client.get(url, headers=self.headers, timeout=self.timeout)
+            response.raise_for_status()
 
-                logger.info(f"请求成功，状态码: {response.status_code}")
-                return response.text
+            logger.info(f"请求成功，状态码: {response.status_code}")
+            return response.text
 
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP 错误: {e.response.status_code} - {e.response.text}")
@@ -68,6 +93,11 @@ class XueqiuCrawler:
         """
         从 HTML 中解析价格
 
+        按开销从小到大依次尝试:
+        1. 在原始 HTML 上用预编译正则查找内嵌行情对象（quote）中的 "current"（价格通常在这里）
+        2. 用正则查找价格相关的 meta 标签
+        3. 以上都失败时才构建完整的 DOM 逐个元素查找
+
         参数:
             html_content: HTML 内容
             etf_code: ETF 代码（用于调试输出）
@@ -79,6 +109,58 @@ class XueqiuCrawler:
             logger.error("HTML 内容为空")
             return None
 
+        price = self._parse_price_fast(html_content, etf_code)
+        if price is not None:
+            return price
+
+        return self._parse_price_dom(html_content, etf_code)
+
+    def _parse_price_fast(self, html_content: str, etf_code: str) -> Optional[float]:
+        """
+        不构建 DOM，直接在原始 HTML 上用正则解析价格
+
+        参数:
+            html_content: HTML 内容
+            etf_code: ETF 代码（行情对象带有 symbol 时，只使用代码一致的对象）
+
+        返回:
+            价格（浮点数）或 None
+        """
+        for block in self._QUOTE_BLOCK_PATTERN.finditer(html_content):
+            fields = block.group(1)
+            symbol = self._SYMBOL_PATTERN.search(fields)
+            if symbol and symbol.group(1).upper() != etf_code.upper():
+                continue
+            for pattern in self._CURRENT_PATTERNS:
+                match = pattern.search(fields)
+                if match:
+                    price = float(match.group(1))
+                    logger.debug(f"从内嵌行情数据解析到价格: {price}")
+                    return price
+
+        for match in self._META_PRICE_PATTERN.finditer(html_content):
+            price_str = match.group(1)
+            if self._is_price(price_str):
+                price = float(price_str)
+                logger.debug(f"从 meta 标签解析到价格: {price}")
+                return price
+
+        return None
+
+    def _parse_price_dom(self, html_content: str, etf_code: str) -> Optional[float]:
+        """
+        构建完整的 DOM 解析价格（正则快速解析失败时使用，开销较大）
+
+        参数:
+            html_content: HTML 内容
+            etf_code: ETF 代码（用于调试输出）
+
+        返回:
+            价格（浮点数）或 None
+        """
+        # BeautifulSoup/lxml 导入较慢，只有走到 DOM 解析时才导入
+        from bs4 import BeautifulSoup
+
         try:
             soup = BeautifulSoup(html_content, 'lxml')
 
@@ -108,41 +190,12 @@ class XueqiuCrawler:
                         logger.info(f"从 HTML 元素解析到价格: {price}")
                         return price
 
-            # 方法 3：查找 JavaScript 数据
-            scripts = soup.find_all('script')
-            for script in scripts:
-                if script.string:
-                    import re
-                    # 查找 "current": "3.346" 格式的价格
-                    match = re.search(r'"current"\s*:\s*"([0-9]+\.?[0-9]*)"', script.string)
-                    if match:
-                        price = float(match.group(1))
-                        logger.info(f"从 JavaScript 数据解析到价格: {price}")
-                        return price
-
-                    # 备选：查找 'current': '3.346' 格式（单引号）
-                    match = re.search(r"'current'\s*:\s*'([0-9]+\.?[0-9]*)'", script.string)
-                    if match:
-                        price = float(match.group(1))
-                        logger.info(f"从 JavaScript 数据解析到价格: {price}")
-                        return price
-
-                    # 备选：查找 current: "3.346" 格式（无引号）
-                    match = re.search(r"\scurrent\s*:\s*\"([0-9]+\.?[0-9]*)\"", script.string)
-                    if match:
-                        price = float(match.group(1))
-                        logger.info(f"从 JavaScript 数据解析到价格: {price}")
-                        return price
-
-            # 方法 4：尝试输出页面标题和部分内容，便于调试
+            # 方法 3：尝试输出页面标题和部分内容，便于调试
             title = soup.title.string if soup.title else '无标题'
             logger.warning(f"无法解析价格，页面标题: {title}")
 
-            # 保存页面源码到文件，便于人工查看
-            debug_file = f'debug_{etf_code}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.html'
-            with open(debug_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            logger.info(f"已保存调试文件: {debug_file}")
+            # 保存页面源码（后台写入，按代码限频），便于人工查看
+            debug_capture.capture(f"xueqiu_{etf_code}", html_content, '.html')
 
             return None
 
@@ -165,9 +218,7 @@ class XueqiuCrawler:
             text = text.replace('¥', '').replace('￥', '').replace('$', '').replace(',', '').strip()
 
             # 检查是否为数字格式（允许小数）
-            import re
-            pattern = r'^\d+\.?\d*$'
-            if not re.match(pattern, text):
+            if not self._PRICE_PATTERN.match(text):
                 return False
 
             # 转换为浮点数
@@ -226,37 +277,32 @@ class XueqiuCrawler:
                 if etf_code in ETF_CONFIG:
                     etf_name = ETF_CONFIG[etf_code]['name']
                 else:
-                    # 从CSV文件中获取（兼容新添加的ETF）
+                    # 从观察列表获取（兼容新添加的ETF），找不到时使用代码作为名称
                     try:
                         from src.storage import etf_list_storage
-                        all_etfs = etf_list_storage.get_all_etfs()
-                        if etf_code in all_etfs:
-                            etf_name = all_etfs[etf_code]['name']
-                        else:
-                            etf_name = etf_code  #  fallback：使用代码作为名称
-                    except:
+                        etf_name = etf_list_storage.get_etf_name(etf_code, etf_code)
+                    except Exception:
                         etf_name = etf_code  # 获取失败时，使用代码作为名称
 
                 # 缓存ETF信息
                 self.etf_info_cache[etf_code] = etf_name
 
-            # 简单的延迟
-            time.sleep(self.delay)
+            url = f"{self.base_url}/S/{etf_code}"
+            # 按主机限流，避免触发反爬虫
+            rate_limiter.acquire(url)
+            client = self.http_clients.get_client(url)
+            logger.info(f"正在请求: {url}")
+            response = client.get(url, headers=self.headers, timeout=self.timeout)
+            response.raise_for_status()
 
-            with httpx.Client(timeout=self.timeout, headers=self.headers) as client:
-                url = f"{self.base_url}/S/{etf_code}"
-                logger.info(f"正在请求: {url}")
-                response = client.get(url)
-                response.raise_for_status()
+            html = response.text
+            price = self.parse_price(html, etf_code)
 
-                html = response.text
-                price = self.parse_price(html, etf_code)
+            if price is not None:
+                logger.info(f"成功获取 {etf_code} 价格: {price}")
+                return (price, etf_name)
 
-                if price is not None:
-                    logger.info(f"成功获取 {etf_code} 价格: {price}")
-                    return (price, etf_name)
-
-                return None
+            return None
 
         except Exception as e:
             logger.error(f"同步获取价格失败: {e}")
@@ -6,19 +6,44 @@ import asyncio
 import time
 import httpx
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Optional, Tuple
-from src.logger import logger
-from config.app import HTTP_CONFIG, ETF_CONFIG
+from typing import Dict, List, Optional
+from src.logger import logger, REQUEST_LEVEL
+from src.quote import Quote, parse_number
+from src.http_client import HTTPClientRegistry
+from src.rate_limiter import rate_limiter
+from src.metrics import metrics
+from src.debug_capture import debug_capture
+from src.secid_cache import SecidCache, secid_cache
+from config.app import HTTP_CONFIG, ETF_CONFIG, ENDPOINT_CONFIG
 
 
 class EastMoneyCrawler:
     """东方财富爬虫类"""
 
-    def __init__(self):
-        self.base_url = "https://push2.eastmoney.com/api/qt/stock/get"
+    # 搜索不到市场代码时使用的默认值
+    DEFAULT_US_MARKET_CODE = '107'
+
+    # stock/get 接口请求的字段（只请求解析时用到的）：最新价、最高、最低、开盘、成交量、成交额、
+    # 昨收、行情时间、买一价、卖一价（价格字段为整数，需除以1000）
+    QUOTE_FIELDS = 'f43,f44,f45,f46,f47,f48,f60,f86,f19,f39'
+
+    # ulist.np 批量接口请求的字段（fltt=2 时价格为浮点数）：最新价、成交量、成交额、代码、市场、
+    # 最高、最低、开盘、昨收、买一价、卖一价、行情时间
+    BATCH_FIELDS = 'f2,f5,f6,f12,f13,f15,f16,f17,f18,f31,f32,f124'
+
+    def __init__(self, http_clients: HTTPClientRegistry = None, secids: SecidCache = None):
+        self.base_url = f"{ENDPOINT_CONFIG['eastmoney']}/api/qt/stock/get"
+        self.batch_url = f"{ENDPOINT_CONFIG['eastmoney']}/api/qt/ulist.np/get"
+        self.search_url = f"{ENDPOINT_CONFIG['eastmoney_search']}/api/suggest/get"
         self.timeout = HTTP_CONFIG['timeout']
-        self.delay = HTTP_CONFIG['delay']
+        self.batch_size = HTTP_CONFIG['batch_size']
+        # 共享的长连接客户端（未传入时使用独立的注册表）
+        self.http_clients = http_clients or HTTPClientRegistry()
+        # 持久化的美股市场代码缓存；解析失败的代码只在本进程内记住，下次启动再重试
+        self.secids = secids if secids is not None else secid_cache
+        self._unresolved = set()
         self.headers = {
             'User-Agent': HTTP_CONFIG['user_agent'],
             'Accept': 'application/json',
@@ -46,40 +71,196 @@ class EastMoneyCrawler:
             # 使用搜索接口获取正确的美股市场代码
             return self._get_us_market_code(etf_code)
 
+    def _get_secid(self, etf_code: str) -> str:
+        """
+        获取东方财富API使用的证券ID
+
+        参数:
+            etf_code: ETF代码（如 SZ159915, SH510300, SCHD）
+
+        返回:
+            secid，格式为 "市场代码.纯代码"，如 0.159915, 1.510300, 107.SCHD
+        """
+        market_code = self._get_market_code(etf_code)
+        return f'{market_code}.{self._get_pure_code(etf_code)}'
+
+    async def _get_secid_async(self, etf_code: str) -> str:
+        """
+        异步获取东方财富API使用的证券ID（美股市场代码未缓存时异步查询搜索接口）
+
+        参数:
+            etf_code: ETF代码（如 SZ159915, SH510300, SCHD）
+
+        返回:
+            secid，格式为 "市场代码.纯代码"
+        """
+        if etf_code.startswith(('SZ', 'sz', 'SH', 'sh')):
+            market_code = self._get_market_code(etf_code)
+        else:
+            market_code = await self._get_us_market_code_async(etf_code)
+        return f'{market_code}.{self._get_pure_code(etf_code)}'
+
+    @staticmethod
+    def _get_pure_code(etf_code: str) -> str:
+        """去掉前缀获取纯代码（仅A股需要去掉SZ/SH前缀，如SZ159915 -> 159915，美股代码统一转为大写，如schd -> SCHD）"""
+        if etf_code.startswith(('SZ', 'sz', 'SH', 'sh')):
+            return etf_code[2:]
+        return etf_code.upper()
+
     def _get_us_market_code(self, etf_code: str) -> str:
         """
         获取美股ETF的正确市场代码（105或107）
 
+        优先使用磁盘缓存，只有未缓存的代码才请求搜索接口。
+
         参数:
             etf_code: ETF代码（如 QQQM, VGIT）
 
         返回:
             美股市场代码（105或107）
         """
+        market_code = self.secids.get(etf_code)
+        if market_code is not None:
+            return market_code
+
+        if etf_code.upper() in self._unresolved:
+            return self.DEFAULT_US_MARKET_CODE
+
+        market_code = self._search_us_market_code(etf_code)
+        if market_code is not None:
+            self.secids.set(etf_code, market_code)
+            return market_code
+
+        # 如果搜索失败或找不到，使用默认值107
+        self._unresolved.add(etf_code.upper())
+        return self.DEFAULT_US_MARKET_CODE
+
+    async def _get_us_market_code_async(self, etf_code: str) -> str:
+        """
+        异步获取美股ETF的市场代码（与 _get_us_market_code 相同，查询和写缓存都不阻塞事件循环）
+
+        参数:
+            etf_code: ETF代码（如 QQQM, VGIT）
+
+        返回:
+            美股市场代码（105或107）
+        """
+        market_code = self.secids.get(etf_code)
+        if market_code is not None:
+            return market_code
+
+        if etf_code.upper() in self._unresolved:
+            return self.DEFAULT_US_MARKET_CODE
+
+        market_code = await self._search_us_market_code_async(etf_code)
+        if market_code is not None:
+            # 写缓存文件放到线程中执行
+            await asyncio.to_thread(self.secids.set, etf_code, market_code)
+            return market_code
+
+        self._unresolved.add(etf_code.upper())
+        return self.DEFAULT_US_MARKET_CODE
+
+    def _parse_market_code_from_search(self, data: Dict, etf_code: str) -> Optional[str]:
+        """
+        从搜索接口响应中找出代码完全匹配的市场代码
+
+        参数:
+            data: 搜索接口返回的JSON数据
+            etf_code: ETF代码
+
+        返回:
+            市场代码，找不到时返回 None
+        """
+        if data.get('QuotationCodeTable', {}).get('Data'):
+            items = data['QuotationCodeTable']['Data']
+            for item in items:
+                if item.get('Code') == etf_code.upper():
+                    quote_id = item.get('QuoteID', '')
+                    # QuoteID格式: "107.SCHD" 或 "105.QQQM"
+                    if '.' in quote_id:
+                        market_code = quote_id.split('.')[0]
+                        logger.debug("获取 {} 的市场代码: {}", etf_code, market_code)
+                        return market_code
+        logger.warning(f"未找到 {etf_code} 的市场代码, 使用默认值{self.DEFAULT_US_MARKET_CODE}")
+        return None
+
+    def _search_us_market_code(self, etf_code: str) -> Optional[str]:
+        """
+        通过东方财富搜索接口查询美股ETF的市场代码
+
+        参数:
+            etf_code: ETF代码（如 QQQM, VGIT）
+
+        返回:
+            市场代码，搜索失败或找不到时返回 None
+        """
         try:
-            import httpx
-            search_url = 'https://searchapi.eastmoney.com/api/suggest/get'
             params = {'input': etf_code, 'type': 14}
-            headers = self.headers.copy()
 
-            response = httpx.get(search_url, params=params, headers=headers, timeout=5)
-            data = response.json()
+            rate_limiter.acquire(self.search_url)
+            client = self.http_clients.get_client(self.search_url)
+            response = client.get(self.search_url, params=params, headers=self.headers, timeout=5)
+            return self._parse_market_code_from_search(response.json(), etf_code)
+        except Exception as e:
+            logger.warning(f"获取 {etf_code} 的市场代码失败: {e}, 使用默认值{self.DEFAULT_US_MARKET_CODE}")
+
+        return None
+
+    async def _search_us_market_code_async(self, etf_code: str) -> Optional[str]:
+        """
+        异步通过东方财富搜索接口查询美股ETF的市场代码
 
-            if data.get('QuotationCodeTable', {}).get('Data'):
-                items = data['QuotationCodeTable']['Data']
-                for item in items:
-                    if item.get('Code') == etf_code.upper():
-                        quote_id = item.get('QuoteID', '')
-                        # QuoteID格式: "107.SCHD" 或 "105.QQQM"
-                        if '.' in quote_id:
-                            market_code = quote_id.split('.')[0]
-                            logger.debug(f"获取 {etf_code} 的市场代码: {market_code}")
-                            return market_code
+        参数:
+            etf_code: ETF代码（如 QQQM, VGIT）
+
+        返回:
+            市场代码，搜索失败或找不到时返回 None
+        """
+        try:
+            params = {'input': etf_code, 'type': 14}
+
+            await rate_limiter.acquire_async(self.search_url)
+            client = self.http_clients.get_async_client(self.search_url)
+            response = await client.get(self.search_url, params=params, headers=self.headers, timeout=5)
+            return self._parse_market_code_from_search(response.json(), etf_code)
         except Exception as e:
-            logger.warning(f"获取 {etf_code} 的市场代码失败: {e}, 使用默认值107")
+            logger.warning(f"获取 {etf_code} 的市场代码失败: {e}, 使用默认值{self.DEFAULT_US_MARKET_CODE}")
 
-        # 如果搜索失败或找不到，使用默认值107
-        return '107'
+        return None
+
+    def resolve_us_market_codes(self, etf_codes: List[str], max_workers: int = None) -> Dict[str, str]:
+        """
+        批量解析美股ETF的市场代码，并发查询未缓存的代码，最后统一写回磁盘
+
+        参数:
+            etf_codes: ETF代码列表（A股代码会被忽略）
+            max_workers: 最大并发查询数，默认使用 HTTP_CONFIG['max_concurrency']
+
+        返回:
+            {ETF代码: 市场代码}
+        """
+        us_codes = list(dict.fromkeys(
+            code.upper() for code in etf_codes if not code.upper().startswith(('SZ', 'SH'))
+        ))
+        missing = [
+            code for code in us_codes
+            if self.secids.get(code) is None and code not in self._unresolved
+        ]
+
+        if missing:
+            logger.info("批量解析美股市场代码: {} 只", len(missing))
+            with ThreadPoolExecutor(max_workers=max_workers or HTTP_CONFIG['max_concurrency']) as executor:
+                found = dict(zip(missing, executor.map(self._search_us_market_code, missing)))
+
+            for code, market_code in found.items():
+                if market_code is None:
+                    self._unresolved.add(code)
+                else:
+                    self.secids.set(code, market_code, persist=False)
+            self.secids.save()
+
+        return {code: self._get_us_market_code(code) for code in us_codes}
 
     def _get_etf_name(self, etf_code: str) -> str:
         """
@@ -95,19 +276,28 @@ class EastMoneyCrawler:
         if etf_code in ETF_CONFIG:
             return ETF_CONFIG[etf_code]['name']
 
-        # 如果不在默认配置中，尝试从csv文件获取
+        # 如果不在默认配置中，从观察列表获取（内存索引，文件变化时才重新读取），找不到时使用代码作为名称
         try:
             from src.storage import etf_list_storage
-            all_etfs = etf_list_storage.get_all_etfs()
-            if etf_code in all_etfs:
-                return all_etfs[etf_code]['name']
-        except:
-            pass
+            return etf_list_storage.get_etf_name(etf_code, etf_code)
+        except Exception:
+            return etf_code
 
-        # Fallback：使用代码作为名称
-        return etf_code
+    async def _get_etf_name_async(self, etf_code: str) -> str:
+        """
+        异步获取ETF名称（需要读取CSV时放到线程中执行，不阻塞事件循环）
 
-    async def fetch_price_async(self, etf_code: str) -> Optional[Tuple[float, str]]:
+        参数:
+            etf_code: ETF代码
+
+        返回:
+            ETF名称
+        """
+        if etf_code in ETF_CONFIG:
+            return ETF_CONFIG[etf_code]['name']
+        return await asyncio.to_thread(self._get_etf_name, etf_code)
+
+    async def fetch_price_async(self, etf_code: str) -> Optional[Quote]:
         """
         异步获取ETF价格（使用东方财富API）
 
@@ -115,45 +305,36 @@ class EastMoneyCrawler:
             etf_code: ETF代码（如SZ159915）
 
         返回:
-            (价格, ETF名称)元组，失败返回None
+            Quote（可按 (价格, ETF名称) 解包），失败返回None
         """
-        logger.info(f"开始获取 {etf_code} 的价格（东方财富）")
-
-        # 获取市场代码
-        market_code = self._get_market_code(etf_code)
-        # 去掉前缀，获取纯代码（仅A股需要去掉SZ/SH前缀，美股代码保持不变）
-        if etf_code.startswith(('SZ', 'sz', 'SH', 'sh')):
-            pure_code = etf_code[2:]  # 去掉前缀，如SZ159915 -> 159915
-        else:
-            pure_code = etf_code  # 美股ETF保持原样，如SCHD
+        logger.log(REQUEST_LEVEL, "开始获取 {} 的价格（东方财富）", etf_code)
 
         params = {
-            'secid': f'{market_code}.{pure_code}',
-            'fields': 'f43,f57,f58,f107,f60,f116,f117,f73,f59,f46,f44,f45,f47,f48,f50,f51,f52,f55,f62,f164,f165,f166,f167,f168,f169,f170,f171,f172,f173,f257,f258'
+            'secid': await self._get_secid_async(etf_code),
+            'fields': self.QUOTE_FIELDS
         }
 
         try:
-            # 添加延迟，避免触发频率限制
-            await asyncio.sleep(self.delay)
+            # 按主机限流，避免触发频率限制
+            await rate_limiter.acquire_async(self.base_url)
 
-            async with httpx.AsyncClient(timeout=self.timeout, headers=self.headers) as client:
-                logger.info(f"正在请求东方财富API: {self.base_url}?secid={params['secid']}")
-                response = await client.get(self.base_url, params=params)
-                response.raise_for_status()
+            client = self.http_clients.get_async_client(self.base_url)
+            logger.log(REQUEST_LEVEL, "正在请求东方财富API: {}?secid={}", self.base_url, params['secid'])
+            response = await client.get(self.base_url, params=params, headers=self.headers, timeout=self.timeout)
+            response.raise_for_status()
 
-                data = response.json()
-                logger.info(f"API请求成功，状态码: {response.status_code}")
+            data = response.json()
+            logger.log(REQUEST_LEVEL, "API请求成功，状态码: {}", response.status_code)
 
-                # 解析价格数据
-                price = self._parse_price_from_api(data, etf_code)
+            # 解析行情数据
+            quote = self._parse_quote_from_api(data, etf_code, await self._get_etf_name_async(etf_code))
 
-                if price is not None:
-                    etf_name = self._get_etf_name(etf_code)
-                    logger.info(f"成功从东方财富获取 {etf_code} 价格: {price}")
-                    return (price, etf_name)
-                else:
-                    logger.error(f"从东方财富API响应中解析价格失败")
-                    return None
+            if quote is not None:
+                logger.log(REQUEST_LEVEL, "成功从东方财富获取 {} 价格: {}", etf_code, quote.price)
+                return quote
+            else:
+                logger.error(f"从东方财富API响应中解析价格失败")
+                return None
 
         except httpx.HTTPStatusError as e:
             logger.error(f"东方财富API HTTP错误: {e.response.status_code} - {e.response.text[:200]}")
@@ -168,16 +349,17 @@ class EastMoneyCrawler:
             logger.error(f"东方财富API请求未知错误: {e}")
             return None
 
-    def _parse_price_from_api(self, data: Dict, etf_code: str) -> Optional[float]:
+    def _parse_quote_from_api(self, data: Dict, etf_code: str, name: str = None) -> Optional[Quote]:
         """
-        从东方财富API响应中解析价格
+        从东方财富API响应中解析行情
 
         参数:
             data: API返回的JSON数据
-            etf_code: ETF代码（用于调试）
+            etf_code: ETF代码
+            name: ETF名称，未提供时通过 _get_etf_name 获取
 
         返回:
-            价格（浮点数）或None
+            Quote（可按 (价格, 名称) 解包）或None
         """
         try:
             # 检查响应码
@@ -191,10 +373,8 @@ class EastMoneyCrawler:
             result = data.get('data')
             if not result:
                 logger.error(f"东方财富API响应中没有data数据")
-                # 保存调试信息
-                with open(f'debug_eastmoney_{etf_code}.json', 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
-                logger.info(f"已保存调试文件: debug_eastmoney_{etf_code}.json")
+                # 保存调试信息（后台写入，按代码限频）
+                debug_capture.capture(f"eastmoney_{etf_code}", data, '.json')
                 return None
 
             # 获取当前价格 (f43字段)
@@ -208,19 +388,35 @@ class EastMoneyCrawler:
             price = float(current_price_raw) / 1000.0
 
             # 验证价格范围
-            if 0.01 <= price <= 10000:
-                logger.debug(f"从东方财富API解析价格: {price}")
-                return price
-            else:
+            if not 0.01 <= price <= 10000:
                 logger.error(f"价格超出合理范围: {price}")
                 return None
 
+            logger.debug("从东方财富API解析价格: {}", price)
+            # A股成交量单位为手，美股为股
+            volume_scale = 100 if etf_code.upper().startswith(('SH', 'SZ')) else 1
+            return Quote(
+                code=etf_code,
+                name=name or self._get_etf_name(etf_code),
+                price=price,
+                prev_close=parse_number(result.get('f60'), 0.001),
+                open=parse_number(result.get('f46'), 0.001),
+                high=parse_number(result.get('f44'), 0.001),
+                low=parse_number(result.get('f45'), 0.001),
+                volume=parse_number(result.get('f47'), volume_scale),
+                turnover=parse_number(result.get('f48')),
+                bid=parse_number(result.get('f19'), 0.001),
+                ask=parse_number(result.get('f39'), 0.001),
+                timestamp=parse_number(result.get('f86')),
+                source='eastmoney'
+            )
+
         except (ValueError, TypeError, AttributeError) as e:
             logger.error(f"解析东方财富价格时出错: {e}")
             logger.error(f"响应数据: {data}")
             return None
 
-    def fetch_price_sync(self, etf_code: str) -> Optional[Tuple[float, str]]:
+    def fetch_price_sync(self, etf_code: str) -> Optional[Quote]:
         """
         同步获取ETF价格（使用东方财富API）
 
@@ -228,23 +424,13 @@ class EastMoneyCrawler:
             etf_code: ETF代码
 
         返回:
-            (价格, ETF名称)元组，失败返回None
+            Quote（可按 (价格, ETF名称) 解包），失败返回None
         """
-        logger.info(f"开始同步获取 {etf_code} 的价格（东方财富）")
-
-        # 简单延迟
-        time.sleep(self.delay)
-
-        # 获取市场代码和纯代码（仅A股需要去掉SZ/SH前缀，美股代码保持不变）
-        market_code = self._get_market_code(etf_code)
-        if etf_code.startswith(('SZ', 'sz', 'SH', 'sh')):
-            pure_code = etf_code[2:]  # 去掉前缀，如SZ159915 -> 159915
-        else:
-            pure_code = etf_code  # 美股ETF保持原样，如SCHD
+        logger.log(REQUEST_LEVEL, "开始同步获取 {} 的价格（东方财富）", etf_code)
 
         params = {
-            'secid': f'{market_code}.{pure_code}',
-            'fields': 'f43,f57,f58,f107,f60,f116,f117,f73,f59,f46,f44,f45,f47,f48,f50,f51,f52,f55,f62,f164,f165,f166,f167,f168,f169,f170,f171,f172,f173,f257,f258'
+            'secid': self._get_secid(etf_code),
+            'fields': self.QUOTE_FIELDS
         }
 
         # 重试机制
@@ -252,34 +438,38 @@ class EastMoneyCrawler:
         retry_delay = 1.0
 
         for attempt in range(max_retries):
+            if attempt > 0:
+                metrics.inc('etf_retries_total', source='eastmoney')
             try:
-                # 配置允许重定向的客户端
-                with httpx.Client(
-                    timeout=httpx.Timeout(self.timeout, connect=10.0),
+                # 按主机限流，避免触发频率限制
+                rate_limiter.acquire(self.base_url)
+
+                client = self.http_clients.get_client(self.base_url)
+                url_with_params = f"{self.base_url}?secid={params['secid']}"
+                logger.log(REQUEST_LEVEL, "正在请求东方财富API: {} (尝试 {}/{})", url_with_params, attempt + 1, max_retries)
+                response = client.get(
+                    self.base_url,
+                    params=params,
                     headers=self.headers,
                     follow_redirects=True  # 允许自动重定向
-                ) as client:
-                    url_with_params = f"{self.base_url}?secid={params['secid']}"
-                    logger.info(f"正在请求东方财富API: {url_with_params} (尝试 {attempt + 1}/{max_retries})")
-                    response = client.get(self.base_url, params=params)
-                    response.raise_for_status()
-
-                    data = response.json()
-
-                    # 解析价格数据
-                    price = self._parse_price_from_api(data, etf_code)
-                    if price is not None:
-                        etf_name = self._get_etf_name(etf_code)
-                        logger.info(f"成功从东方财富获取 {etf_code} 价格: {price}")
-                        return (price, etf_name)
-                    else:
-                        logger.error(f"从东方财富API响应中解析价格失败")
-                        if attempt < max_retries - 1:
-                            logger.info(f"将在 {retry_delay}秒后重试...")
-                            time.sleep(retry_delay)
-                            retry_delay *= 2
-                            continue
-                        return None
+                )
+                response.raise_for_status()
+
+                data = response.json()
+
+                # 解析行情数据
+                quote = self._parse_quote_from_api(data, etf_code)
+                if quote is not None:
+                    logger.log(REQUEST_LEVEL, "成功从东方财富获取 {} 价格: {}", etf_code, quote.price)
+                    return quote
+                else:
+                    logger.error(f"从东方财富API响应中解析价格失败")
+                    if attempt < max_retries - 1:
+                        logger.info(f"将在 {retry_delay}秒后重试...")
+                        time.sleep(retry_delay)
+                        retry_delay *= 2
+                        continue
+                    return None
 
             except httpx.HTTPStatusError as e:
                 logger.error(f"东方财富API HTTP错误: {e.response.status_code}")
@@ -307,6 +497,148 @@ class EastMoneyCrawler:
         return None
 
 
+    def _parse_quotes_from_batch_api(self, data: Dict) -> Dict[str, Quote]:
+        """
+        从东方财富批量接口（ulist.np）响应中解析行情
+
+        请求时使用 fltt=2，价格字段已经是浮点数，不需要再除以1000。
+        data.diff 可能是列表，也可能是以序号为键的字典。
+
+        参数:
+            data: API返回的JSON数据
+
+        返回:
+            {secid: Quote}（code 为 secid，name 为空，由调用方补充），没有有效价格的证券不会出现在结果中
+        """
+        rc_code = data.get('rc')
+        if rc_code != 0:
+            error_msg = data.get('rtmessage', '未知错误')
+            logger.error(f"东方财富批量API返回错误: {rc_code} - {error_msg}")
+            return {}
+
+        result = data.get('data') or {}
+        diff = result.get('diff') or []
+        if isinstance(diff, dict):
+            diff = list(diff.values())
+
+        prices = {}
+        for item in diff:
+            try:
+                secid = f"{item['f13']}.{str(item['f12']).upper()}"
+                price_raw = item.get('f2')
+                if price_raw is None or price_raw == '-':
+                    logger.error(f"东方财富批量API中 {secid} 没有价格")
+                    continue
+
+                price = float(price_raw)
+                if 0.01 <= price <= 10000:
+                    # A股（市场 0/1）成交量单位为手
+                    volume_scale = 100 if str(item['f13']) in ('0', '1') else 1
+                    prices[secid] = Quote(
+                        code=secid,
+                        name=None,
+                        price=price,
+                        prev_close=parse_number(item.get('f18')),
+                        open=parse_number(item.get('f17')),
+                        high=parse_number(item.get('f15')),
+                        low=parse_number(item.get('f16')),
+                        volume=parse_number(item.get('f5'), volume_scale),
+                        turnover=parse_number(item.get('f6')),
+                        bid=parse_number(item.get('f31')),
+                        ask=parse_number(item.get('f32')),
+                        timestamp=parse_number(item.get('f124')),
+                        source='eastmoney'
+                    )
+                else:
+                    logger.error(f"{secid} 价格超出合理范围: {price}")
+            except (KeyError, ValueError, TypeError) as e:
+                logger.error(f"解析东方财富批量数据时出错: {e}, 数据: {item}")
+
+        return prices
+
+    def _request_batch(self, secids: List[str]) -> Optional[Dict]:
+        """
+        请求东方财富批量接口，失败时按指数退避重试
+
+        参数:
+            secids: 证券ID列表，如 ['1.560050', '0.159967']
+
+        返回:
+            API返回的JSON数据或 None
+        """
+        params = {
+            'fltt': 2,
+            'invt': 2,
+            'secids': ','.join(secids),
+            'fields': self.BATCH_FIELDS
+        }
+
+        max_retries = 3
+        retry_delay = 1.0
+
+        for attempt in range(max_retries):
+            if attempt > 0:
+                metrics.inc('etf_retries_total', source='eastmoney')
+            try:
+                rate_limiter.acquire(self.batch_url)
+
+                client = self.http_clients.get_client(self.batch_url)
+                logger.log(REQUEST_LEVEL, "正在批量请求东方财富API: {} 只证券 (尝试 {}/{})", len(secids), attempt + 1, max_retries)
+                response = client.get(self.batch_url, params=params, headers=self.headers, follow_redirects=True)
+                response.raise_for_status()
+                return response.json()
+
+            except httpx.HTTPStatusError as e:
+                logger.error(f"东方财富批量API HTTP错误: {e.response.status_code}")
+            except Exception as e:
+                logger.error(f"东方财富批量API请求失败: {e}")
+
+            if attempt < max_retries - 1:
+                logger.info(f"将在 {retry_delay}秒后重试...")
+                time.sleep(retry_delay)
+                retry_delay *= 2
+
+        return None
+
+    def fetch_prices_batch(self, etf_codes: List[str], chunk_size: int = None) -> Dict[str, Optional[Quote]]:
+        """
+        批量同步获取ETF价格：先解析全部secid，再分块合并请求
+
+        参数:
+            etf_codes: ETF代码列表
+            chunk_size: 每个请求包含的最大证券数，默认使用 HTTP_CONFIG['batch_size']
+
+        返回:
+            {ETF代码: Quote 或 None}，顺序与传入的代码一致
+        """
+        chunk_size = chunk_size or self.batch_size
+        etf_codes = list(dict.fromkeys(etf_codes))
+
+        # 先解析所有代码的secid（未缓存的美股市场代码并发查询一次）
+        self.resolve_us_market_codes(etf_codes)
+        secids = {}
+        for etf_code in etf_codes:
+            secids.setdefault(self._get_secid(etf_code), []).append(etf_code)
+
+        prices = {}
+        secid_list = list(secids.keys())
+        for start in range(0, len(secid_list), chunk_size):
+            data = self._request_batch(secid_list[start:start + chunk_size])
+            if data is not None:
+                prices.update(self._parse_quotes_from_batch_api(data))
+
+        results = {}
+        for secid, codes in secids.items():
+            for etf_code in codes:
+                quote = prices.get(secid)
+                results[etf_code] = quote.replace(code=etf_code, name=self._get_etf_name(etf_code)) if quote is not None else None
+
+        success_count = sum(1 for result in results.values() if result is not None)
+        logger.log(REQUEST_LEVEL, "东方财富批量获取完成: {}/{} 成功", success_count, len(results))
+
+        return {etf_code: results[etf_code] for etf_code in etf_codes}
+
+
 def test_eastmoney_crawler():
     """测试东方财富爬虫"""
     print("测试东方财富API爬虫...\n")
@@ -326,6 +658,10 @@ def test_eastmoney_crawler():
         else:
             print(f"✗ 获取价格失败: {code}")
 
+    print(f"\n--- 批量测试 {', '.join(test_codes)} ---")
+    for code, result in crawler.fetch_prices_batch(test_codes).items():
+        print(f"  {code}: {result if result else '失败'}")
+
     return True
 
 
@@ -10,11 +10,15 @@ import asyncio
 import time
 import httpx
 import json
-import ssl
+import re
 from datetime import datetime
-from typing import Dict, Optional, Tuple
-from src.logger import logger
-from config.app import HTTP_CONFIG, ETF_CONFIG
+from typing import Dict, List, Optional
+from src.logger import logger, REQUEST_LEVEL
+from src.quote import Quote, parse_number, parse_china_time
+from src.http_client import HTTPClientRegistry
+from src.rate_limiter import rate_limiter
+from src.metrics import metrics
+from config.app import HTTP_CONFIG, ETF_CONFIG, ENDPOINT_CONFIG
 
 
 class TencentCrawler:
@@ -25,11 +29,20 @@ class TencentCrawler:
                'VTI', 'QQQ', 'SPY', 'IWM', 'DIA', 'EFA', 'EEM', 'VWO',
                'BND', 'TLT', 'GLD', 'SLV', 'VNQ', 'XLE', 'XLF', 'XLV'}
 
-    def __init__(self):
-        self.base_url = "https://qt.gtimg.cn/q"
-        self.yahoo_url = "https://query1.finance.yahoo.com/v8/finance/chart"
+    # 批量响应中的单行数据，如 v_sh560050="1~中国A50ETF汇添富~560050~...";
+    _BATCH_LINE_PATTERN = re.compile(r'v_([a-z]{2}[0-9A-Za-z.]+)="[^"]*"')
+
+    # Yahoo Finance spark接口单个请求最多支持的代码数
+    YAHOO_BATCH_LIMIT = 20
+
+    def __init__(self, http_clients: HTTPClientRegistry = None):
+        self.base_url = f"{ENDPOINT_CONFIG['tencent']}/q"
+        self.yahoo_url = f"{ENDPOINT_CONFIG['yahoo']}/v8/finance/chart"
+        self.yahoo_batch_url = f"{ENDPOINT_CONFIG['yahoo']}/v7/finance/spark"
         self.timeout = HTTP_CONFIG['timeout']
-        self.delay = HTTP_CONFIG['delay']
+        self.batch_size = HTTP_CONFIG['batch_size']
+        # 共享的长连接客户端（未传入时使用独立的注册表）
+        self.http_clients = http_clients or HTTPClientRegistry()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': '*/*',
@@ -67,27 +80,50 @@ class TencentCrawler:
             # 默认为上海
             return f'sh{pure_code}'
 
-    def _is_us_etf(self, etf_code: str) -> bool:
-        """判断是否是美股ETF"""
-        return etf_code.upper() in self.US_ETFS
+    def _is_us_etf(self, etf_code: str, us_group: set = None) -> bool:
+        """
+        判断是否是美股ETF（在 US_ETFS 中，或在观察列表的"美股"组中）
+
+        参数:
+            etf_code: ETF代码
+            us_group: "美股"组的代码（大写），批量判断时传入避免重复读取，默认读取观察列表
+
+        返回:
+            是否是美股ETF
+        """
+        if etf_code.upper() in self.US_ETFS:
+            return True
+        if us_group is None:
+            us_group = self._get_us_group_codes()
+        return etf_code.upper() in us_group
+
+    async def _is_us_etf_async(self, etf_code: str) -> bool:
+        """异步判断是否是美股ETF（需要读取观察列表时放到线程中执行，不阻塞事件循环）"""
+        if etf_code.upper() in self.US_ETFS:
+            return True
+        return await asyncio.to_thread(self._is_us_etf, etf_code)
 
-    def _parse_price_from_response(self, response: str, etf_code: str) -> Optional[Tuple[float, str]]:
+    def _parse_quote_from_response(self, response: str, etf_code: str) -> Optional[Quote]:
         """
         解析腾讯API响应
 
         响应格式: v_sh560050="1~中国A50ETF汇添富~560050~1.044~1.033~1.028~..."
 
         字段说明:
-        0: 股票代码
         1: 股票名称
-        2: 代码(数字)
         3: 当前价格
         4: 昨收价
         5: 开盘价
-        ...
+        9: 买一价
+        19: 卖一价
+        30: 行情时间（北京时间）
+        33: 最高价
+        34: 最低价
+        36: 成交量（手）
+        37: 成交额（万元）
 
         返回:
-        (价格, 名称) 或 None
+        Quote（可按 (价格, 名称) 解包）或 None
         """
         try:
             # 解析响应格式: v_xxxxx="..."
@@ -96,27 +132,39 @@ class TencentCrawler:
                 return None
 
             # 提取数据部分
-            data_part = response.split('=')[1].strip('"; ')
+            data_part = response.split('=')[1].strip('"; \n')
             if not data_part:
                 logger.error(f"腾讯API响应数据为空")
                 return None
 
-            # 按~分割字段
+            # 按~分割字段，字段数随市场不同，缺失的字段视为空
             fields = data_part.split('~')
             if len(fields) < 4:
                 logger.error(f"腾讯API响应字段不足: {fields}")
                 return None
+            field = lambda index: fields[index] if index < len(fields) else None
 
             # 获取当前价格 (第4个字段，索引3)
-            current_price_str = fields[3]
-            if not current_price_str or current_price_str == '-':
+            current_price = parse_number(fields[3])
+            if current_price is None:
                 logger.error(f"腾讯API返回价格为空: {fields}")
                 return None
 
-            current_price = float(current_price_str)
-            name = fields[1] if len(fields) > 1 else etf_code
-
-            return (current_price, name)
+            return Quote(
+                code=etf_code,
+                name=fields[1] or etf_code,
+                price=current_price,
+                prev_close=parse_number(field(4)),
+                open=parse_number(field(5)),
+                high=parse_number(field(33)),
+                low=parse_number(field(34)),
+                volume=parse_number(field(36), 100),
+                turnover=parse_number(field(37), 10000),
+                bid=parse_number(field(9)),
+                ask=parse_number(field(19)),
+                timestamp=parse_china_time(field(30)),
+                source='tencent'
+            )
 
         except (ValueError, IndexError) as e:
             logger.error(f"解析腾讯API响应失败: {e}, 响应: {response[:200]}")
@@ -125,7 +173,59 @@ class TencentCrawler:
             logger.error(f"解析腾讯API响应未知错误: {e}")
             return None
 
-    def _fetch_from_yahoo(self, etf_code: str) -> Optional[Tuple[float, str]]:
+    def _quote_from_yahoo_result(self, result: Dict, etf_code: str) -> Optional[Quote]:
+        """
+        从Yahoo Finance chart结果（chart接口和spark接口结构相同）中解析行情
+
+        参数:
+            result: 单个代码的结果，包含 meta 和 indicators
+            etf_code: 美股ETF代码
+
+        返回:
+            Quote 或 None
+        """
+        meta = result.get('meta') or {}
+        price = meta.get('regularMarketPrice')
+        if not price:
+            return None
+
+        opens = ((result.get('indicators') or {}).get('quote') or [{}])[0].get('open') or []
+        return Quote(
+            code=etf_code,
+            name=meta.get('symbol', etf_code.upper()),
+            price=price,
+            prev_close=meta.get('chartPreviousClose') or meta.get('previousClose'),
+            open=opens[-1] if opens else None,
+            high=meta.get('regularMarketDayHigh'),
+            low=meta.get('regularMarketDayLow'),
+            volume=meta.get('regularMarketVolume'),
+            timestamp=meta.get('regularMarketTime'),
+            source='yahoo'
+        )
+
+    def _parse_quote_from_yahoo(self, data: Dict, etf_code: str) -> Optional[Quote]:
+        """
+        解析Yahoo Finance chart接口响应
+
+        参数:
+            data: API返回的JSON数据
+            etf_code: 美股ETF代码
+
+        返回:
+            Quote（可按 (价格, 名称) 解包）或 None
+        """
+        if 'chart' in data and 'result' in data['chart']:
+            results = data['chart']['result']
+            if results and len(results) > 0:
+                quote = self._quote_from_yahoo_result(results[0], etf_code)
+                if quote is not None:
+                    logger.log(REQUEST_LEVEL, "成功从Yahoo Finance获取 {} 价格: {}", etf_code, quote.price)
+                    return quote
+
+        logger.error(f"Yahoo Finance返回数据格式错误: {data}")
+        return None
+
+    def _fetch_from_yahoo(self, etf_code: str) -> Optional[Quote]:
         """
         从Yahoo Finance获取美股ETF价格
 
@@ -133,7 +233,7 @@ class TencentCrawler:
             etf_code: 美股ETF代码，如 SCHD, QQQM
 
         返回:
-            (价格, 名称) 或 None
+            Quote（可按 (价格, 名称) 解包）或 None
         """
         url = f"{self.yahoo_url}/{etf_code.upper()}"
         headers = {
@@ -141,27 +241,48 @@ class TencentCrawler:
         }
 
         try:
-            time.sleep(self.delay)
-            response = httpx.get(url, headers=headers, timeout=self.timeout)
+            rate_limiter.acquire(url)
+            client = self.http_clients.get_client(url)
+            response = client.get(url, headers=headers, timeout=self.timeout)
             response.raise_for_status()
 
-            data = response.json()
+            return self._parse_quote_from_yahoo(response.json(), etf_code)
 
-            if 'chart' in data and 'result' in data['chart']:
-                results = data['chart']['result']
-                if results and len(results) > 0:
-                    result = results[0]
-                    if 'meta' in result:
-                        meta = result['meta']
-                        price = meta.get('regularMarketPrice')
-                        symbol = meta.get('symbol', etf_code.upper())
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Yahoo Finance HTTP错误: {e.response.status_code}")
+            return None
+        except httpx.RequestError as e:
+            logger.error(f"Yahoo Finance请求错误: {e}")
+            return None
+        except json.JSONDecodeError as e:
+            logger.error(f"Yahoo Finance JSON解析失败: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Yahoo Finance请求未知错误: {e}")
+            return None
 
-                        if price:
-                            logger.info(f"成功从Yahoo Finance获取 {etf_code} 价格: {price}")
-                            return (price, symbol)
+    async def _fetch_from_yahoo_async(self, etf_code: str) -> Optional[Quote]:
+        """
+        异步从Yahoo Finance获取美股ETF价格（不阻塞事件循环）
 
-            logger.error(f"Yahoo Finance返回数据格式错误: {data}")
-            return None
+        参数:
+            etf_code: 美股ETF代码，如 SCHD, QQQM
+
+        返回:
+            Quote（可按 (价格, 名称) 解包）或 None
+        """
+        url = f"{self.yahoo_url}/{etf_code.upper()}"
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+
+        try:
+            await rate_limiter.acquire_async(url)
+            client = self.http_clients.get_async_client(url)
+            response = await client.get(url, headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+
+            return self._parse_quote_from_yahoo(response.json(), etf_code)
 
         except httpx.HTTPStatusError as e:
             logger.error(f"Yahoo Finance HTTP错误: {e.response.status_code}")
@@ -176,7 +297,113 @@ class TencentCrawler:
             logger.error(f"Yahoo Finance请求未知错误: {e}")
             return None
 
-    async def fetch_price_async(self, etf_code: str) -> Optional[Tuple[float, str]]:
+    def _get_us_group_codes(self) -> set:
+        """获取观察列表中"美股"组的ETF代码（大写）"""
+        try:
+            from src.storage import etf_list_storage
+            return {etf_code.upper() for etf_code in etf_list_storage.get_all_etfs(group="美股")}
+        except Exception as e:
+            logger.warning(f"读取美股观察列表失败: {e}")
+            return set()
+
+    def _parse_quotes_from_yahoo_batch(self, data: Dict) -> Dict[str, Quote]:
+        """
+        解析Yahoo Finance spark接口的批量响应
+
+        响应格式: {"spark": {"result": [{"symbol": "SCHD", "response": [{"meta": {...}}]}, ...]}}
+
+        返回:
+            {大写代码: Quote}，没有有效价格的代码不会出现在结果中
+        """
+        prices = {}
+        results = (data.get('spark') or {}).get('result') or []
+        for item in results:
+            try:
+                symbol = item['symbol'].upper()
+                quote = self._quote_from_yahoo_result(item['response'][0], symbol)
+                if quote is not None:
+                    prices[symbol] = quote
+                else:
+                    logger.error(f"Yahoo Finance批量响应中 {symbol} 没有价格")
+            except (KeyError, IndexError, TypeError, AttributeError) as e:
+                logger.error(f"解析Yahoo Finance批量数据时出错: {e}, 数据: {str(item)[:200]}")
+        return prices
+
+    def _request_yahoo_batch(self, symbols: List[str]) -> Optional[Dict]:
+        """
+        请求Yahoo Finance spark接口，一次获取多个代码的行情
+
+        参数:
+            symbols: 大写的美股代码列表
+
+        返回:
+            API返回的JSON数据或 None
+        """
+        params = {'symbols': ','.join(symbols), 'range': '1d', 'interval': '1d'}
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+
+        try:
+            rate_limiter.acquire(self.yahoo_batch_url)
+            logger.log(REQUEST_LEVEL, "正在批量请求Yahoo Finance: {}", ','.join(symbols))
+            client = self.http_clients.get_client(self.yahoo_batch_url)
+            response = client.get(self.yahoo_batch_url, params=params, headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Yahoo Finance批量请求HTTP错误: {e.response.status_code}")
+        except httpx.RequestError as e:
+            logger.error(f"Yahoo Finance批量请求错误: {e}")
+        except json.JSONDecodeError as e:
+            logger.error(f"Yahoo Finance批量响应JSON解析失败: {e}")
+        except Exception as e:
+            logger.error(f"Yahoo Finance批量请求未知错误: {e}")
+        return None
+
+    def fetch_us_prices_batch(self, etf_codes: List[str] = None, chunk_size: int = None) -> Dict[str, Optional[Quote]]:
+        """
+        批量获取美股ETF价格（Yahoo Finance spark接口，多个代码合并请求）
+
+        参数:
+            etf_codes: 美股ETF代码列表，默认为 US_ETFS 加上观察列表中"美股"组的全部代码
+            chunk_size: 每个请求包含的最大代码数，不超过 YAHOO_BATCH_LIMIT
+
+        返回:
+            {ETF代码: Quote 或 None}，部分成功时失败的代码为 None
+        """
+        if etf_codes is None:
+            etf_codes = sorted(self.US_ETFS | self._get_us_group_codes())
+        etf_codes = list(dict.fromkeys(etf_codes))
+        chunk_size = min(chunk_size or self.batch_size, self.YAHOO_BATCH_LIMIT)
+
+        symbols = list(dict.fromkeys(etf_code.upper() for etf_code in etf_codes))
+        prices = {}
+        for start in range(0, len(symbols), chunk_size):
+            chunk = symbols[start:start + chunk_size]
+            data = self._request_yahoo_batch(chunk)
+            if data is None:
+                # 批量接口整体失败时，退回逐个请求chart接口
+                logger.warning(f"Yahoo Finance批量请求失败，改为逐个请求 {len(chunk)} 只ETF")
+                for symbol in chunk:
+                    result = self._fetch_from_yahoo(symbol)
+                    if result is not None:
+                        prices[symbol] = result
+                continue
+            prices.update(self._parse_quotes_from_yahoo_batch(data))
+
+        results = {
+            etf_code: prices[etf_code.upper()].replace(code=etf_code) if etf_code.upper() in prices else None
+            for etf_code in etf_codes
+        }
+
+        success_count = sum(1 for result in results.values() if result is not None)
+        logger.log(REQUEST_LEVEL, "Yahoo Finance批量获取完成: {}/{} 成功", success_count, len(results))
+
+        return results
+
+    async def fetch_price_async(self, etf_code: str) -> Optional[Quote]:
         """
         异步获取ETF价格
 
@@ -184,16 +411,16 @@ class TencentCrawler:
             etf_code: ETF代码，如 SH560050, SCHD
 
         返回:
-            (价格, 名称) 或 None
+            Quote（可按 (价格, 名称) 解包）或 None
         """
         # 判断是否是美股ETF
-        if self._is_us_etf(etf_code):
-            return self._fetch_from_yahoo(etf_code)
+        if await self._is_us_etf_async(etf_code):
+            return await self._fetch_from_yahoo_async(etf_code)
 
         stock_code = self._get_stock_code(etf_code)
         if stock_code is None:
             # 美股ETF
-            return self._fetch_from_yahoo(etf_code)
+            return await self._fetch_from_yahoo_async(etf_code)
 
         url = f"{self.base_url}={stock_code}"
 
@@ -202,37 +429,34 @@ class TencentCrawler:
         retry_delay = 1.0
 
         for attempt in range(max_retries):
+            if attempt > 0:
+                metrics.inc('etf_retries_total', source='tencent')
             try:
-                # 添加延迟，避免触发频率限制
-                await asyncio.sleep(self.delay)
+                # 按主机限流，避免触发频率限制
+                await rate_limiter.acquire_async(url)
 
-                async with httpx.AsyncClient(
-                    timeout=httpx.Timeout(self.timeout, connect=10.0),
-                    headers=self.headers,
-                    http2=False
-                ) as client:
-                    logger.info(f"正在请求腾讯财经API: {url} (尝试 {attempt + 1}/{max_retries})")
-                    response = await client.get(url)
-                    response.raise_for_status()
+                client = self.http_clients.get_async_client(url)
+                logger.log(REQUEST_LEVEL, "正在请求腾讯财经API: {} (尝试 {}/{})", url, attempt + 1, max_retries)
+                response = await client.get(url, headers=self.headers)
+                response.raise_for_status()
 
-                    # 尝试用GB18030解码（腾讯API返回GB编码）
-                    try:
-                        text = response.content.decode('GB18030')
-                    except UnicodeDecodeError:
-                        text = response.text
+                # 尝试用GB18030解码（腾讯API返回GB编码）
+                try:
+                    text = response.content.decode('GB18030')
+                except UnicodeDecodeError:
+                    text = response.text
 
-                    logger.info(f"腾讯API请求成功，状态码: {response.status_code}")
+                logger.log(REQUEST_LEVEL, "腾讯API请求成功，状态码: {}", response.status_code)
 
-                    # 解析价格数据
-                    result = self._parse_price_from_response(text, etf_code)
+                # 解析价格数据
+                result = self._parse_quote_from_response(text, etf_code)
 
-                    if result is not None:
-                        price, name = result
-                        logger.info(f"成功从腾讯财经获取 {etf_code} 价格: {price}, 名称: {name}")
-                        return (price, name)
-                    else:
-                        logger.error(f"从腾讯财经API解析价格失败")
-                        return None
+                if result is not None:
+                    logger.log(REQUEST_LEVEL, "成功从腾讯财经获取 {} 价格: {}, 名称: {}", etf_code, result.price, result.name)
+                    return result
+                else:
+                    logger.error(f"从腾讯财经API解析价格失败")
+                    return None
 
             except httpx.HTTPStatusError as e:
                 logger.error(f"腾讯财经API HTTP错误: {e.response.status_code} - {e.response.text[:200]}")
@@ -261,7 +485,55 @@ class TencentCrawler:
 
         return None
 
-    def fetch_price_sync(self, etf_code: str) -> Optional[Tuple[float, str]]:
+    def _request_text(self, url: str) -> Optional[str]:
+        """
+        同步请求腾讯API并返回解码后的文本，失败时按指数退避重试
+
+        参数:
+            url: 完整请求地址，如 https://qt.gtimg.cn/q=sh560050,sz159967
+
+        返回:
+            响应文本（GB18030解码）或 None
+        """
+        max_retries = 3
+        retry_delay = 1.0
+
+        for attempt in range(max_retries):
+            if attempt > 0:
+                metrics.inc('etf_retries_total', source='tencent')
+            try:
+                # 按主机限流，避免触发频率限制
+                rate_limiter.acquire(url)
+
+                # 复用该主机的长连接客户端
+                client = self.http_clients.get_client(url)
+                logger.log(REQUEST_LEVEL, "正在请求腾讯财经API: {} (尝试 {}/{})", url, attempt + 1, max_retries)
+                response = client.get(url, headers=self.headers)
+                response.raise_for_status()
+
+                logger.log(REQUEST_LEVEL, "腾讯API请求成功，状态码: {}", response.status_code)
+
+                # 尝试用GB18030解码
+                try:
+                    return response.content.decode('GB18030')
+                except UnicodeDecodeError:
+                    return response.text
+
+            except httpx.HTTPStatusError as e:
+                logger.error(f"腾讯财经API HTTP错误: {e.response.status_code}")
+            except httpx.RequestError as e:
+                logger.error(f"腾讯财经API请求错误: {e}")
+            except Exception as e:
+                logger.error(f"腾讯财经API请求未知错误: {e}")
+
+            if attempt < max_retries - 1:
+                logger.info(f"将在 {retry_delay}秒后重试...")
+                time.sleep(retry_delay)
+                retry_delay *= 2  # 指数退避
+
+        return None
+
+    def fetch_price_sync(self, etf_code: str) -> Optional[Quote]:
         """
         同步获取ETF价格
 
@@ -269,7 +541,7 @@ class TencentCrawler:
             etf_code: ETF代码，如 SH560050, SCHD
 
         返回:
-            (价格, 名称) 或 None
+            Quote（可按 (价格, 名称) 解包）或 None
         """
         # 判断是否是美股ETF
         if self._is_us_etf(etf_code):
@@ -280,77 +552,88 @@ class TencentCrawler:
             # 美股ETF
             return self._fetch_from_yahoo(etf_code)
 
-        url = f"{self.base_url}={stock_code}"
+        text = self._request_text(f"{self.base_url}={stock_code}")
+        if text is None:
+            return None
 
-        # 配置SSL上下文，允许较旧的TLS版本以兼容腾讯API
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = True
-        ssl_context.verify_mode = ssl.CERT_REQUIRED
+        # 解析价格数据
+        result = self._parse_quote_from_response(text, etf_code)
 
-        # 创建httpx客户端，配置更长的超时和更好的SSL处理
-        max_retries = 3
-        retry_delay = 1.0
+        if result is not None:
+            logger.log(REQUEST_LEVEL, "成功从腾讯财经获取 {} 价格: {}, 名称: {}", etf_code, result.price, result.name)
+            return result
 
-        for attempt in range(max_retries):
-            try:
-                # 添加延迟
-                time.sleep(self.delay)
-
-                # 创建客户端，禁用HTTP/2以提高稳定性
-                with httpx.Client(
-                    timeout=httpx.Timeout(self.timeout, connect=10.0),
-                    headers=self.headers,
-                    http2=False
-                ) as client:
-                    logger.info(f"正在请求腾讯财经API: {url} (尝试 {attempt + 1}/{max_retries})")
-                    response = client.get(url)
-                    response.raise_for_status()
-
-                    # 尝试用GB18030解码
-                    try:
-                        text = response.content.decode('GB18030')
-                    except UnicodeDecodeError:
-                        text = response.text
-
-                    logger.info(f"腾讯API请求成功，状态码: {response.status_code}")
-
-                    # 解析价格数据
-                    result = self._parse_price_from_response(text, etf_code)
+        logger.error(f"从腾讯财经API解析价格失败")
+        return None
 
-                    if result is not None:
-                        price, name = result
-                        logger.info(f"成功从腾讯财经获取 {etf_code} 价格: {price}, 名称: {name}")
-                        return (price, name)
+    def _split_batch_response(self, response: str) -> Dict[str, str]:
+        """
+        拆分腾讯API批量响应
+
+        响应格式: 每个代码一行，如
+            v_sh560050="1~中国A50ETF汇添富~560050~1.044~...";
+            v_sz159967="0~创业板成长ETF~159967~0.612~...";
+
+        未知代码会返回 v_pv_none_match="1"; 这类行，不会被匹配到。
+
+        返回:
+            {腾讯股票代码: 该代码对应的响应行}
+        """
+        lines = {}
+        for match in self._BATCH_LINE_PATTERN.finditer(response):
+            lines[match.group(1)] = match.group(0)
+        return lines
+
+    def fetch_prices_batch(self, etf_codes: List[str], chunk_size: int = None) -> Dict[str, Optional[Quote]]:
+        """
+        批量同步获取ETF价格，多个代码合并到同一个请求中（q=sh560050,sz159967,...）
+
+        参数:
+            etf_codes: ETF代码列表，如 ['SH560050', 'SZ159967', 'SCHD']
+            chunk_size: 每个请求包含的最大代码数，默认使用 HTTP_CONFIG['batch_size']
+
+        返回:
+            {ETF代码: Quote 或 None}，顺序与传入的代码一致
+        """
+        chunk_size = chunk_size or self.batch_size
+        results = {}
+
+        # 腾讯股票代码 -> ETF代码列表（同一股票代码可能对应多个写法的ETF代码）
+        stock_codes = {}
+        us_codes = []
+        us_group = self._get_us_group_codes()
+        for etf_code in dict.fromkeys(etf_codes):
+            if self._is_us_etf(etf_code, us_group):
+                # 美股ETF不在腾讯API中，统一批量请求Yahoo Finance
+                us_codes.append(etf_code)
+                continue
+            stock_codes.setdefault(self._get_stock_code(etf_code), []).append(etf_code)
+
+        if us_codes:
+            results.update(self.fetch_us_prices_batch(us_codes))
+
+        symbols = list(stock_codes.keys())
+        request_count = 0
+        for start in range(0, len(symbols), chunk_size):
+            chunk = symbols[start:start + chunk_size]
+            text = self._request_text(f"{self.base_url}={','.join(chunk)}")
+            request_count += 1
+            lines = self._split_batch_response(text) if text else {}
+
+            for stock_code in chunk:
+                line = lines.get(stock_code)
+                for etf_code in stock_codes[stock_code]:
+                    if line is None:
+                        if text is not None:
+                            logger.error(f"腾讯API批量响应中缺少 {etf_code} 的数据")
+                        results[etf_code] = None
                     else:
-                        logger.error(f"从腾讯财经API解析价格失败")
-                        return None
+                        results[etf_code] = self._parse_quote_from_response(line, etf_code)
 
-            except httpx.HTTPStatusError as e:
-                logger.error(f"腾讯财经API HTTP错误: {e.response.status_code}")
-                if attempt < max_retries - 1:
-                    logger.info(f"将在 {retry_delay}秒后重试...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # 指数退避
-                else:
-                    return None
-            except httpx.RequestError as e:
-                logger.error(f"腾讯财经API请求错误: {e}")
-                if attempt < max_retries - 1:
-                    logger.info(f"将在 {retry_delay}秒后重试...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2
-                else:
-                    return None
-            except Exception as e:
-                logger.error(f"腾讯财经API请求未知错误: {e}")
-                if attempt < max_retries - 1:
-                    logger.info(f"将在 {retry_delay}秒后重试...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2
-                else:
-                    return None
+        success_count = sum(1 for result in results.values() if result is not None)
+        logger.log(REQUEST_LEVEL, "腾讯财经批量获取完成: {}/{} 成功，共 {} 个请求", success_count, len(results), request_count)
 
-        return None
+        return {etf_code: results[etf_code] for etf_code in dict.fromkeys(etf_codes)}
 
 
 def test_tencent_crawler():
@@ -376,6 +659,10 @@ def test_tencent_crawler():
         else:
             print(f"  失败")
 
+    print(f"\n批量测试 {', '.join(test_codes)}...")
+    for code, result in crawler.fetch_prices_batch(test_codes).items():
+        print(f"  {code}: {result if result else '失败'}")
+
 
 if __name__ == '__main__':
     test_tencent_crawler()
@@ -2,23 +2,110 @@
 ETF数据源管理器
 支持多数据源自动切换：腾讯财经 -> 东方财富
 """
+import asyncio
+import math
+import threading
 import time
-from typing import Optional, Tuple
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
 from src.logger import logger
-from src.crawler_tencent import TencentCrawler
-from src.crawler_eastmoney import EastMoneyCrawler
+from src.http_client import HTTPClientRegistry
+from src.circuit_breaker import CircuitBreaker
+from src.quote import Quote
+from src.quote_cache import QuoteCache
+from src.market_calendar import market_calendar
+from src.metrics import metrics
+from src.loop_monitor import LoopBlockMonitor
+from config.app import HTTP_CONFIG, HEDGE_CONFIG, MARKET_CALENDAR_CONFIG, LOOP_MONITOR_CONFIG
+
+
+class LatencyTracker:
+    """记录最近若干次请求耗时，用于计算延迟分位数"""
+
+    def __init__(self, window: int = 200):
+        self.samples = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        """记录一次请求耗时（秒）"""
+        self.samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        计算延迟分位数
+
+        参数:
+            p: 分位数（0-100），如 95
+
+        返回:
+            对应分位的耗时（秒），没有样本时返回 None
+        """
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = max(0, math.ceil(p / 100 * len(ordered)) - 1)
+        return ordered[min(index, len(ordered) - 1)]
 
 
 class ETFDataSourceManager:
     """ETF数据源管理器，支持多数据源自动切换"""
 
     def __init__(self):
-        self.tencent_crawler = TencentCrawler()
-        self.eastmoney_crawler = EastMoneyCrawler()
+        # 所有爬虫共享的长连接客户端，按主机维护连接池
+        self.http_clients = HTTPClientRegistry()
+        # 爬虫在首次使用时才导入和创建
+        self._tencent_crawler = None
+        self._eastmoney_crawler = None
+        self._crawler_lock = threading.Lock()
         self.primary_source = 'tencent'  # 主数据源
         self.fallback_enabled = True  # 启用备用数据源
+        # 对冲请求：主数据源慢于历史延迟分位数时并行请求备用数据源
+        self.hedge_enabled = HEDGE_CONFIG['enabled']
+        self.latency = {
+            'tencent': LatencyTracker(HEDGE_CONFIG['window']),
+            'eastmoney': LatencyTracker(HEDGE_CONFIG['window'])
+        }
+        self.batch_latency = {
+            'tencent': LatencyTracker(HEDGE_CONFIG['window']),
+            'eastmoney': LatencyTracker(HEDGE_CONFIG['window'])
+        }
+        # 每个数据源一个熔断器，错误率过高时直接跳过该数据源
+        self.breakers = {
+            'tencent': CircuitBreaker('tencent'),
+            'eastmoney': CircuitBreaker('eastmoney')
+        }
+        # 行情缓存：新鲜期内直接返回，过期后先返回旧价格并在后台刷新
+        self.quote_cache = QuoteCache()
+        self._refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='quote-refresh')
+        self._refreshing = set()
+        self._refreshing_lock = threading.Lock()
+        # 休市期间使用收盘后缓存的价格
+        self.market_hours_enabled = MARKET_CALENDAR_CONFIG['enabled']
+        # 后台事件循环的阻塞检测器（LOOP_MONITOR_ENABLED=true 时首次运行协程前启动）
+        self._loop_monitor: Optional[LoopBlockMonitor] = None
+        self._loop_monitor_lock = threading.Lock()
 
-    def fetch_price(self, etf_code: str, use_fallback: bool = True) -> Optional[Tuple[float, str]]:
+    @property
+    def tencent_crawler(self) -> 'TencentCrawler':
+        """腾讯财经爬虫（首次访问时创建）"""
+        if self._tencent_crawler is None:
+            with self._crawler_lock:
+                if self._tencent_crawler is None:
+                    from src.crawler_tencent import TencentCrawler
+                    self._tencent_crawler = TencentCrawler(http_clients=self.http_clients)
+        return self._tencent_crawler
+
+    @property
+    def eastmoney_crawler(self) -> 'EastMoneyCrawler':
+        """东方财富爬虫（首次访问时创建）"""
+        if self._eastmoney_crawler is None:
+            with self._crawler_lock:
+                if self._eastmoney_crawler is None:
+                    from src.crawler_eastmoney import EastMoneyCrawler
+                    self._eastmoney_crawler = EastMoneyCrawler(http_clients=self.http_clients)
+        return self._eastmoney_crawler
+
+    def fetch_price(self, etf_code: str, use_fallback: bool = True) -> Optional[Quote]:
         """
         获取ETF价格，自动切换数据源
 
@@ -27,8 +114,11 @@ class ETFDataSourceManager:
             use_fallback: 是否使用备用数据源
 
         返回:
-            (价格, 名称) 或 None
+            Quote（可按 (价格, 名称) 解包）或 None
         """
+        if self.hedge_enabled and use_fallback and self.fallback_enabled:
+            return self._run_sync(self.fetch_price_async(etf_code, use_fallback))
+
         # 尝试主数据源（腾讯财经）
         if self.primary_source == 'tencent':
             result = self._try_tencent(etf_code)
@@ -38,6 +128,7 @@ class ETFDataSourceManager:
             # 主数据源失败，尝试备用数据源
             if use_fallback and self.fallback_enabled:
                 logger.warning("腾讯财经API失败，尝试东方财富备用数据源...")
+                metrics.inc('etf_fallbacks_total', from_source='tencent', to_source='eastmoney')
                 result = self._try_eastmoney(etf_code)
                 if result is not None:
                     return result
@@ -52,36 +143,61 @@ class ETFDataSourceManager:
             # 备用数据源失败，尝试主数据源
             if use_fallback and self.fallback_enabled:
                 logger.warning("东方财富API失败，尝试腾讯财经备用数据源...")
+                metrics.inc('etf_fallbacks_total', from_source='eastmoney', to_source='tencent')
                 result = self._try_tencent(etf_code)
                 if result is not None:
                     return result
 
             return None
 
-    def _try_tencent(self, etf_code: str) -> Optional[Tuple[float, str]]:
+    def _try_tencent(self, etf_code: str) -> Optional[Quote]:
         """尝试从腾讯财经获取数据"""
+        breaker = self.breakers['tencent']
+        ticket = breaker.allow_request()
+        if ticket is None:
+            logger.debug("腾讯财经处于熔断状态，跳过 {}", etf_code)
+            return None
+
+        result = None
+        start = time.perf_counter()
         try:
-            logger.debug(f"尝试从腾讯财经获取 {etf_code} 价格")
-            return self.tencent_crawler.fetch_price_sync(etf_code)
+            logger.debug("尝试从腾讯财经获取 {} 价格", etf_code)
+            result = self.tencent_crawler.fetch_price_sync(etf_code)
         except Exception as e:
             logger.error(f"腾讯财经获取 {etf_code} 失败: {e}")
-            return None
+        finally:
+            breaker.record(ticket, result is not None)
+            self._record_request('tencent', etf_code, result, time.perf_counter() - start)
+        self._remember(etf_code, result, 'tencent')
+        return result
 
-    def _try_eastmoney(self, etf_code: str) -> Optional[Tuple[float, str]]:
+    def _try_eastmoney(self, etf_code: str) -> Optional[Quote]:
         """尝试从东方财富获取数据"""
+        breaker = self.breakers['eastmoney']
+        ticket = breaker.allow_request()
+        if ticket is None:
+            logger.debug("东方财富处于熔断状态，跳过 {}", etf_code)
+            return None
+
+        result = None
+        start = time.perf_counter()
         try:
-            logger.debug(f"尝试从东方财富获取 {etf_code} 价格")
-            return self.eastmoney_crawler.fetch_price_sync(etf_code)
+            logger.debug("尝试从东方财富获取 {} 价格", etf_code)
+            result = self.eastmoney_crawler.fetch_price_sync(etf_code)
         except Exception as e:
             logger.error(f"东方财富获取 {etf_code} 失败: {e}")
-            return None
+        finally:
+            breaker.record(ticket, result is not None)
+            self._record_request('eastmoney', etf_code, result, time.perf_counter() - start)
+        self._remember(etf_code, result, 'eastmoney')
+        return result
 
-    def fetch_price_with_source(self, etf_code: str) -> Tuple[Optional[Tuple[float, str]], str]:
+    def fetch_price_with_source(self, etf_code: str) -> Tuple[Optional[Quote], str]:
         """
         获取ETF价格，同时返回使用的数据源
 
         返回:
-            ((价格, 名称), 数据源名称) 或 (None, 数据源名称)
+            (Quote, 数据源名称) 或 (None, 数据源名称)
         """
         # 尝试腾讯财经
         result = self._try_tencent(etf_code)
@@ -90,28 +206,658 @@ class ETFDataSourceManager:
 
         # 尝试东方财富
         if self.fallback_enabled:
+            metrics.inc('etf_fallbacks_total', from_source='tencent', to_source='eastmoney')
             result = self._try_eastmoney(etf_code)
             if result is not None:
                 return (result, 'eastmoney')
 
         return (None, 'none')
 
+    def fetch_prices_batch(self, etf_codes: List[str], use_fallback: bool = True) -> Dict[str, Optional[Quote]]:
+        """
+        批量获取多只ETF价格：先用腾讯财经批量请求，失败的代码再批量请求东方财富，
+        仍然失败的代码最后逐只并发请求单只接口
+
+        启用对冲模式时，腾讯财经批量请求慢于历史延迟分位数会并行批量请求东方财富。
+
+        参数:
+            etf_codes: ETF代码列表
+            use_fallback: 是否使用备用数据源
+
+        返回:
+            {ETF代码: Quote（可按 (价格, 名称) 解包）或 None}
+        """
+        if not (use_fallback and self.fallback_enabled):
+            return self._try_batch('tencent', self.tencent_crawler.fetch_prices_batch, etf_codes)
+
+        if self.hedge_enabled:
+            results = self._run_sync(self._fetch_batch_hedged_async(etf_codes))
+        else:
+            results = self._try_batch('tencent', self.tencent_crawler.fetch_prices_batch, etf_codes)
+            failed_codes = [etf_code for etf_code, result in results.items() if result is None]
+            if failed_codes:
+                self._merge_missing(results, self._fallback_batch(failed_codes))
+
+        # 两个批量接口都没有拿到的代码（如整个批量请求超时），逐只并发走单只接口重试
+        failed_codes = [etf_code for etf_code, result in results.items() if result is None]
+        if failed_codes:
+            logger.warning(f"批量请求仍有 {len(failed_codes)} 只ETF没有价格，逐只并发重试...")
+            self._merge_missing(results, self._fetch_concurrent(failed_codes))
+
+        return results
+
+    def _fallback_batch(self, etf_codes: List[str]) -> Dict[str, Optional[Quote]]:
+        """腾讯财经批量请求失败的代码改用东方财富批量请求"""
+        logger.warning(f"腾讯财经有 {len(etf_codes)} 只ETF获取失败，尝试东方财富备用数据源...")
+        metrics.inc('etf_fallbacks_total', len(etf_codes), from_source='tencent', to_source='eastmoney')
+        return self._try_batch('eastmoney', self.eastmoney_crawler.fetch_prices_batch, etf_codes)
+
+    @staticmethod
+    def _merge_missing(results: Dict[str, Optional[Quote]], other: Dict[str, Optional[Quote]]):
+        """用另一批结果补齐 results 中没有价格的代码（已有的价格保持不变）"""
+        for etf_code, result in other.items():
+            if result is not None and results.get(etf_code) is None:
+                results[etf_code] = result
+
+    async def _fetch_batch_hedged_async(self, etf_codes: List[str]) -> Dict[str, Optional[Quote]]:
+        """
+        对冲批量请求：腾讯财经批量请求在等待时间内没有返回时，并行批量请求东方财富，
+        先返回的结果先采用，缺少的代码再用另一方的结果补齐
+
+        批量请求是同步调用，在线程中执行；落后的一方无法取消，会在后台完成并写入行情缓存。
+
+        参数:
+            etf_codes: ETF代码列表
+
+        返回:
+            {ETF代码: Quote（可按 (价格, 名称) 解包）或 None}
+        """
+        etf_codes = list(dict.fromkeys(etf_codes))
+        hedge_delay = self._hedge_delay('tencent', batch=True)
+        primary_task = asyncio.create_task(asyncio.to_thread(
+            self._try_batch, 'tencent', self.tencent_crawler.fetch_prices_batch, etf_codes))
+        done, _ = await asyncio.wait({primary_task}, timeout=hedge_delay)
+
+        if done:
+            results = primary_task.result()
+            failed_codes = [etf_code for etf_code, result in results.items() if result is None]
+            if failed_codes:
+                self._merge_missing(results, await asyncio.to_thread(self._fallback_batch, failed_codes))
+            return results
+
+        logger.info("腾讯财经批量获取 {} 只ETF超过 {:.2f}秒未返回，并行请求东方财富", len(etf_codes), hedge_delay)
+        metrics.inc('etf_hedged_requests_total', source='tencent')
+        fallback_task = asyncio.create_task(asyncio.to_thread(
+            self._try_batch, 'eastmoney', self.eastmoney_crawler.fetch_prices_batch, etf_codes))
+
+        results = {etf_code: None for etf_code in etf_codes}
+        pending = {primary_task, fallback_task}
+        while pending and any(result is None for result in results.values()):
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                self._merge_missing(results, task.result())
+        return results
+
+    def _try_batch(self, source: str, fetch_batch: Callable,
+                   etf_codes: List[str]) -> Dict[str, Optional[Quote]]:
+        """
+        通过熔断器执行一次批量请求
+
+        参数:
+            source: 数据源名称
+            fetch_batch: 爬虫的批量获取方法
+            etf_codes: ETF代码列表
+
+        返回:
+            {ETF代码: Quote（可按 (价格, 名称) 解包）或 None}，数据源熔断或请求异常时全部为 None
+        """
+        results = {etf_code: None for etf_code in dict.fromkeys(etf_codes)}
+        breaker = self.breakers[source]
+        ticket = breaker.allow_request()
+        if ticket is None:
+            logger.warning(f"数据源 {source} 处于熔断状态，跳过 {len(results)} 只ETF")
+            return results
+
+        start = time.perf_counter()
+        try:
+            results.update(fetch_batch(etf_codes))
+        except Exception as e:
+            logger.error(f"{source} 批量获取失败: {e}")
+        finally:
+            # 批量请求只要有一只成功，就说明数据源可用
+            breaker.record(ticket, any(result is not None for result in results.values()))
+        seconds = time.perf_counter() - start
+        if any(result is not None for result in results.values()):
+            self.batch_latency[source].record(seconds)
+        metrics.observe('etf_batch_duration_seconds', seconds, source=source)
+        for etf_code, result in results.items():
+            metrics.inc('etf_batch_requests_total', source=self._source_label(source, etf_code),
+                        market=market_calendar.market_for_code(etf_code),
+                        outcome='success' if result is not None else 'failure')
+            self._remember(etf_code, result, source)
+        return results
+
+    def _source_label(self, source: str, etf_code: str) -> str:
+        """指标中使用的实际数据源名称（腾讯爬虫中的美股ETF实际来自Yahoo Finance）"""
+        if source == 'tencent' and self.tencent_crawler._is_us_etf(etf_code):
+            return 'yahoo'
+        return source
+
+    def _record_request(self, source: str, etf_code: str, result: Optional[Quote], seconds: float):
+        """
+        记录一次单只ETF请求的结果和耗时
+
+        参数:
+            source: 数据源名称
+            etf_code: ETF代码
+            result: Quote 或 None
+            seconds: 耗时（秒）
+        """
+        source = self._source_label(source, etf_code)
+        market = market_calendar.market_for_code(etf_code)
+        metrics.inc('etf_requests_total', source=source, market=market,
+                    outcome='success' if result is not None else 'failure')
+        metrics.observe('etf_request_duration_seconds', seconds, source=source, market=market)
+
+    def _remember(self, etf_code: str, result: Optional[Quote], source: str):
+        """
+        把成功获取的价格写入行情缓存
+
+        参数:
+            etf_code: ETF代码
+            result: Quote 或 None
+            source: 数据源名称（Quote 自带来源时以 Quote 为准，腾讯爬虫中的美股ETF实际来自Yahoo Finance）
+        """
+        if result is None:
+            return
+        source = self._source_label(source, etf_code)
+        price, name = result
+        quote = result if isinstance(result, Quote) else None
+        self.quote_cache.set(etf_code, price, name, quote.source if quote and quote.source else source, quote=quote)
+
+    def get_quote_info(self, etf_code: str) -> Optional[Dict]:
+        """
+        获取ETF最近一次行情的缓存信息，供界面显示数据来源和时效
+
+        返回:
+            {code, price, name, source, fetched_at, quote, age} 或 None，quote 为完整行情（Quote）
+        """
+        return self.quote_cache.get(etf_code)
+
+    def fetch_price_cached(self, etf_code: str) -> Optional[Quote]:
+        """
+        优先从行情缓存获取ETF价格
+
+        - 市场休市且缓存是上次收盘后获取的: 直接返回，不再请求
+        - 缓存新鲜: 直接返回
+        - 缓存过期但仍可用: 立即返回旧价格，同时在后台刷新
+        - 没有可用缓存: 同步请求数据源
+
+        参数:
+            etf_code: ETF代码
+
+        返回:
+            Quote（可按 (价格, 名称) 解包）或 None
+        """
+        entry = self.quote_cache.get(etf_code)
+        if entry is not None and self._is_closed_market_quote(etf_code, entry, {}):
+            return entry['quote']
+
+        if entry is not None and self.quote_cache.is_usable(entry):
+            if not self.quote_cache.is_fresh(entry):
+                self._schedule_refresh([etf_code])
+            return entry['quote']
+
+        return self.fetch_price(etf_code)
+
+    def fetch_prices_cached(self, etf_codes: List[str], force_refresh: bool = False) -> Dict[str, Optional[Quote]]:
+        """
+        批量获取ETF价格，优先使用行情缓存，只对没有可用缓存的代码发起批量请求
+
+        参数:
+            etf_codes: ETF代码列表
+            force_refresh: 是否忽略交易时段内的缓存，全部重新请求（休市期间收盘后缓存的价格仍直接使用）
+
+        返回:
+            {ETF代码: Quote（可按 (价格, 名称) 解包）或 None}，顺序与传入的代码一致
+        """
+        started = time.perf_counter()
+        results = {}
+        stale_codes = []
+        missing_codes = []
+        closed_since = {}
+        for etf_code in dict.fromkeys(etf_codes):
+            entry = self.quote_cache.get(etf_code)
+            if entry is not None and self._is_closed_market_quote(etf_code, entry, closed_since):
+                results[etf_code] = entry['quote']
+                continue
+            if entry is None or force_refresh or not self.quote_cache.is_usable(entry):
+                missing_codes.append(etf_code)
+                continue
+            results[etf_code] = entry['quote']
+            if not self.quote_cache.is_fresh(entry):
+                stale_codes.append(etf_code)
+
+        cached_count = len(results)
+        if missing_codes:
+            results.update(self.fetch_prices_batch(missing_codes))
+        if stale_codes:
+            self._schedule_refresh(stale_codes)
+
+        results = {etf_code: results.get(etf_code) for etf_code in dict.fromkeys(etf_codes)}
+        self._log_summary(results, started, cached_count)
+        return results
+
+    def _log_summary(self, results: Dict[str, Optional[Quote]], started: float, cached_count: int = 0):
+        """
+        输出一轮批量获取的汇总日志（LOG_PROFILE=quiet 时代替单次请求的日志）
+
+        参数:
+            results: {ETF代码: Quote 或 None}
+            started: 开始时间（time.perf_counter()）
+            cached_count: 直接使用缓存的数量
+        """
+        sources = Counter(quote.source for quote in results.values() if quote is not None)
+        failed = sum(1 for quote in results.values() if quote is None)
+        source_text = ', '.join(f"{source} {count}" for source, count in sources.most_common())
+        logger.info(
+            "获取 {} 只ETF价格: 成功 {}（{}；其中缓存 {}），失败 {}，耗时 {:.2f} 秒",
+            len(results), len(results) - failed, source_text or '无', cached_count, failed,
+            time.perf_counter() - started
+        )
+        metrics.maybe_write()
+
+    def _is_closed_market_quote(self, etf_code: str, entry: Dict, closed_since: Dict[str, Optional[float]]) -> bool:
+        """
+        判断缓存价格是否为休市期间可直接使用的收盘价
+
+        市场休市时价格不会变化，只要缓存是在上一次收盘之后获取的，在下次开盘前都有效。
+
+        参数:
+            etf_code: ETF代码
+            entry: 缓存记录
+            closed_since: 本次调用内按市场缓存的收盘时间戳（开市时为 None），避免重复计算
+
+        返回:
+            是否可以直接使用缓存
+        """
+        if not self.market_hours_enabled:
+            return False
+
+        market = market_calendar.market_for_code(etf_code)
+        if market not in closed_since:
+            last_close = None
+            if not market_calendar.is_open(market):
+                last_close = market_calendar.last_close(market)
+            closed_since[market] = last_close.timestamp() if last_close is not None else None
+
+        return closed_since[market] is not None and entry['fetched_at'] >= closed_since[market]
+
+    def get_market_status(self, etf_codes: List[str]) -> List[Dict]:
+        """
+        获取ETF所属各市场的交易状态
+
+        参数:
+            etf_codes: ETF代码列表
+
+        返回:
+            [{market, name, is_open, last_close, next_open}, ...]
+        """
+        markets = dict.fromkeys(market_calendar.market_for_code(etf_code) for etf_code in etf_codes)
+        return [market_calendar.status(market) for market in markets]
+
+    def _schedule_refresh(self, etf_codes: List[str]):
+        """
+        在后台线程中刷新过期的缓存，同一代码同时只会有一个刷新任务
+
+        参数:
+            etf_codes: 需要刷新的ETF代码列表
+        """
+        with self._refreshing_lock:
+            codes = [etf_code for etf_code in etf_codes if etf_code not in self._refreshing]
+            self._refreshing.update(codes)
+        if not codes:
+            return
+
+        def refresh():
+            try:
+                logger.debug("后台刷新 {} 只ETF的缓存价格", len(codes))
+                self.fetch_prices_batch(codes)
+            except Exception as e:
+                logger.error(f"后台刷新缓存价格失败: {e}")
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing.difference_update(codes)
+
+        try:
+            self._refresh_executor.submit(refresh)
+        except RuntimeError:
+            # 程序退出中，线程池已关闭
+            with self._refreshing_lock:
+                self._refreshing.difference_update(codes)
+
+    def preload_market_codes(self, etf_codes: List[str]):
+        """
+        在后台预先解析自选列表中美股ETF的东方财富市场代码，
+        使之后的行情请求不再需要查询搜索接口
+
+        参数:
+            etf_codes: ETF代码列表
+        """
+        try:
+            self._refresh_executor.submit(self.eastmoney_crawler.resolve_us_market_codes, list(etf_codes))
+        except RuntimeError:
+            # 程序退出中，线程池已关闭
+            pass
+
+    def get_source_status(self) -> List[Dict]:
+        """
+        获取各数据源的熔断器状态
+
+        返回:
+            [{name, state, failure_rate, calls, retry_in}, ...]
+        """
+        return [breaker.snapshot() for breaker in self.breakers.values()]
+
+    async def _try_source_async(self, source: str, fetch: Callable, etf_code: str) -> Optional[Quote]:
+        """
+        通过熔断器异步请求一个数据源
+
+        参数:
+            source: 数据源名称
+            fetch: 爬虫的异步获取方法
+            etf_code: ETF代码
+
+        返回:
+            Quote（可按 (价格, 名称) 解包）或 None
+        """
+        breaker = self.breakers[source]
+        ticket = breaker.allow_request()
+        if ticket is None:
+            logger.debug("数据源 {} 处于熔断状态，跳过 {}", source, etf_code)
+            return None
+
+        start = time.perf_counter()
+        try:
+            result = await fetch(etf_code)
+        except asyncio.CancelledError:
+            # 对冲请求中落后的一方被取消，不计入成功或失败
+            breaker.release(ticket)
+            raise
+        except Exception as e:
+            logger.error(f"{source} 获取 {etf_code} 失败: {e}")
+            result = None
+
+        breaker.record(ticket, result is not None)
+        self._record_request(source, etf_code, result, time.perf_counter() - start)
+        self._remember(etf_code, result, source)
+        return result
 
-# 全局实例
-data_source_manager = ETFDataSourceManager()
+    async def _try_tencent_async(self, etf_code: str) -> Optional[Quote]:
+        """异步尝试从腾讯财经获取数据"""
+        logger.debug("尝试从腾讯财经异步获取 {} 价格", etf_code)
+        return await self._try_source_async('tencent', self.tencent_crawler.fetch_price_async, etf_code)
 
+    async def _try_eastmoney_async(self, etf_code: str) -> Optional[Quote]:
+        """异步尝试从东方财富获取数据"""
+        logger.debug("尝试从东方财富异步获取 {} 价格", etf_code)
+        return await self._try_source_async('eastmoney', self.eastmoney_crawler.fetch_price_async, etf_code)
+
+    def _hedge_delay(self, source: str, batch: bool = False) -> float:
+        """
+        计算对冲等待时间：主数据源超过该时间仍未返回，就并行请求备用数据源
+
+        参数:
+            source: 主数据源名称
+            batch: 是否为批量请求（批量请求和单只请求的耗时分开统计）
+
+        返回:
+            等待时间（秒）
+        """
+        tracker = (self.batch_latency if batch else self.latency)[source]
+        if len(tracker.samples) < HEDGE_CONFIG['min_samples']:
+            return HEDGE_CONFIG['default_delay']
+        return max(HEDGE_CONFIG['min_delay'], tracker.percentile(HEDGE_CONFIG['percentile']))
+
+    async def _timed_fetch(self, source: str, fetch: Callable, etf_code: str) -> Optional[Quote]:
+        """执行一次数据源请求，成功时记录耗时"""
+        start = time.perf_counter()
+        result = await fetch(etf_code)
+        if result is not None:
+            self.latency[source].record(time.perf_counter() - start)
+        return result
+
+    async def _fetch_hedged_async(self, etf_code: str, primary_source: str, primary: Callable,
+                                  fallback_source: str, fallback: Callable) -> Optional[Quote]:
+        """
+        对冲请求：主数据源在等待时间内没有返回时，并行请求备用数据源，先返回有效价格者胜出
+
+        参数:
+            etf_code: ETF代码
+            primary_source / primary: 主数据源名称和请求函数
+            fallback_source / fallback: 备用数据源名称和请求函数
+
+        返回:
+            Quote（可按 (价格, 名称) 解包）或 None
+        """
+        hedge_delay = self._hedge_delay(primary_source)
+        primary_task = asyncio.create_task(self._timed_fetch(primary_source, primary, etf_code))
+        done, _ = await asyncio.wait({primary_task}, timeout=hedge_delay)
+
+        if done:
+            result = primary_task.result()
+            if result is not None:
+                return result
+            # 主数据源已明确失败，直接走备用数据源
+            logger.warning(f"{primary_source} 获取 {etf_code} 失败，尝试 {fallback_source} 备用数据源...")
+            metrics.inc('etf_fallbacks_total', from_source=primary_source, to_source=fallback_source)
+            return await self._timed_fetch(fallback_source, fallback, etf_code)
+
+        logger.info("{} 获取 {} 超过 {:.2f}秒未返回，并行请求 {}", primary_source, etf_code, hedge_delay, fallback_source)
+        metrics.inc('etf_hedged_requests_total', source=primary_source)
+        fallback_task = asyncio.create_task(self._timed_fetch(fallback_source, fallback, etf_code))
+        pending = {primary_task, fallback_task}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if result is not None:
+                        winner = primary_source if task is primary_task else fallback_source
+                        logger.debug("{} 对冲请求由 {} 胜出", etf_code, winner)
+                        return result
+            return None
+        finally:
+            # 取消落后的请求
+            for task in pending:
+                task.cancel()
+
+    async def fetch_price_async(self, etf_code: str, use_fallback: bool = True) -> Optional[Quote]:
+        """
+        异步获取ETF价格，自动切换数据源（与 fetch_price 的切换顺序相同）
+
+        启用对冲模式时，主数据源慢于历史延迟分位数会并行请求备用数据源。
+
+        参数:
+            etf_code: ETF代码
+            use_fallback: 是否使用备用数据源
 
-def fetch_etf_price(etf_code: str) -> Optional[Tuple[float, str]]:
+        返回:
+            Quote（可按 (价格, 名称) 解包）或 None
+        """
+        if self.primary_source == 'tencent':
+            primary_source, primary = 'tencent', self._try_tencent_async
+            fallback_source, fallback = 'eastmoney', self._try_eastmoney_async
+            fallback_message = "腾讯财经API失败，尝试东方财富备用数据源..."
+        else:
+            primary_source, primary = 'eastmoney', self._try_eastmoney_async
+            fallback_source, fallback = 'tencent', self._try_tencent_async
+            fallback_message = "东方财富API失败，尝试腾讯财经备用数据源..."
+
+        if self.hedge_enabled and use_fallback and self.fallback_enabled:
+            return await self._fetch_hedged_async(etf_code, primary_source, primary, fallback_source, fallback)
+
+        result = await self._timed_fetch(primary_source, primary, etf_code)
+        if result is not None:
+            return result
+
+        if use_fallback and self.fallback_enabled:
+            logger.warning(fallback_message)
+            metrics.inc('etf_fallbacks_total', from_source=primary_source, to_source=fallback_source)
+            return await self._timed_fetch(fallback_source, fallback, etf_code)
+
+        return None
+
+    async def fetch_prices(self, etf_codes: List[str],
+                           max_concurrency: int = None) -> AsyncIterator[Tuple[str, Optional[Quote]]]:
+        """
+        并发获取多只ETF价格，按完成顺序逐个返回结果
+
+        每只ETF独立走"主数据源 -> 备用数据源"的切换流程，同时进行的请求数由信号量限制。
+
+        参数:
+            etf_codes: ETF代码列表
+            max_concurrency: 最大并发数，默认使用 HTTP_CONFIG['max_concurrency']
+
+        返回:
+            异步迭代器，每次产出 (ETF代码, Quote（可按 (价格, 名称) 解包）或 None)
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or HTTP_CONFIG['max_concurrency'])
+
+        async def fetch_one(etf_code: str):
+            async with semaphore:
+                return etf_code, await self.fetch_price_async(etf_code)
+
+        tasks = [asyncio.create_task(fetch_one(etf_code)) for etf_code in dict.fromkeys(etf_codes)]
+        try:
+            for future in asyncio.as_completed(tasks):
+                yield await future
+        finally:
+            # 调用方提前退出时取消尚未完成的请求
+            for task in tasks:
+                task.cancel()
+
+    def fetch_prices_sync(self, etf_codes: List[str], max_concurrency: int = None,
+                          on_result: Callable[[str, Optional[Quote]], None] = None
+                          ) -> Dict[str, Optional[Quote]]:
+        """
+        并发获取多只ETF价格的同步封装，供菜单等同步代码调用
+
+        参数:
+            etf_codes: ETF代码列表
+            max_concurrency: 最大并发数
+            on_result: 每完成一只ETF时的回调，参数为 (ETF代码, 结果)，可用于显示进度
+
+        返回:
+            {ETF代码: Quote（可按 (价格, 名称) 解包）或 None}，顺序与传入的代码一致
+        """
+        started = time.perf_counter()
+        results = self._fetch_concurrent(etf_codes, max_concurrency, on_result)
+        self._log_summary(results, started)
+        return results
+
+    def _fetch_concurrent(self, etf_codes: List[str], max_concurrency: int = None,
+                          on_result: Callable[[str, Optional[Quote]], None] = None
+                          ) -> Dict[str, Optional[Quote]]:
+        """
+        在后台事件循环中逐只并发获取ETF价格（不输出汇总日志，参数同 fetch_prices_sync）
+
+        返回:
+            {ETF代码: Quote 或 None}，顺序与传入的代码一致
+        """
+        async def collect() -> Dict[str, Optional[Quote]]:
+            results = {}
+            async for etf_code, result in self.fetch_prices(etf_codes, max_concurrency):
+                results[etf_code] = result
+                if on_result is not None:
+                    on_result(etf_code, result)
+            return results
+
+        results = self._run_sync(collect())
+        return {etf_code: results.get(etf_code) for etf_code in dict.fromkeys(etf_codes)}
+
+    def _run_sync(self, coro):
+        """
+        在共享的后台事件循环中运行协程（异步客户端和长连接在多次调用之间复用）
+        启用 LOOP_MONITOR_CONFIG 时，首次调用会在该事件循环上启动阻塞检测
+
+        参数:
+            coro: 要运行的协程
+
+        返回:
+            协程的返回值
+        """
+        if LOOP_MONITOR_CONFIG['enabled'] and self._loop_monitor is None:
+            with self._loop_monitor_lock:
+                if self._loop_monitor is None:
+                    self._loop_monitor = LoopBlockMonitor()
+                    self.http_clients.run(self._loop_monitor.start())
+        return self.http_clients.run(coro)
+
+    def close(self):
+        """等待后台刷新结束并关闭共享的HTTP连接池，程序退出前调用"""
+        self._refresh_executor.shutdown(wait=True, cancel_futures=True)
+        if self._loop_monitor is not None:
+            self.http_clients.run(self._loop_monitor.stop())
+            self._loop_monitor = None
+        self.http_clients.close()
+        metrics.write_textfile()
+
+
+# 全局实例（首次使用时创建，见 __getattr__）
+_data_source_manager: Optional[ETFDataSourceManager] = None
+_instance_lock = threading.Lock()
+
+
+def get_data_source_manager() -> ETFDataSourceManager:
+    """获取全局数据源管理器（首次调用时创建）"""
+    global _data_source_manager
+    if _data_source_manager is None:
+        with _instance_lock:
+            if _data_source_manager is None:
+                _data_source_manager = ETFDataSourceManager()
+    return _data_source_manager
+
+
+def close_data_source_manager():
+    """关闭全局数据源管理器（未创建过时什么也不做），程序退出前调用"""
+    if _data_source_manager is not None:
+        _data_source_manager.close()
+
+
+def __getattr__(name: str):
+    # 兼容 from src.data_source_manager import data_source_manager，导入本模块时不创建实例
+    if name == 'data_source_manager':
+        return get_data_source_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def fetch_etf_price(etf_code: str) -> Optional[Quote]:
     """
-    获取ETF价格的便捷函数
+    获取ETF价格的便捷函数（优先使用行情缓存）
 
     参数:
         etf_code: ETF代码
 
     返回:
-        (价格, 名称) 或 None
+        Quote（可按 (价格, 名称) 解包）或 None
+    """
+    return get_data_source_manager().fetch_price_cached(etf_code)
+
+
+def fetch_etf_prices(etf_codes: List[str], force_refresh: bool = False) -> Dict[str, Optional[Quote]]:
+    """
+    批量获取ETF价格的便捷函数（优先使用行情缓存）
+
+    参数:
+        etf_codes: ETF代码列表
+        force_refresh: 是否忽略交易时段内的缓存，全部重新请求
+
+    返回:
+        {ETF代码: Quote（可按 (价格, 名称) 解包）或 None}
     """
-    return data_source_manager.fetch_price(etf_code)
+    return get_data_source_manager().fetch_prices_cached(etf_codes, force_refresh)
 
 
-__all__ = ['ETFDataSourceManager', 'data_source_manager', 'fetch_etf_price']
+__all__ = ['ETFDataSourceManager', 'data_source_manager', 'get_data_source_manager', 'close_data_source_manager',
+           'fetch_etf_price', 'fetch_etf_prices']
@@ -0,0 +1,177 @@
+"""
+调试样本模块
+解析失败时保存原始响应，便于排查数据源格式变化
+
+- 环形目录: 目录总大小和文件数有上限，超出时删除最旧的样本
+- 按代码限频: 同一代码在最小间隔内只保存一次
+- 可选gzip压缩
+- 写文件在后台线程中进行，不阻塞请求线程；队列满时直接丢弃
+"""
+import atexit
+import gzip
+import json
+import queue
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, Tuple
+from src.logger import logger
+from config.app import DEBUG_CAPTURE_CONFIG
+
+
+class DebugCapture:
+    """调试样本记录器"""
+
+    # 文件名中只保留安全字符
+    _UNSAFE_CHARS = re.compile(r'[^0-9A-Za-z._-]+')
+
+    def __init__(self, directory: str = None, max_bytes: int = None, max_files: int = None,
+                 min_interval: float = None, compress: bool = None, queue_size: int = None,
+                 enabled: bool = None):
+        """
+        初始化调试样本记录器
+
+        参数:
+            directory: 样本目录
+            max_bytes: 目录总大小上限（字节）
+            max_files: 文件数上限
+            min_interval: 同一键两次保存的最小间隔（秒）
+            compress: 是否使用gzip压缩
+            queue_size: 等待写入的最大样本数
+            enabled: 是否启用
+        """
+        config = DEBUG_CAPTURE_CONFIG
+        self.directory = Path(directory or config['dir'])
+        self.max_bytes = max_bytes or config['max_bytes']
+        self.max_files = max_files or config['max_files']
+        self.min_interval = min_interval if min_interval is not None else config['min_interval']
+        self.compress = compress if compress is not None else config['compress']
+        self.enabled = enabled if enabled is not None else config['enabled']
+
+        self._queue: "queue.Queue[Tuple[str, bytes, str, float]]" = queue.Queue(maxsize=queue_size or config['queue_size'])
+        self._last_capture: Dict[str, float] = {}
+        self._files: Deque[Tuple[Path, int]] = deque()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._worker = None
+        self.dropped = 0
+
+    def capture(self, key: str, content: Any, suffix: str = '.txt') -> bool:
+        """
+        提交一个调试样本（立即返回，实际写入在后台线程中进行）
+
+        参数:
+            key: 样本标识，如 xueqiu_SZ159915，同一标识按 min_interval 限频
+            content: 样本内容（str、bytes，或可JSON序列化的对象）
+            suffix: 文件扩展名，如 .html、.json
+
+        返回:
+            是否已加入写入队列（未启用、被限频或队列已满时为 False）
+        """
+        if not self.enabled:
+            return False
+
+        now = time.time()
+        with self._lock:
+            last = self._last_capture.get(key)
+            if last is not None and now - last < self.min_interval:
+                return False
+            self._last_capture[key] = now
+            # 限频记录只需保留最近 min_interval 内的键，避免长期运行时无限增长
+            if len(self._last_capture) > 1000:
+                self._last_capture = {
+                    k: t for k, t in self._last_capture.items() if now - t < self.min_interval
+                }
+            self._ensure_worker()
+
+        try:
+            self._queue.put_nowait((key, content, suffix, now))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def _ensure_worker(self):
+        """首次使用时加载已有样本并启动后台写入线程（调用方需持有锁）"""
+        if self._worker is not None:
+            return
+        self._load_existing()
+        self._worker = threading.Thread(target=self._run, name='debug-capture', daemon=True)
+        self._worker.start()
+        atexit.register(self.flush, 2.0)
+
+    def _load_existing(self):
+        """加载目录中已有的样本，按文件名（时间前缀）排序，纳入总量控制"""
+        if not self.directory.exists():
+            return
+        for path in sorted(p for p in self.directory.iterdir() if p.is_file()):
+            size = path.stat().st_size
+            self._files.append((path, size))
+            self._total_bytes += size
+
+    def _run(self):
+        """后台线程：逐个写入样本"""
+        while True:
+            item = self._queue.get()
+            try:
+                self._write(*item)
+            except Exception as e:
+                logger.warning(f"保存调试样本失败: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, key: str, content: Any, suffix: str, captured_at: float):
+        """写入一个样本并清理超出上限的旧样本"""
+        if isinstance(content, bytes):
+            data = content
+        elif isinstance(content, str):
+            data = content.encode('utf-8')
+        else:
+            data = json.dumps(content, ensure_ascii=False, indent=2, default=str).encode('utf-8')
+
+        stamp = datetime.fromtimestamp(captured_at).strftime('%Y%m%d_%H%M%S_%f')
+        name = f"{stamp}_{self._UNSAFE_CHARS.sub('_', key)}{suffix}"
+        if self.compress:
+            data = gzip.compress(data)
+            name += '.gz'
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / name
+        path.write_bytes(data)
+        self._files.append((path, len(data)))
+        self._total_bytes += len(data)
+        logger.info(f"已保存调试样本: {path}")
+
+        while self._files and (self._total_bytes > self.max_bytes or len(self._files) > self.max_files):
+            old_path, old_size = self._files.popleft()
+            self._total_bytes -= old_size
+            try:
+                old_path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        等待队列中的样本写完
+
+        参数:
+            timeout: 最长等待时间（秒），None 表示一直等待
+
+        返回:
+            是否在超时前写完
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+
+# 全局实例（所有爬虫共享）
+debug_capture = DebugCapture()
+
+__all__ = ['DebugCapture', 'debug_capture']
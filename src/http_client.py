@@ -0,0 +1,242 @@
+"""
+HTTP客户端管理模块
+按主机复用长连接的 httpx 客户端，避免每次请求都重新做 DNS 解析、TCP 连接和 TLS 握手
+"""
+import asyncio
+import ssl
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.logger import logger
+from src.metrics import metrics
+from config.app import HTTP_CONFIG
+
+
+class HTTPClientRegistry:
+    """HTTP客户端注册表，每个主机一个带 keep-alive 连接池的客户端"""
+
+    def __init__(self, max_connections: int = None, max_keepalive_connections: int = None,
+                 keepalive_expiry: float = None):
+        """
+        初始化客户端注册表
+
+        参数:
+            max_connections: 每个主机的最大连接数
+            max_keepalive_connections: 每个主机保持的最大空闲长连接数
+            keepalive_expiry: 空闲长连接的保留时间（秒）
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections or HTTP_CONFIG['max_connections'],
+            max_keepalive_connections=max_keepalive_connections or HTTP_CONFIG['max_keepalive_connections'],
+            keepalive_expiry=keepalive_expiry or HTTP_CONFIG['keepalive_expiry']
+        )
+        self.timeout = httpx.Timeout(HTTP_CONFIG['timeout'], connect=10.0)
+        self._clients: Dict[str, httpx.Client] = {}
+        # 异步客户端绑定在创建它的事件循环上，按 (事件循环, 主机) 区分
+        self._async_clients: Dict[Tuple[int, str], httpx.AsyncClient] = {}
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        # 后台事件循环：同步代码通过 run() 在这里执行协程，异步客户端和连接跨调用保持
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host_key(url: str) -> str:
+        """从URL中提取主机标识，如 https://qt.gtimg.cn"""
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def _get_ssl_context(self) -> ssl.SSLContext:
+        """
+        获取共享的SSL上下文（调用方需持有锁）
+
+        加载证书链需要几十毫秒，所有客户端共用一个上下文，
+        避免每个事件循环创建异步客户端时都在事件循环中重新加载。
+        """
+        if self._ssl_context is None:
+            self._ssl_context = httpx.create_ssl_context()
+        return self._ssl_context
+
+    @staticmethod
+    def _count_bytes(response: httpx.Response):
+        """响应钩子：读取响应体并记录实际接收的字节数（未解压的原始字节），调用方随后读取的是已缓存的内容"""
+        response.read()
+        metrics.inc('etf_bytes_received_total', response.num_bytes_downloaded, host=response.url.host)
+
+    @staticmethod
+    async def _count_bytes_async(response: httpx.Response):
+        """异步客户端的响应钩子，与 _count_bytes 相同"""
+        await response.aread()
+        metrics.inc('etf_bytes_received_total', response.num_bytes_downloaded, host=response.url.host)
+
+    def prepare(self):
+        """
+        在启动事件循环前调用，提前完成创建客户端时的一次性耗时操作，避免阻塞事件循环:
+        加载SSL上下文，以及导入 httpcore 和 anyio 的 asyncio 后端
+        （httpx 在首次创建客户端、首次发起异步请求时才导入，合计一百多毫秒）
+        """
+        import httpcore  # noqa: F401
+        import anyio._backends._asyncio  # noqa: F401
+        with self._lock:
+            self._get_ssl_context()
+
+    def get_client(self, url: str) -> httpx.Client:
+        """
+        获取指定主机的同步客户端（不存在时创建）
+
+        参数:
+            url: 请求地址或主机地址
+
+        返回:
+            该主机共享的 httpx.Client
+        """
+        host = self._host_key(url)
+        client = self._clients.get(host)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(host)
+            if client is None:
+                # 禁用HTTP/2以提高稳定性
+                client = httpx.Client(limits=self.limits, timeout=self.timeout, http2=False,
+                                      verify=self._get_ssl_context(),
+                                      event_hooks={'response': [self._count_bytes]})
+                self._clients[host] = client
+                logger.debug("创建HTTP连接池: {}", host)
+            return client
+
+    def get_async_client(self, url: str) -> httpx.AsyncClient:
+        """
+        获取指定主机在当前事件循环中的异步客户端（不存在时创建）
+
+        参数:
+            url: 请求地址或主机地址
+
+        返回:
+            该主机在当前事件循环中共享的 httpx.AsyncClient
+        """
+        key = (id(asyncio.get_running_loop()), self._host_key(url))
+        with self._lock:
+            client = self._async_clients.get(key)
+            if client is None:
+                client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout, http2=False,
+                                           verify=self._get_ssl_context(),
+                                           event_hooks={'response': [self._count_bytes_async]})
+                self._async_clients[key] = client
+                logger.debug("创建异步HTTP连接池: {}", key[1])
+            return client
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """获取后台事件循环（首次调用时在守护线程中启动）"""
+        loop = self._loop
+        if loop is not None:
+            return loop
+
+        # 先在当前线程完成一次性的导入和SSL上下文加载，避免阻塞后台事件循环
+        self.prepare()
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=self._run_loop, args=(loop,), name='http-event-loop', daemon=True)
+                thread.start()
+                self._loop, self._loop_thread = loop, thread
+                logger.debug("启动后台事件循环")
+            return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop):
+        """后台线程入口：运行事件循环直到 close() 停止它"""
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    def run(self, coro):
+        """
+        在后台事件循环中运行协程并等待结果，供同步代码调用
+
+        所有调用共用同一个事件循环，异步客户端及其长连接在调用之间保持，不会每次都重新建立。
+
+        参数:
+            coro: 要运行的协程
+
+        返回:
+            协程的返回值
+        """
+        loop = self._get_loop()
+        if threading.current_thread() is self._loop_thread:
+            coro.close()
+            raise RuntimeError("不能在后台事件循环线程中同步等待协程")
+
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result()
+        except BaseException:
+            # Ctrl+C 等中断等待时，取消后台仍在运行的协程
+            future.cancel()
+            raise
+
+    async def _shutdown_loop(self):
+        """在后台事件循环中执行：关闭异步客户端并取消残留的任务"""
+        await self.aclose_loop()
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.get_running_loop().shutdown_asyncgens()
+
+    def _stop_loop(self):
+        """停止后台事件循环并等待线程退出"""
+        with self._lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop, self._loop_thread = None, None
+        if loop is None:
+            return
+
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown_loop(), loop).result(timeout=5)
+        except Exception as e:
+            logger.warning(f"关闭后台事件循环中的异步HTTP客户端失败: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        if not thread.is_alive():
+            loop.close()
+
+    async def aclose_loop(self):
+        """关闭当前事件循环中创建的全部异步客户端，应在事件循环结束前调用"""
+        loop_id = id(asyncio.get_running_loop())
+        with self._lock:
+            keys = [key for key in self._async_clients if key[0] == loop_id]
+            clients = [self._async_clients.pop(key) for key in keys]
+
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"关闭异步HTTP客户端失败: {e}")
+
+    def close(self):
+        """关闭后台事件循环和全部客户端，释放连接池"""
+        self._stop_loop()
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            leftover = len(self._async_clients)
+            # 残留的异步客户端所属事件循环已结束，只能丢弃引用
+            self._async_clients.clear()
+
+        for client in clients:
+            try:
+                client.close()
+            except Exception as e:
+                logger.warning(f"关闭HTTP客户端失败: {e}")
+
+        if leftover:
+            logger.warning(f"有 {leftover} 个异步HTTP客户端未在事件循环结束前关闭")
+        logger.debug("已关闭全部HTTP连接池")
+
+
+__all__ = ['HTTPClientRegistry']
@@ -1,19 +1,89 @@
 """
 日志系统配置
+
+- 所有 sink 都通过后台线程写入（enqueue=True），请求线程只负责把日志放入队列
+- 相同调用位置、相同内容的警告和错误在窗口期内只输出一次
+- LOG_PROFILE=quiet 时单次请求的日志降为 DEBUG，只输出每轮获取的汇总
 """
-from loguru import logger
+import sys
+import threading
+import time
 from pathlib import Path
+from typing import Dict, List, Tuple
+from loguru import logger
 from config.app import LOG_CONFIG, PROJECT_ROOT, log_dir
 
+# 单次请求的日志级别（开始请求、请求成功等），quiet 模式下降为 DEBUG，默认级别下不会格式化和输出
+REQUEST_LEVEL = 'DEBUG' if LOG_CONFIG['profile'] == 'quiet' else 'INFO'
+
+
+class DuplicateFilter:
+    """
+    重复日志过滤器
+
+    相同调用位置、相同内容（或相同 dedup_key）的 WARNING 及以上日志在窗口期内只输出一次，
+    窗口期之后再次出现时输出，并附带期间省略的次数。
+    """
+
+    def __init__(self, window: float, min_level: str = 'WARNING', max_keys: int = 1000):
+        """
+        初始化重复日志过滤器
+
+        参数:
+            window: 去重窗口（秒），0 表示不去重
+            min_level: 参与去重的最低级别
+            max_keys: 最多记录的日志键数，超出时清理窗口期外的键
+        """
+        self.window = window
+        self.min_level_no = logger.level(min_level).no
+        self.max_keys = max_keys
+        self._seen: Dict[Tuple, List] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, record: Dict) -> bool:
+        # 同一条日志会依次经过每个 sink 的过滤器，只判断一次
+        extra = record['extra']
+        decision = extra.get('_dedup')
+        if decision is None:
+            decision = self._check(record)
+            extra['_dedup'] = decision
+        return decision
+
+    def _check(self, record: Dict) -> bool:
+        """判断日志是否输出，需要输出且之前有省略时在消息后附带省略次数"""
+        if self.window <= 0 or record['level'].no < self.min_level_no:
+            return True
+
+        key = (record['name'], record['line'], record['extra'].get('dedup_key', record['message']))
+        now = time.monotonic()
+        with self._lock:
+            state = self._seen.get(key)
+            if state is not None and now - state[0] < self.window:
+                state[1] += 1
+                return False
+
+            if state is not None and state[1]:
+                record['message'] += f"（此前 {self.window:g} 秒内相同日志省略 {state[1]} 次）"
+            self._seen[key] = [now, 0]
+
+            if len(self._seen) > self.max_keys:
+                self._seen = {k: s for k, s in self._seen.items() if now - s[0] < self.window}
+        return True
+
+
+duplicate_filter = DuplicateFilter(LOG_CONFIG['dedup_window'])
+
 # 配置日志格式
 logger.remove()  # 移除默认的 handler
 
 # 添加控制台输出
 logger.add(
-    sink=lambda msg: print(msg, end=''),
+    sink=sys.stdout,
     format=LOG_CONFIG['format'],
     level=LOG_CONFIG['level'],
-    colorize=True
+    filter=duplicate_filter,
+    colorize=True,
+    enqueue=LOG_CONFIG['enqueue']
 )
 
 # 添加日志文件
@@ -21,9 +91,12 @@ logger.add(
     sink=Path(log_dir) / 'app.log',
     format=LOG_CONFIG['format'],
     level=LOG_CONFIG['level'],
+    filter=duplicate_filter,
     rotation='500 MB',  # 每 500MB 滚动
     retention='10 days',  # 保留 10 天
-    encoding='utf-8'
+    encoding='utf-8',
+    enqueue=LOG_CONFIG['enqueue'],
+    delay=True  # 第一次写日志时才创建和打开文件
 )
 
 # 添加错误日志文件
@@ -31,9 +104,12 @@ logger.add(
     sink=Path(log_dir) / 'error.log',
     format=LOG_CONFIG['format'],
     level='ERROR',
+    filter=duplicate_filter,
     rotation='500 MB',
     retention='10 days',
-    encoding='utf-8'
+    encoding='utf-8',
+    enqueue=LOG_CONFIG['enqueue'],
+    delay=True
 )
 
-__all__ = ['logger']
+__all__ = ['logger', 'REQUEST_LEVEL', 'DuplicateFilter']
@@ -0,0 +1,115 @@
+"""
+事件循环阻塞检测模块
+调试模式下检测协程中的同步调用：事件循环超过阈值没有响应时，记录当时正在执行的调用位置
+
+- 心跳协程: 在事件循环中按固定间隔更新心跳时间
+- 看门狗线程: 发现心跳超过阈值未更新时，抓取事件循环线程的调用栈并记录一次警告
+"""
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+from src.logger import logger
+from config.app import LOOP_MONITOR_CONFIG
+
+# 项目根目录，用于在调用栈中定位项目代码
+PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+
+
+class LoopBlockMonitor:
+    """事件循环阻塞检测器"""
+
+    def __init__(self, threshold: float = None, max_records: int = 50):
+        """
+        初始化阻塞检测器
+
+        参数:
+            threshold: 阻塞阈值（秒），事件循环超过该时间没有响应视为阻塞
+            max_records: 最多保留的阻塞记录数
+        """
+        self.threshold = threshold or LOOP_MONITOR_CONFIG['threshold']
+        self.records: Deque[Dict] = deque(maxlen=max_records)
+        self._last_tick = 0.0
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    async def start(self):
+        """在当前事件循环中启动检测（需要在协程中调用）"""
+        if self._heartbeat_task is not None:
+            return
+        loop = asyncio.get_running_loop()
+        # 同时打开 asyncio 自带的慢回调日志，作为补充
+        loop.set_debug(True)
+        loop.slow_callback_duration = self.threshold
+
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stop_event.clear()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name='loop-monitor', daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        """停止检测"""
+        self._stop_event.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat_task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1.0)
+            self._watchdog = None
+
+    async def _heartbeat(self):
+        """心跳协程：事件循环正常运转时持续更新心跳时间"""
+        interval = self.threshold / 4
+        while True:
+            self._last_tick = time.monotonic()
+            await asyncio.sleep(interval)
+
+    def _watch(self):
+        """看门狗线程：每次阻塞只记录一次，记录阻塞开始后第一次抓到的调用栈"""
+        interval = self.threshold / 4
+        blocked_since = None
+        while not self._stop_event.wait(interval):
+            last_tick = self._last_tick
+            lag = time.monotonic() - last_tick
+            if lag < self.threshold:
+                blocked_since = None
+                continue
+            if blocked_since == last_tick:
+                continue
+            blocked_since = last_tick
+            self._report(lag)
+
+    def _report(self, lag: float):
+        """抓取事件循环线程的调用栈并记录"""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        stack = traceback.format_stack(frame)
+        location = self._find_call_site(traceback.extract_stack(frame))
+        self.records.append({'lag': lag, 'location': location, 'stack': stack, 'time': time.time()})
+        logger.warning(f"事件循环被阻塞超过 {lag:.3f} 秒，调用位置: {location}")
+        logger.debug("阻塞时的调用栈:\n" + ''.join(stack))
+
+    @staticmethod
+    def _find_call_site(frames: List[traceback.FrameSummary]) -> str:
+        """从调用栈中找出项目代码中最内层的调用位置（跳过标准库和第三方库）"""
+        for frame in reversed(frames):
+            if frame.filename.startswith(PROJECT_ROOT) and 'site-packages' not in frame.filename:
+                return f"{frame.filename}:{frame.lineno} in {frame.name}"
+        frame = frames[-1]
+        return f"{frame.filename}:{frame.lineno} in {frame.name}"
+
+
+__all__ = ['LoopBlockMonitor']
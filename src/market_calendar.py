@@ -0,0 +1,190 @@
+"""
+交易时段模块
+判断 A股（沪深）、港股、美股当前是否开市，计算上一次收盘和下一次开盘时间
+
+节假日表为CSV文件（默认 data/market_holidays.csv），格式:
+    market,date,name
+    CN,2026-10-01,国庆节
+    US,2026-11-26,Thanksgiving Day
+"""
+import csv
+from datetime import date, datetime, time as dt_time, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import pytz
+
+from src.logger import logger
+from config.app import MARKET_CALENDAR_CONFIG
+
+
+class MarketCalendar:
+    """交易日历，支持午休、周末和可加载的节假日表"""
+
+    # 各市场的交易时段（当地时间）
+    SESSIONS: Dict[str, List[Tuple[dt_time, dt_time]]] = {
+        'CN': [(dt_time(9, 30), dt_time(11, 30)), (dt_time(13, 0), dt_time(15, 0))],
+        'HK': [(dt_time(9, 30), dt_time(12, 0)), (dt_time(13, 0), dt_time(16, 0))],
+        'US': [(dt_time(9, 30), dt_time(16, 0))],
+    }
+
+    TIMEZONES = {
+        'CN': pytz.timezone('Asia/Shanghai'),
+        'HK': pytz.timezone('Asia/Hong_Kong'),
+        'US': pytz.timezone('America/New_York'),
+    }
+
+    MARKET_NAMES = {'CN': 'A股', 'HK': '港股', 'US': '美股'}
+
+    # 向前/向后查找交易日的最大天数（覆盖春节等长假）
+    MAX_SEARCH_DAYS = 30
+
+    def __init__(self, holidays_file: str = None):
+        """
+        初始化交易日历
+
+        参数:
+            holidays_file: 节假日表CSV路径，默认使用 MARKET_CALENDAR_CONFIG['holidays_file']
+        """
+        self.holidays: Dict[str, Set[date]] = {market: set() for market in self.SESSIONS}
+        self.load_holidays(holidays_file or MARKET_CALENDAR_CONFIG['holidays_file'])
+
+    def load_holidays(self, file_path: str) -> int:
+        """
+        加载节假日表（可重复调用，追加到已有节假日中）
+
+        参数:
+            file_path: CSV文件路径，列为 market,date,name
+
+        返回:
+            加载的节假日数量
+        """
+        path = Path(file_path)
+        if not path.exists():
+            logger.debug(f"节假日表不存在，仅按周末判断休市: {path}")
+            return 0
+
+        count = 0
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    market = row['market'].strip().upper()
+                    if market not in self.holidays:
+                        continue
+                    self.holidays[market].add(datetime.strptime(row['date'].strip(), '%Y-%m-%d').date())
+                    count += 1
+        except (OSError, KeyError, ValueError) as e:
+            logger.error(f"加载节假日表失败: {e}")
+
+        logger.debug(f"加载节假日 {count} 条: {path}")
+        return count
+
+    @staticmethod
+    def market_for_code(etf_code: str) -> str:
+        """
+        根据ETF代码判断所属市场
+
+        参数:
+            etf_code: ETF代码，如 SH560050, SZ159967, HK02800, SCHD
+
+        返回:
+            'CN'、'HK' 或 'US'
+        """
+        code = etf_code.upper()
+        if code[:2] in ('SH', 'SZ') and code[2:].isdigit():
+            return 'CN'
+        if code[:2] == 'HK' and code[2:].isdigit():
+            return 'HK'
+        return 'US'
+
+    def is_trading_day(self, market: str, day: date) -> bool:
+        """判断某天是否为交易日（非周末且不在节假日表中）"""
+        return day.weekday() < 5 and day not in self.holidays[market]
+
+    def _now(self, market: str, now: datetime = None) -> datetime:
+        """获取市场当地时间"""
+        tz = self.TIMEZONES[market]
+        if now is None:
+            return datetime.now(tz)
+        if now.tzinfo is None:
+            now = tz.localize(now)
+        return now.astimezone(tz)
+
+    def _session_bounds(self, market: str, day: date) -> List[Tuple[datetime, datetime]]:
+        """获取某个交易日各时段的开始和结束时间（当地时区）"""
+        tz = self.TIMEZONES[market]
+        return [
+            (tz.localize(datetime.combine(day, start)), tz.localize(datetime.combine(day, end)))
+            for start, end in self.SESSIONS[market]
+        ]
+
+    def is_open(self, market: str, now: datetime = None) -> bool:
+        """
+        判断市场当前是否处于交易时段
+
+        参数:
+            market: 市场代码
+            now: 当前时间，默认使用系统时间
+
+        返回:
+            是否开市
+        """
+        now = self._now(market, now)
+        if not self.is_trading_day(market, now.date()):
+            return False
+        return any(start <= now < end for start, end in self._session_bounds(market, now.date()))
+
+    def next_open(self, market: str, now: datetime = None) -> Optional[datetime]:
+        """
+        计算下一个交易时段的开始时间（当前处于交易时段时返回下一个时段）
+
+        返回:
+            下一次开盘时间（当地时区），查找范围内没有交易日时返回 None
+        """
+        now = self._now(market, now)
+        for offset in range(self.MAX_SEARCH_DAYS + 1):
+            day = now.date() + timedelta(days=offset)
+            if not self.is_trading_day(market, day):
+                continue
+            for start, _ in self._session_bounds(market, day):
+                if start > now:
+                    return start
+        return None
+
+    def last_close(self, market: str, now: datetime = None) -> Optional[datetime]:
+        """
+        计算最近一个已结束交易时段的收盘时间
+
+        返回:
+            上一次收盘时间（当地时区），查找范围内没有交易日时返回 None
+        """
+        now = self._now(market, now)
+        for offset in range(self.MAX_SEARCH_DAYS + 1):
+            day = now.date() - timedelta(days=offset)
+            if not self.is_trading_day(market, day):
+                continue
+            for _, end in reversed(self._session_bounds(market, day)):
+                if end <= now:
+                    return end
+        return None
+
+    def status(self, market: str, now: datetime = None) -> Dict[str, Any]:
+        """
+        获取市场状态
+
+        返回:
+            {market, name, is_open, last_close, next_open}
+        """
+        return {
+            'market': market,
+            'name': self.MARKET_NAMES[market],
+            'is_open': self.is_open(market, now),
+            'last_close': self.last_close(market, now),
+            'next_open': self.next_open(market, now)
+        }
+
+
+# 全局实例
+market_calendar = MarketCalendar()
+
+__all__ = ['MarketCalendar', 'market_calendar']
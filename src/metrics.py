@@ -0,0 +1,235 @@
+"""
+运行指标模块
+记录各数据源、各市场的请求耗时分布和成功/失败/切换/重试次数，
+可在菜单中查看，也可以导出为 Prometheus 文本格式文件，供 node_exporter 的 textfile collector 采集
+"""
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from src.logger import logger
+from config.app import METRICS_CONFIG
+
+# 指标定义: 名称 -> (类型, 说明)
+METRIC_DEFINITIONS = {
+    'etf_requests_total': ('counter', '单只ETF请求次数，按数据源、市场和结果（success/failure）区分'),
+    'etf_request_duration_seconds': ('histogram', '单只ETF请求耗时（秒），按数据源和市场区分'),
+    'etf_batch_requests_total': ('counter', '批量请求中各ETF的结果，按数据源、市场和结果区分'),
+    'etf_batch_duration_seconds': ('histogram', '一次批量请求的耗时（秒），按数据源区分'),
+    'etf_fallbacks_total': ('counter', '主数据源失败后切换到备用数据源的次数'),
+    'etf_hedged_requests_total': ('counter', '主数据源响应慢、并行请求备用数据源的次数'),
+    'etf_retries_total': ('counter', '爬虫内部重试次数，按数据源区分'),
+    'etf_bytes_received_total': ('counter', '接收的响应体字节数，按主机区分'),
+}
+
+# 耗时直方图的桶上限（秒）
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """固定桶的耗时直方图（单个标签组合）"""
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)  # 各桶内（不累计）的样本数，超出最后一个桶的只计入 count
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        """记录一个样本"""
+        self.count += 1
+        self.sum += value
+        for index, upper in enumerate(self.buckets):
+            if value <= upper:
+                self.counts[index] += 1
+                break
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        按桶估算分位数（返回分位数所在桶的上限，超出全部桶时返回 +Inf）
+
+        参数:
+            q: 分位数（0-1），如 0.95
+
+        返回:
+            估算的耗时（秒），没有样本时返回 None
+        """
+        if not self.count:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for upper, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return upper
+        return float('inf')
+
+
+class Metrics:
+    """运行指标注册表（线程安全）"""
+
+    def __init__(self, textfile: str = None, write_interval: float = None):
+        """
+        初始化运行指标
+
+        参数:
+            textfile: Prometheus 文本格式文件路径，为空时不导出
+            write_interval: 两次写文件的最小间隔（秒）
+        """
+        self.textfile = textfile if textfile is not None else METRICS_CONFIG['textfile']
+        self.write_interval = write_interval if write_interval is not None else METRICS_CONFIG['write_interval']
+        self.started_at = time.time()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._lock = threading.Lock()
+        self._last_write = 0.0
+
+    @staticmethod
+    def _key(labels: Dict[str, str]) -> LabelKey:
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """
+        计数器加值
+
+        参数:
+            name: 指标名称（见 METRIC_DEFINITIONS）
+            value: 增加的值
+            **labels: 标签，如 source='tencent'
+        """
+        key = self._key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """
+        记录一个耗时样本
+
+        参数:
+            name: 指标名称（见 METRIC_DEFINITIONS）
+            value: 耗时（秒）
+            **labels: 标签，如 source='tencent', market='CN'
+        """
+        key = self._key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def counter_values(self, name: str) -> List[Tuple[Dict[str, str], float]]:
+        """
+        获取计数器的全部标签组合和值
+
+        返回:
+            [(标签字典, 值), ...]
+        """
+        with self._lock:
+            return [(dict(key), value) for key, value in self._counters.get(name, {}).items()]
+
+    def histogram_values(self, name: str) -> List[Tuple[Dict[str, str], Histogram]]:
+        """
+        获取直方图的全部标签组合
+
+        返回:
+            [(标签字典, Histogram), ...]
+        """
+        with self._lock:
+            return [(dict(key), histogram) for key, histogram in self._histograms.get(name, {}).items()]
+
+    def reset(self):
+        """清空全部指标"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.started_at = time.time()
+
+    @staticmethod
+    def _format_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pairs = key + extra
+        if not pairs:
+            return ''
+        escaped = (
+            (name, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+            for name, value in pairs
+        )
+        return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+    def render(self) -> str:
+        """
+        生成 Prometheus 文本格式（exposition format 0.0.4）
+
+        返回:
+            文本内容
+        """
+        lines = []
+        with self._lock:
+            for name, (metric_type, description) in METRIC_DEFINITIONS.items():
+                if metric_type == 'counter':
+                    series = self._counters.get(name)
+                    if not series:
+                        continue
+                    lines.append(f"# HELP {name} {description}")
+                    lines.append(f"# TYPE {name} counter")
+                    for key, value in sorted(series.items()):
+                        lines.append(f"{name}{self._format_labels(key)} {value:g}")
+                else:
+                    series = self._histograms.get(name)
+                    if not series:
+                        continue
+                    lines.append(f"# HELP {name} {description}")
+                    lines.append(f"# TYPE {name} histogram")
+                    for key, histogram in sorted(series.items()):
+                        cumulative = 0
+                        for upper, count in zip(histogram.buckets, histogram.counts):
+                            cumulative += count
+                            lines.append(f"{name}_bucket{self._format_labels(key, (('le', f'{upper:g}'),))} {cumulative}")
+                        lines.append(f"{name}_bucket{self._format_labels(key, (('le', '+Inf'),))} {histogram.count}")
+                        lines.append(f"{name}_sum{self._format_labels(key)} {histogram.sum:.6f}")
+                        lines.append(f"{name}_count{self._format_labels(key)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: str = None) -> Optional[Path]:
+        """
+        写入 Prometheus 文本格式文件（先写临时文件再替换，采集时不会读到写了一半的文件）
+
+        参数:
+            path: 文件路径，默认使用 METRICS_CONFIG['textfile']
+
+        返回:
+            写入的文件路径，未配置路径或写入失败时返回 None
+        """
+        path = path or self.textfile
+        if not path:
+            return None
+
+        target = Path(path)
+        tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(self.render(), encoding='utf-8')
+            os.replace(tmp_path, target)
+        except OSError as e:
+            logger.warning(f"写入指标文件失败: {e}")
+            return None
+        self._last_write = time.monotonic()
+        return target
+
+    def maybe_write(self) -> Optional[Path]:
+        """距上次写文件超过 write_interval 时写入指标文件"""
+        if not self.textfile or time.monotonic() - self._last_write < self.write_interval:
+            return None
+        return self.write_textfile()
+
+
+# 全局实例
+metrics = Metrics()
+
+__all__ = ['Metrics', 'Histogram', 'METRIC_DEFINITIONS', 'LATENCY_BUCKETS', 'metrics']
@@ -0,0 +1,165 @@
+"""
+性能分析模块
+按阶段（网络获取、存储读写、分析计算、界面渲染）统计菜单操作的耗时，可选保存 cProfile 结果
+
+- 阶段计时只统计主线程（执行菜单操作的线程），后台刷新等线程中的调用不计入
+- 阶段可以嵌套，统计的是各阶段自身的耗时（不含嵌套的子阶段）
+- 未启用时 stage() 返回空的上下文管理器，几乎没有额外开销
+"""
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from src.logger import logger
+from config.app import PROFILE_CONFIG
+
+# 阶段名称 -> 显示名称
+STAGE_LABELS = {
+    'fetch': '网络获取',
+    'storage': '存储读写',
+    'analysis': '分析计算',
+    'render': '界面渲染',
+}
+
+_NULL_CONTEXT = nullcontext()
+
+
+class _Stage:
+    """阶段计时上下文"""
+
+    __slots__ = ('profiler', 'name', 'start', 'child_time')
+
+    def __init__(self, profiler: 'StageProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.child_time = 0.0
+        self.start = time.perf_counter()
+        self.profiler._stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        stack = self.profiler._stack
+        stack.pop()
+        self.profiler._times[self.name] += elapsed - self.child_time
+        self.profiler._calls[self.name] += 1
+        if stack:
+            stack[-1].child_time += elapsed
+        return False
+
+
+class StageProfiler:
+    """阶段计时器"""
+
+    def __init__(self, enabled: bool = None, dump: bool = None, dump_dir: str = None):
+        """
+        初始化阶段计时器
+
+        参数:
+            enabled: 是否启用阶段计时
+            dump: 是否同时运行 cProfile 并保存 pstats 文件
+            dump_dir: pstats 文件目录
+        """
+        self.enabled = enabled if enabled is not None else PROFILE_CONFIG['enabled']
+        self.dump = dump if dump is not None else PROFILE_CONFIG['dump']
+        self.dump_dir = Path(dump_dir or PROFILE_CONFIG['dir'])
+        self.last_report: Optional[Dict] = None
+        self._thread_id: Optional[int] = None
+        self._stack: List[_Stage] = []
+        self._times: Dict[str, float] = defaultdict(float)
+        self._calls: Dict[str, int] = defaultdict(int)
+
+    def stage(self, name: str):
+        """
+        阶段计时的上下文管理器，如 with profiler.stage('fetch'): ...
+
+        参数:
+            name: 阶段名称（见 STAGE_LABELS）
+        """
+        if self._thread_id is None or threading.get_ident() != self._thread_id:
+            return _NULL_CONTEXT
+        return _Stage(self, name)
+
+    def timed(self, name: str) -> Callable:
+        """
+        把整个函数计入指定阶段的装饰器
+
+        参数:
+            name: 阶段名称（见 STAGE_LABELS）
+        """
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @contextmanager
+    def action(self, name: str):
+        """
+        统计一次菜单操作，结束后把结果保存在 last_report 中（未启用时什么也不做）
+
+        参数:
+            name: 操作名称，用于 pstats 文件名
+        """
+        self.last_report = None
+        if not self.enabled:
+            yield
+            return
+
+        self._times.clear()
+        self._calls.clear()
+        self._stack.clear()
+        self._thread_id = threading.get_ident()
+        profile = None
+        if self.dump:
+            import cProfile
+            profile = cProfile.Profile()
+        start = time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            total = time.perf_counter() - start
+            self._thread_id = None
+            self.last_report = self._build_report(name, total, profile)
+
+    def _build_report(self, name: str, total: float, profile) -> Dict:
+        """汇总各阶段耗时，需要时保存 pstats 文件"""
+        stages = [
+            {'name': stage, 'label': STAGE_LABELS.get(stage, stage), 'seconds': seconds, 'calls': self._calls[stage]}
+            for stage, seconds in sorted(self._times.items(), key=lambda item: item[1], reverse=True)
+        ]
+        report = {
+            'action': name,
+            'total': total,
+            'stages': stages,
+            'other': max(0.0, total - sum(stage['seconds'] for stage in stages)),
+            'pstats_file': None
+        }
+
+        if profile is not None:
+            path = self.dump_dir / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{name}.pstats"
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                profile.dump_stats(str(path))
+                report['pstats_file'] = path
+            except OSError as e:
+                logger.warning(f"保存性能分析文件失败: {e}")
+        return report
+
+
+# 全局实例
+profiler = StageProfiler()
+
+__all__ = ['StageProfiler', 'STAGE_LABELS', 'profiler']
@@ -0,0 +1,144 @@
+"""
+行情数据模块
+定义各数据源共用的行情对象，一次解析响应中的全部常用字段
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+# 沪深、港股交易所使用的时区（UTC+8）
+CHINA_TZ = timezone(timedelta(hours=8))
+
+
+def parse_number(value: Any, scale: float = 1) -> Optional[float]:
+    """
+    把接口返回的字段转换为数字
+
+    参数:
+        value: 原始字段值，空字符串、'-' 和 None 视为缺失
+        scale: 换算倍数，如东方财富价格需要乘以 0.001
+
+    返回:
+        浮点数或 None（换算后保留6位小数，去掉浮点误差）
+    """
+    if value is None or value == '' or value == '-':
+        return None
+    try:
+        return round(float(value) * scale, 6)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_china_time(value: str) -> Optional[float]:
+    """
+    解析腾讯财经的行情时间（北京时间）
+
+    参数:
+        value: 如 "20261016150003"（沪深）或 "2026/10/16 16:08:03"（港股）
+
+    返回:
+        时间戳或 None
+    """
+    for fmt in ('%Y%m%d%H%M%S', '%Y/%m/%d %H:%M:%S'):
+        try:
+            return datetime.strptime(value, fmt).replace(tzinfo=CHINA_TZ).timestamp()
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+class Quote:
+    """
+    单只ETF的行情
+
+    为了兼容原来返回 (价格, 名称) 元组的调用方，Quote 可以按 (价格, 名称) 解包和下标访问:
+        price, name = quote
+        quote[0] == quote.price
+    """
+
+    __slots__ = ('code', 'name', 'price', 'prev_close', 'open', 'high', 'low',
+                 'volume', 'turnover', 'bid', 'ask', 'timestamp', 'source')
+
+    def __init__(self, code: str, name: str, price: float, prev_close: float = None, open: float = None,
+                 high: float = None, low: float = None, volume: float = None, turnover: float = None,
+                 bid: float = None, ask: float = None, timestamp: float = None, source: str = None):
+        """
+        初始化行情
+
+        参数:
+            code: ETF代码
+            name: ETF名称
+            price: 最新价
+            prev_close: 昨收价
+            open: 开盘价
+            high: 最高价
+            low: 最低价
+            volume: 成交量（股/份）
+            turnover: 成交额（元，美股为美元）
+            bid: 买一价
+            ask: 卖一价
+            timestamp: 交易所行情时间（时间戳）
+            source: 数据源名称
+        """
+        self.code = code
+        self.name = name
+        self.price = price
+        self.prev_close = prev_close
+        self.open = open
+        self.high = high
+        self.low = low
+        self.volume = volume
+        self.turnover = turnover
+        self.bid = bid
+        self.ask = ask
+        self.timestamp = timestamp
+        self.source = source
+
+    def __iter__(self):
+        yield self.price
+        yield self.name
+
+    def __getitem__(self, index):
+        return (self.price, self.name)[index]
+
+    def __len__(self) -> int:
+        return 2
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, tuple):
+            return (self.price, self.name) == other
+        if isinstance(other, Quote):
+            return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Quote({self.code!r}, {self.name!r}, price={self.price}, source={self.source!r})"
+
+    @property
+    def change_rate(self) -> Optional[float]:
+        """相对昨收价的涨跌幅（%），缺少昨收价时返回 None"""
+        if not self.prev_close:
+            return None
+        return (self.price - self.prev_close) / self.prev_close * 100
+
+    def replace(self, **changes) -> 'Quote':
+        """
+        返回修改了部分字段的副本
+
+        参数:
+            **changes: 需要修改的字段，如 code='SCHD', name='...'
+
+        返回:
+            新的 Quote
+        """
+        fields = {slot: getattr(self, slot) for slot in self.__slots__}
+        fields.update(changes)
+        return Quote(**fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+__all__ = ['Quote', 'parse_number', 'parse_china_time', 'CHINA_TZ']
@@ -0,0 +1,106 @@
+"""
+行情缓存模块
+进程内缓存最近获取的ETF价格，支持过期时间（TTL）、容量上限（LRU）和过期后继续使用（stale-while-revalidate）
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from src.quote import Quote
+from config.app import QUOTE_CACHE_CONFIG
+
+
+class QuoteCache:
+    """
+    行情缓存
+
+    每条缓存记录为字典: {code, price, name, source, fetched_at, quote}
+    - 新鲜（age <= ttl）: 直接使用
+    - 过期但可用（ttl < age <= ttl + stale_ttl）: 先返回旧价格，同时在后台刷新
+    - 超出可用期: 视为未命中，需要重新获取
+    """
+
+    def __init__(self, ttl: float = None, stale_ttl: float = None, max_size: int = None):
+        """
+        初始化行情缓存
+
+        参数:
+            ttl: 新鲜期（秒）
+            stale_ttl: 新鲜期之后仍可先返回旧价格的时间（秒）
+            max_size: 最多缓存的ETF数量，超出时淘汰最久未使用的记录
+        """
+        self.ttl = ttl if ttl is not None else QUOTE_CACHE_CONFIG['ttl']
+        self.stale_ttl = stale_ttl if stale_ttl is not None else QUOTE_CACHE_CONFIG['stale_ttl']
+        self.max_size = max_size or QUOTE_CACHE_CONFIG['max_size']
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, etf_code: str) -> Optional[Dict[str, Any]]:
+        """
+        获取缓存记录（不论是否新鲜）
+
+        参数:
+            etf_code: ETF代码
+
+        返回:
+            缓存记录的副本，附带 age（已缓存秒数），没有记录时返回 None
+        """
+        with self._lock:
+            entry = self._entries.get(etf_code)
+            if entry is None:
+                return None
+            self._entries.move_to_end(etf_code)
+            entry = dict(entry)
+
+        entry['age'] = time.time() - entry['fetched_at']
+        return entry
+
+    def set(self, etf_code: str, price: float, name: str, source: str, fetched_at: float = None,
+            quote: Quote = None) -> Dict[str, Any]:
+        """
+        写入缓存记录
+
+        参数:
+            etf_code: ETF代码
+            price: 价格
+            name: 名称
+            source: 数据源名称
+            fetched_at: 获取时间（时间戳），默认为当前时间
+            quote: 完整行情，未提供时只包含价格和名称
+
+        返回:
+            写入的缓存记录
+        """
+        entry = {
+            'code': etf_code,
+            'price': price,
+            'name': name,
+            'source': source,
+            'fetched_at': fetched_at if fetched_at is not None else time.time(),
+            'quote': quote if quote is not None else Quote(etf_code, name, price, source=source)
+        }
+        with self._lock:
+            self._entries[etf_code] = entry
+            self._entries.move_to_end(etf_code)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return entry
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """缓存记录是否仍在新鲜期内"""
+        return entry['age'] <= self.ttl
+
+    def is_usable(self, entry: Dict[str, Any]) -> bool:
+        """缓存记录是否还能先返回给调用方（新鲜期 + 过期可用期）"""
+        return entry['age'] <= self.ttl + self.stale_ttl
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+__all__ = ['QuoteCache']
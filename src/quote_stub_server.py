@@ -0,0 +1,362 @@
+"""
+本地行情模拟服务
+按腾讯财经、东方财富、Yahoo Finance 的响应格式返回录制的或合成的行情数据，
+支持设置延迟和注入错误，用于在没有网络的环境下重复测量数据获取层的性能。
+
+启动:
+    python -m src.quote_stub_server --port 8765 --latency 50 --jitter 20 --error-rate 0.05
+
+让爬虫请求模拟服务（同时放宽本地主机的限流）:
+    QUOTE_STUB_URL=http://127.0.0.1:8765 RATE_LIMIT_HOSTS=127.0.0.1=1000:1000 python main.py
+
+录制的响应放在 --recordings 目录下，存在时优先使用，否则返回合成数据:
+    tencent/sh560050.txt     腾讯单行响应 v_sh560050="...";（UTF-8保存，返回时转为GB18030）
+    eastmoney/1.560050.json  东方财富 stock/get 完整响应
+    yahoo/SCHD.json          Yahoo chart 完整响应
+批量接口（腾讯多代码、东方财富 ulist.np、Yahoo spark）由单个代码的数据拼装。
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+class QuoteStubServer(ThreadingHTTPServer):
+    """行情模拟服务，保存延迟、错误注入和录制数据等配置"""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503, recordings: str = None, seed: int = None):
+        """
+        初始化行情模拟服务
+
+        参数:
+            host: 监听地址
+            port: 监听端口，0 表示随机端口
+            latency: 每个响应的基础延迟（秒）
+            jitter: 在基础延迟上随机增加的最大延迟（秒）
+            error_rate: 返回错误状态码的概率（0-1）
+            error_status: 注入错误时返回的HTTP状态码
+            recordings: 录制响应所在目录
+            seed: 随机数种子，用于复现延迟和错误序列
+        """
+        super().__init__((host, port), QuoteStubHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.recordings = Path(recordings) if recordings else None
+        self.random = random.Random(seed)
+        self.request_count = 0
+        self.error_count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """服务地址，如 http://127.0.0.1:8765"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def next_delay_and_error(self) -> Tuple[float, bool]:
+        """为本次请求生成延迟时间和是否注入错误（共用一个随机数生成器，需加锁）"""
+        with self._lock:
+            self.request_count += 1
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            failed = self.random.random() < self.error_rate
+            if failed:
+                self.error_count += 1
+        return delay, failed
+
+    def load_recording(self, provider: str, key: str) -> Optional[str]:
+        """读取录制的响应，不存在时返回 None"""
+        if self.recordings is None:
+            return None
+        for suffix in ('.txt', '.json'):
+            path = self.recordings / provider / f"{key}{suffix}"
+            if path.exists():
+                return path.read_text(encoding='utf-8')
+        return None
+
+
+def synthetic_quote(symbol: str, now: float = None) -> Dict:
+    """
+    生成合成行情：基准价由代码决定，随时间缓慢波动，同一时刻同一代码的结果相同
+
+    参数:
+        symbol: 代码，如 sh560050、SCHD
+        now: 时间戳，默认为当前时间
+
+    返回:
+        {symbol, name, price, prev_close, open, high, low, volume, turnover, bid, ask, timestamp}
+    """
+    now = time.time() if now is None else now
+    seed = zlib.crc32(symbol.upper().encode('utf-8'))
+    is_us = symbol[:2].lower() not in ('sh', 'sz', 'hk')
+    base = 20 + seed % 48000 / 100 if is_us else 0.5 + seed % 2500 / 1000
+    phase = seed % 360
+
+    prev_close = round(base, 3)
+    price = round(base * (1 + 0.02 * math.sin(now / 60 + phase)), 3)
+    open_price = round(base * (1 + 0.005 * math.sin(phase)), 3)
+    volume = 100000 + seed % 900000
+    return {
+        'symbol': symbol,
+        'name': f"模拟ETF{symbol.upper()}",
+        'price': price,
+        'prev_close': prev_close,
+        'open': open_price,
+        'high': round(max(price, open_price, prev_close) * 1.005, 3),
+        'low': round(min(price, open_price, prev_close) * 0.995, 3),
+        'volume': volume,
+        'turnover': round(volume * price, 2),
+        'bid': round(price - 0.001, 3),
+        'ask': round(price + 0.001, 3),
+        'timestamp': now
+    }
+
+
+def tencent_line(stock_code: str, quote: Dict) -> str:
+    """按腾讯财经的字段顺序生成单行响应 v_sh560050="1~名称~560050~..."; """
+    market = {'sh': '1', 'sz': '51', 'hk': '100'}.get(stock_code[:2], '1')
+    change = round(quote['price'] - quote['prev_close'], 3)
+    fields = [''] * 50
+    fields[0] = market
+    fields[1] = quote['name']
+    fields[2] = stock_code[2:]
+    fields[3] = f"{quote['price']:.3f}"
+    fields[4] = f"{quote['prev_close']:.3f}"
+    fields[5] = f"{quote['open']:.3f}"
+    fields[6] = str(quote['volume'] // 100)  # 成交量（手）
+    fields[9] = f"{quote['bid']:.3f}"
+    fields[10] = '100'
+    fields[19] = f"{quote['ask']:.3f}"
+    fields[20] = '100'
+    fields[30] = datetime.fromtimestamp(quote['timestamp'], timezone(timedelta(hours=8))).strftime('%Y%m%d%H%M%S')  # 北京时间
+    fields[31] = f"{change:.3f}"
+    fields[32] = f"{change / quote['prev_close'] * 100:.2f}"
+    fields[33] = f"{quote['high']:.3f}"
+    fields[34] = f"{quote['low']:.3f}"
+    fields[36] = str(quote['volume'] // 100)
+    fields[37] = f"{quote['turnover'] / 10000:.2f}"  # 成交额（万元）
+    return f'v_{stock_code}="{"~".join(fields)}";'
+
+
+def eastmoney_data(secid: str, quote: Dict) -> Dict:
+    """按东方财富 stock/get 的字段生成 data 部分（价格为整数，需除以1000）"""
+    market, code = secid.split('.', 1)
+    scale = lambda value: int(round(value * 1000))
+    return {
+        'f43': scale(quote['price']),
+        'f44': scale(quote['high']),
+        'f45': scale(quote['low']),
+        'f46': scale(quote['open']),
+        'f47': quote['volume'] // 100,
+        'f48': quote['turnover'],
+        'f57': code,
+        'f58': quote['name'],
+        'f59': 3,
+        'f60': scale(quote['prev_close']),
+        'f86': int(quote['timestamp']),
+        'f107': int(market),
+        'f19': scale(quote['bid']),
+        'f20': 100,
+        'f39': scale(quote['ask']),
+        'f40': 100
+    }
+
+
+def yahoo_chart(symbol: str, quote: Dict) -> Dict:
+    """按Yahoo Finance chart接口格式生成响应"""
+    return {
+        'chart': {
+            'result': [{
+                'meta': {
+                    'symbol': symbol,
+                    'currency': 'USD',
+                    'regularMarketPrice': quote['price'],
+                    'chartPreviousClose': quote['prev_close'],
+                    'previousClose': quote['prev_close'],
+                    'regularMarketDayHigh': quote['high'],
+                    'regularMarketDayLow': quote['low'],
+                    'regularMarketVolume': quote['volume'],
+                    'regularMarketTime': int(quote['timestamp'])
+                },
+                'timestamp': [int(quote['timestamp'])],
+                'indicators': {'quote': [{'open': [quote['open']], 'close': [quote['price']]}]}
+            }],
+            'error': None
+        }
+    }
+
+
+class QuoteStubHandler(BaseHTTPRequestHandler):
+    """按请求路径分发到各数据源的响应格式"""
+
+    protocol_version = 'HTTP/1.1'
+    server: QuoteStubServer
+
+    def do_GET(self):
+        delay, failed = self.server.next_delay_and_error()
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            self._send(self.server.error_status, b'injected error', 'text/plain')
+            return
+
+        parts = urlsplit(self.path)
+        path = unquote(parts.path)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+
+        if path.startswith('/q='):
+            body = self._tencent(path[3:].split(','))
+            self._send(200, body.encode('GB18030'), 'text/plain; charset=GBK')
+        elif path == '/api/qt/stock/get':
+            self._send_json(self._eastmoney_single(query.get('secid', '')))
+        elif path == '/api/qt/ulist.np/get':
+            self._send_json(self._eastmoney_batch(query.get('secids', '').split(',')))
+        elif path == '/api/suggest/get':
+            self._send_json(self._eastmoney_search(query.get('input', '')))
+        elif path.startswith('/v8/finance/chart/'):
+            self._send_json(self._yahoo_chart(path.rsplit('/', 1)[-1]))
+        elif path == '/v7/finance/spark':
+            self._send_json(self._yahoo_spark(query.get('symbols', '').split(',')))
+        else:
+            self._send(404, b'not found', 'text/plain')
+
+    def _tencent(self, stock_codes: List[str]) -> str:
+        lines = []
+        for stock_code in filter(None, stock_codes):
+            recorded = self.server.load_recording('tencent', stock_code)
+            lines.append(recorded.strip() if recorded else tencent_line(stock_code, synthetic_quote(stock_code)))
+        return '\n'.join(lines) + '\n'
+
+    def _eastmoney_single(self, secid: str) -> Dict:
+        recorded = self.server.load_recording('eastmoney', secid)
+        if recorded:
+            return json.loads(recorded)
+        if '.' not in secid:
+            return {'rc': 0, 'rt': 4, 'data': None}
+        # 与腾讯使用相同的代码生成行情，两个数据源返回一致的价格
+        market, code = secid.split('.', 1)
+        symbol = {'0': f"sz{code}", '1': f"sh{code}"}.get(market, code)
+        return {'rc': 0, 'rt': 4, 'data': eastmoney_data(secid, synthetic_quote(symbol))}
+
+    def _eastmoney_batch(self, secids: List[str]) -> Dict:
+        # 批量接口使用 fltt=2，价格为浮点数
+        diff = []
+        for secid in filter(None, secids):
+            data = self._eastmoney_single(secid).get('data')
+            if data:
+                price = lambda key: round(data[key] / 1000, 3) if data.get(key) is not None else '-'
+                diff.append({
+                    'f2': price('f43'),
+                    'f5': data.get('f47', '-'),
+                    'f6': data.get('f48', '-'),
+                    'f12': data['f57'],
+                    'f13': data.get('f107', int(secid.split('.')[0])),
+                    'f14': data['f58'],
+                    'f15': price('f44'),
+                    'f16': price('f45'),
+                    'f17': price('f46'),
+                    'f18': price('f60'),
+                    'f31': price('f19'),
+                    'f32': price('f39'),
+                    'f124': data.get('f86', '-')
+                })
+        return {'rc': 0, 'rt': 6, 'data': {'total': len(diff), 'diff': diff}}
+
+    def _eastmoney_search(self, symbol: str) -> Dict:
+        symbol = symbol.upper()
+        market = '105' if zlib.crc32(symbol.encode('utf-8')) % 2 else '107'
+        return {'QuotationCodeTable': {'Data': [{'Code': symbol, 'Name': symbol, 'QuoteID': f"{market}.{symbol}"}]}}
+
+    def _yahoo_chart(self, symbol: str) -> Dict:
+        recorded = self.server.load_recording('yahoo', symbol.upper())
+        if recorded:
+            return json.loads(recorded)
+        return yahoo_chart(symbol.upper(), synthetic_quote(symbol))
+
+    def _yahoo_spark(self, symbols: List[str]) -> Dict:
+        result = []
+        for symbol in filter(None, symbols):
+            chart = self._yahoo_chart(symbol)['chart']['result'][0]
+            result.append({'symbol': symbol.upper(), 'response': [chart]})
+        return {'spark': {'result': result, 'error': None}}
+
+    def _send_json(self, data: Dict):
+        self._send(200, json.dumps(data, ensure_ascii=False).encode('utf-8'), 'application/json; charset=utf-8')
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 压测时不逐条输出请求日志
+        pass
+
+
+def start_stub_server(port: int = 0, **kwargs) -> QuoteStubServer:
+    """
+    在后台线程中启动行情模拟服务（供压测脚本使用）
+
+    参数:
+        port: 监听端口，默认随机端口
+        **kwargs: QuoteStubServer 的其余参数
+
+    返回:
+        已启动的服务，使用 server.url 获取地址，用完调用 server.shutdown()
+    """
+    server = QuoteStubServer(port=port, **kwargs)
+    threading.Thread(target=server.serve_forever, name='quote-stub-server', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地行情模拟服务（腾讯财经 / 东方财富 / Yahoo Finance 响应格式）")
+    parser.add_argument('--host', default='127.0.0.1', help="监听地址")
+    parser.add_argument('--port', type=int, default=8765, help="监听端口")
+    parser.add_argument('--latency', type=float, default=0, help="每个响应的基础延迟（毫秒）")
+    parser.add_argument('--jitter', type=float, default=0, help="随机增加的最大延迟（毫秒）")
+    parser.add_argument('--error-rate', type=float, default=0, help="返回错误的概率（0-1）")
+    parser.add_argument('--error-status', type=int, default=503, help="注入错误时的HTTP状态码")
+    parser.add_argument('--recordings', default=None, help="录制响应所在目录")
+    parser.add_argument('--seed', type=int, default=None, help="随机数种子")
+    args = parser.parse_args()
+
+    server = QuoteStubServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        recordings=args.recordings,
+        seed=args.seed
+    )
+    print(f"行情模拟服务已启动: {server.url}（Ctrl+C 退出）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"共处理 {server.request_count} 个请求，注入错误 {server.error_count} 次")
+
+
+__all__ = ['QuoteStubServer', 'start_stub_server', 'synthetic_quote']
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+限流模块
+按主机使用令牌桶控制请求频率，同步和异步代码共用同一组令牌桶
+"""
+import asyncio
+import threading
+import time
+from typing import Dict, Tuple
+from urllib.parse import urlsplit
+from src.logger import logger
+from config.app import RATE_LIMIT_CONFIG
+
+
+class TokenBucket:
+    """令牌桶：按固定速率补充令牌，最多积累 burst 个，允许短时突发"""
+
+    def __init__(self, rate: float, burst: int):
+        """
+        初始化令牌桶
+
+        参数:
+            rate: 每秒补充的令牌数（即长期平均请求速率），小于等于 0 表示不限流
+            burst: 桶容量（允许连续发出的最大请求数）
+        """
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """
+        预定一个令牌
+
+        令牌不足时也会立即预定（令牌数变为负数），调用方按返回的等待时间排队，
+        这样同步线程和异步协程可以共用同一个桶，且不会在持锁时等待。
+
+        返回:
+            需要等待的秒数，0 表示可以立即请求
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        """同步获取一个令牌，令牌不足时阻塞等待"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """异步获取一个令牌，令牌不足时让出事件循环等待"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class RateLimiter:
+    """按主机管理令牌桶，所有爬虫共享"""
+
+    def __init__(self, rate: float = None, burst: int = None, host_limits: Dict[str, Tuple[float, int]] = None):
+        """
+        初始化限流器
+
+        参数:
+            rate: 默认每秒请求数，0 表示不限流
+            burst: 默认突发请求数
+            host_limits: 按主机覆盖的限流配置，{主机名: (每秒请求数, 突发请求数)}
+        """
+        self.rate = rate if rate is not None else RATE_LIMIT_CONFIG['rate']
+        self.burst = burst if burst is not None else RATE_LIMIT_CONFIG['burst']
+        self.host_limits = host_limits if host_limits is not None else RATE_LIMIT_CONFIG['hosts']
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url: str) -> TokenBucket:
+        """
+        获取URL所属主机的令牌桶（不存在时创建）
+
+        参数:
+            url: 请求地址
+
+        返回:
+            该主机的令牌桶
+        """
+        host = urlsplit(url).hostname or url
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self.host_limits.get(host, (self.rate, self.burst))
+                bucket = TokenBucket(rate, burst)
+                self._buckets[host] = bucket
+                logger.debug("创建限流令牌桶: {} ({}/秒, 突发 {})", host, rate, burst)
+            return bucket
+
+    def acquire(self, url: str):
+        """同步等待请求许可"""
+        self.bucket(url).acquire()
+
+    async def acquire_async(self, url: str):
+        """异步等待请求许可"""
+        await self.bucket(url).acquire_async()
+
+
+# 全局实例（所有爬虫共享）
+rate_limiter = RateLimiter()
+
+__all__ = ['TokenBucket', 'RateLimiter', 'rate_limiter']
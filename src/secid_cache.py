@@ -0,0 +1,112 @@
+"""
+证券ID缓存模块
+持久化保存东方财富美股代码的市场代码（105/107），避免每次获取价格都请求搜索接口
+
+缓存文件为JSON（默认 data/eastmoney_secids.json），格式:
+    {"SCHD": {"market": "107", "resolved_at": 1760000000.0}, ...}
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from src.logger import logger
+from config.app import SECID_CACHE_CONFIG
+
+
+class SecidCache:
+    """美股市场代码缓存，启动时从磁盘加载，新解析的结果写回磁盘"""
+
+    def __init__(self, file_path: str = None, ttl_days: float = None):
+        """
+        初始化证券ID缓存
+
+        参数:
+            file_path: 缓存文件路径，默认使用 SECID_CACHE_CONFIG['file']
+            ttl_days: 缓存有效天数，过期后重新解析
+        """
+        self.file_path = Path(file_path or SECID_CACHE_CONFIG['file'])
+        ttl_days = ttl_days if ttl_days is not None else SECID_CACHE_CONFIG['ttl_days']
+        self.ttl = ttl_days * 86400
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> int:
+        """
+        从磁盘加载缓存
+
+        返回:
+            加载的记录数
+        """
+        if not self.file_path.exists():
+            return 0
+
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取市场代码缓存失败，将重新解析: {e}")
+            return 0
+
+        with self._lock:
+            self._entries = {
+                code: entry for code, entry in data.items()
+                if isinstance(entry, dict) and entry.get('market')
+            }
+            count = len(self._entries)
+        logger.debug(f"加载市场代码缓存 {count} 条: {self.file_path}")
+        return count
+
+    def save(self):
+        """写回磁盘（先写临时文件再替换，避免中途退出导致文件损坏）"""
+        with self._lock:
+            data = dict(self._entries)
+
+        tmp_path = self.file_path.with_suffix(self.file_path.suffix + '.tmp')
+        try:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.file_path)
+        except OSError as e:
+            logger.warning(f"保存市场代码缓存失败: {e}")
+
+    def get(self, etf_code: str) -> Optional[str]:
+        """
+        获取缓存的市场代码
+
+        参数:
+            etf_code: 美股ETF代码
+
+        返回:
+            市场代码，未缓存或已过期时返回 None
+        """
+        entry = self._entries.get(etf_code.upper())
+        if entry is None or time.time() - entry.get('resolved_at', 0) > self.ttl:
+            return None
+        return entry['market']
+
+    def set(self, etf_code: str, market_code: str, persist: bool = True):
+        """
+        写入市场代码
+
+        参数:
+            etf_code: 美股ETF代码
+            market_code: 市场代码（105/107）
+            persist: 是否立即写回磁盘，批量写入时可在最后统一调用 save()
+        """
+        with self._lock:
+            self._entries[etf_code.upper()] = {'market': market_code, 'resolved_at': time.time()}
+        if persist:
+            self.save()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# 全局实例
+secid_cache = SecidCache()
+
+__all__ = ['SecidCache', 'secid_cache']
@@ -1,18 +1,183 @@
 """
 数据存储模块
-支持 CSV 文件的读写操作
+支持 CSV 文件和 SQLite 数据库两种存储后端（STORAGE_BACKEND 配置）
+
+- TableStorage: 单张表的存储接口，查询类方法带全表扫描的默认实现，后端可覆盖为索引查询
+- CSVStorage: 每张表一个 CSV 文件（默认）
+- SQLiteStorage: 所有表在一个 SQLite 数据库中（见 src/storage_sqlite.py）
+- PriceHistoryStorage 等业务存储类通过 create_table() 获取所用后端的表
 """
 import csv
+import io
 import os
+import threading
+from abc import ABC, abstractmethod
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Hashable, Optional, Tuple
 from src.logger import logger
-from config.app import CSV_FILES, ETF_CONFIG
+from config.app import CSV_FILES, ETF_CONFIG, STORAGE_CONFIG
+
+try:
+    import fcntl  # 跨进程文件锁（仅 POSIX）
+except ImportError:
+    fcntl = None
+
+
+class TableStorage(ABC):
+    """单张表的存储接口"""
+
+    @abstractmethod
+    def exists(self) -> bool:
+        """检查表是否已创建（写入过数据）"""
+
+    @abstractmethod
+    def append(self, row: Dict[str, Any], fieldnames: List[str] = None):
+        """
+        追加一行数据
+
+        参数:
+            row: 行数据字典
+            fieldnames: 字段名列表（表不存在时用于创建）
+        """
+
+    @abstractmethod
+    def read_all(self) -> List[Dict[str, Any]]:
+        """读取所有数据（按写入顺序）"""
+
+    @abstractmethod
+    def read_last(self) -> Optional[Dict[str, Any]]:
+        """读取最后一行数据"""
+
+    @abstractmethod
+    def count(self) -> int:
+        """统计记录数"""
+
+    @abstractmethod
+    def replace_all(self, rows: List[Dict[str, Any]], fieldnames: List[str] = None):
+        """
+        用给定的数据替换表中全部数据
+
+        参数:
+            rows: 行数据列表
+            fieldnames: 字段名列表，默认使用表中已有的字段
+        """
+
+    @abstractmethod
+    def delete(self):
+        """删除表中全部数据"""
+
+    @abstractmethod
+    def signature(self) -> Optional[Hashable]:
+        """
+        表的版本标识，数据被修改（包括其他进程修改）后会变化，用于缓存失效
+
+        返回:
+            版本标识，表不存在时返回 None
+        """
+
+    @staticmethod
+    def _matches(row: Dict[str, Any], conditions: Dict[str, Any]) -> bool:
+        """按字符串比较判断行是否满足全部等值条件（CSV 中的值都是字符串）"""
+        return all(str(row.get(field)) == str(value) for field, value in conditions.items())
+
+    def find(self, **conditions) -> List[Dict[str, Any]]:
+        """
+        按等值条件查询，如 find(etf_code='SH560050')
+
+        返回:
+            满足全部条件的行（按写入顺序）
+        """
+        return [row for row in self.read_all() if self._matches(row, conditions)]
+
+    def find_range(self, field: str, start: Any = None, end: Any = None, descending: bool = False,
+                   limit: int = None, **conditions) -> List[Dict[str, Any]]:
+        """
+        按字段范围查询并排序，如 find_range('record_time', '2024-01-01', '2024-01-31 23:59:59', etf_code='SH560050')
+
+        参数:
+            field: 范围查询和排序的字段（时间字段格式为 YYYY-MM-DD HH:MM:SS，可按字符串比较）
+            start: 下限（包含），None 表示不限
+            end: 上限（包含），None 表示不限
+            descending: 是否倒序（字段值相同时后写入的行在前）
+            limit: 最多返回的行数
+            **conditions: 额外的等值条件
+
+        返回:
+            满足条件的行
+        """
+        rows = [
+            row for row in self.read_all()
+            if self._matches(row, conditions)
+            and (start is None or str(row.get(field) or '') >= str(start))
+            and (end is None or str(row.get(field) or '') <= str(end))
+        ]
+        if descending:
+            # 字段值相同的行也按写入顺序倒序（最新写入的在前）
+            rows.reverse()
+        rows.sort(key=lambda row: str(row.get(field) or ''), reverse=descending)
+        return rows[:limit] if limit is not None else rows
 
+    def upsert(self, key: str, row: Dict[str, Any], fieldnames: List[str] = None):
+        """
+        按键字段更新已有的行，不存在时追加
 
-class CSVStorage:
-    """CSV 数据存储类"""
+        参数:
+            key: 键字段，如 etf_code
+            row: 行数据字典（需要包含键字段）
+            fieldnames: 字段名列表
+        """
+        rows = self.read_all()
+        for existing in rows:
+            if str(existing.get(key)) == str(row[key]):
+                existing.update(row)
+                self.replace_all(rows, fieldnames)
+                return
+        self.append(row, fieldnames)
+
+    def delete_where(self, **conditions) -> int:
+        """
+        删除满足全部等值条件的行
+
+        返回:
+            删除的行数
+        """
+        rows = self.read_all()
+        kept = [row for row in rows if not self._matches(row, conditions)]
+        if len(kept) != len(rows):
+            self.replace_all(kept)
+        return len(rows) - len(kept)
+
+    def next_id(self) -> int:
+        """下一条记录的自增 ID"""
+        return self.count() + 1
+
+    def append_with_id(self, row: Dict[str, Any], fieldnames: List[str] = None) -> int:
+        """
+        追加一行并为其分配自增 ID（写入 row['id']）
+
+        默认实现先分配再追加，两步之间没有加锁；后端应覆盖为原子操作。
+
+        参数:
+            row: 行数据字典（不需要包含 id）
+            fieldnames: 字段名列表（表不存在时用于创建）
+
+        返回:
+            分配的 ID
+        """
+        row['id'] = self.next_id()
+        self.append(row, fieldnames)
+        return row['id']
+
+
+class CSVStorage(TableStorage):
+    """
+    CSV 数据存储类
+
+    自增 ID: 第一次分配时扫描文件得到最大的 id，之后在内存中递增；文件变大时（其他进程追加）
+    只扫描新增的部分，变小或被重写时重新扫描。分配 ID 和写入该行在同一把锁内完成
+    （POSIX 系统上同时持有文件锁），行按 ID 顺序写入，进程崩溃后重启也不会重复。
+    """
 
     def __init__(self, file_path: str):
         """
@@ -23,6 +188,10 @@ class CSVStorage:
         """
         self.file_path = Path(file_path)
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        # ID 分配状态: 已分配的最大 id、对应的文件大小（None 表示需要重新扫描文件）
+        self._max_id = 0
+        self._id_file_size: Optional[int] = None
+        self._id_lock = threading.Lock()
 
     def _get_file_size(self) -> int:
         """获取文件大小"""
@@ -42,28 +211,110 @@ class CSVStorage:
             row: 行数据字典
             fieldnames: 字段名列表（如果不存在则自动创建文件）
         """
-        try:
-            file_exists = self.exists()
-            mode = 'a' if file_exists else 'w'
+        self._append(row, fieldnames, assign_id=False)
+
+    def append_with_id(self, row: Dict[str, Any], fieldnames: List[str] = None) -> int:
+        """
+        追加一行并为其分配自增 ID（写入 row['id']），分配和写入是一个原子操作
+
+        参数:
+            row: 行数据字典（不需要包含 id）
+            fieldnames: 字段名列表（如果不存在则自动创建文件）
+
+        返回:
+            分配的 ID
+        """
+        self._append(row, fieldnames, assign_id=True)
+        return row['id']
+
+    def _append(self, row: Dict[str, Any], fieldnames: Optional[List[str]], assign_id: bool):
+        """
+        追加一行：先格式化成完整的一行，再一次写入文件末尾
 
+        上次写入因进程崩溃只写了一半（文件末尾没有换行符）时，先补上换行，
+        避免新的一行接在残缺的行后面。
+        """
+        try:
             # 如果文件不存在，从 row 的 keys 获取 fieldnames
             if not fieldnames:
                 fieldnames = list(row.keys())
 
-            with open(self.file_path, mode, newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-
-                # 如果文件不存在，写入表头
-                if not file_exists:
+            with self._id_lock, open(self.file_path, 'a+b') as f:
+                if fcntl is not None:
+                    # 文件关闭时自动释放
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+                size_before = f.seek(0, os.SEEK_END)
+                if size_before > 0:
+                    # 按文件中的表头写入；旧版文件缺少字段时先升级表头
+                    fieldnames, size_before = self._upgrade_header(f, fieldnames)
+                if assign_id:
+                    row['id'] = self._allocate_id(size_before)
+
+                buffer = io.StringIO()
+                writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+                if size_before == 0:
                     writer.writeheader()
                     logger.debug(f"创建 CSV 文件: {self.file_path}")
-
+                elif not self._ends_with_newline(f, size_before):
+                    logger.warning(f"CSV 文件末尾有未写完的行，已跳过: {self.file_path}")
+                    buffer.write('\r\n')
                 writer.writerow(row)
 
+                data = buffer.getvalue().encode('utf-8')
+                f.write(data)
+                f.flush()
+
+                # 写入前文件与 ID 状态一致时，记录本次写入后的大小，下次分配 ID 不需要重新扫描
+                if self._id_file_size == size_before:
+                    self._id_file_size = size_before + len(data)
+
         except Exception as e:
             logger.error(f"写入 CSV 失败: {e}")
             raise
 
+    def _upgrade_header(self, f, fieldnames: List[str]) -> Tuple[List[str], int]:
+        """
+        检查文件表头是否包含全部字段，缺少时（如旧版文件没有 id 列）重写整个文件，
+        已有的行在新增的列中为空（调用方需持有 _id_lock 和文件锁）
+
+        参数:
+            f: 以 a+b 模式打开的文件
+            fieldnames: 需要的字段名列表
+
+        返回:
+            (文件中的表头, 文件大小)
+        """
+        f.seek(0)
+        header = next(csv.reader([f.readline().decode('utf-8-sig')]), [])
+        missing = [name for name in fieldnames if name not in header]
+        if not missing:
+            return header, f.seek(0, os.SEEK_END)
+
+        f.seek(0)
+        rows = list(csv.DictReader(io.StringIO(f.read().decode('utf-8-sig'), newline='')))
+        upgraded = fieldnames + [name for name in header if name not in fieldnames]
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=upgraded, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+        f.truncate(0)
+        f.write(buffer.getvalue().encode('utf-8'))
+        f.flush()
+        self._id_file_size = None
+
+        logger.info(f"CSV 表头缺少字段 {missing}，已升级: {self.file_path}")
+        return upgraded, f.seek(0, os.SEEK_END)
+
+    @staticmethod
+    def _ends_with_newline(f, size: int) -> bool:
+        """检查文件最后一个字节是否为换行符"""
+        f.seek(size - 1)
+        last = f.read(1)
+        f.seek(0, os.SEEK_END)
+        return last == b'\n'
+
     def read_all(self) -> List[Dict[str, Any]]:
         """读取所有数据"""
         try:
@@ -106,6 +357,109 @@ class CSVStorage:
             logger.error(f"统计 CSV 记录数失败: {e}")
             raise
 
+    def _read_fieldnames(self) -> List[str]:
+        """读取表头"""
+        if not self.exists():
+            return []
+        with open(self.file_path, 'r', encoding='utf-8') as f:
+            return next(csv.reader(f), [])
+
+    def replace_all(self, rows: List[Dict[str, Any]], fieldnames: List[str] = None):
+        """
+        重新写入整个文件
+
+        参数:
+            rows: 行数据列表
+            fieldnames: 字段名列表，默认使用文件已有的表头
+        """
+        fieldnames = fieldnames or self._read_fieldnames() or (list(rows[0].keys()) if rows else [])
+        with self._id_lock:
+            with open(self.file_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(rows)
+            self._id_file_size = None
+
+    def signature(self) -> Optional[Tuple[int, int]]:
+        """文件的 (修改时间, 大小)，文件不存在时返回 None"""
+        try:
+            stat = self.file_path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def next_id(self) -> int:
+        """
+        预先分配一个自增 ID（通常只需要一次 stat，不读取文件）
+
+        新增记录请使用 append_with_id，分配和写入在同一把锁内完成，不会乱序。
+
+        返回:
+            新的 ID（分配后即占用，同一进程内的多个线程不会拿到相同的 ID）
+        """
+        with self._id_lock:
+            return self._allocate_id(self._get_file_size())
+
+    def _allocate_id(self, size: int) -> int:
+        """
+        分配下一个 ID（调用方需持有 _id_lock）
+
+        参数:
+            size: 当前文件大小
+        """
+        if self._id_file_size is None or size < self._id_file_size:
+            self._max_id = self._scan_max_id(0)
+        elif size > self._id_file_size:
+            # 其他进程追加了数据，只需要扫描新增的部分
+            self._max_id = max(self._max_id, self._scan_max_id(self._id_file_size))
+        self._id_file_size = size
+        self._max_id += 1
+        return self._max_id
+
+    def _scan_max_id(self, offset: int) -> int:
+        """
+        扫描文件中从 offset 开始的记录，返回其中最大的 id（行不一定按 id 顺序写入）
+
+        参数:
+            offset: 开始扫描的位置（0 表示整个文件）
+
+        返回:
+            最大的 id，文件不存在、没有记录或没有 id 列时为 0
+        """
+        if not self.exists():
+            return 0
+
+        with open(self.file_path, 'rb') as f:
+            header = f.readline()
+            fieldnames = next(csv.reader([header.decode('utf-8-sig')]), [])
+            if 'id' not in fieldnames:
+                return 0
+            id_index = fieldnames.index('id')
+
+            f.seek(max(offset, len(header)))
+            max_id = 0
+            for line in f:
+                record_id = self._parse_id(line, id_index)
+                if record_id is not None and record_id > max_id:
+                    max_id = record_id
+            return max_id
+
+    @staticmethod
+    def _parse_id(line: bytes, id_index: int) -> Optional[int]:
+        """解析一行中的 id（空行、写了一半的行等返回 None）"""
+        line = line.strip()
+        if not line:
+            return None
+        # 没有引号的行直接按逗号切分，比 csv 模块快得多
+        if b'"' in line:
+            fields = next(csv.reader([line.decode('utf-8', errors='replace')]), [])
+        else:
+            fields = line.split(b',', id_index + 1)
+        try:
+            return int(fields[id_index])
+        except (IndexError, ValueError):
+            return None
+
     def delete(self):
         """删除文件"""
         if self.exists():
@@ -113,11 +467,33 @@ class CSVStorage:
             logger.info(f"已删除文件: {self.file_path}")
 
 
-class PriceHistoryStorage(CSVStorage):
+def create_table(name: str, backend: str = None) -> TableStorage:
+    """
+    按配置的存储后端创建表
+
+    参数:
+        name: 表名（CSV_FILES 中的键，如 price_history）
+        backend: 存储后端（csv 或 sqlite），默认使用 STORAGE_CONFIG['backend']
+
+    返回:
+        TableStorage
+    """
+    backend = backend or STORAGE_CONFIG['backend']
+    if backend == 'csv':
+        return CSVStorage(CSV_FILES[name])
+    if backend == 'sqlite':
+        from src.storage_sqlite import SQLiteStorage
+        return SQLiteStorage(name)
+    raise ValueError(f"不支持的存储后端: {backend}（可选 csv、sqlite）")
+
+
+class PriceHistoryStorage:
     """价格历史数据存储"""
 
-    def __init__(self):
-        super().__init__(CSV_FILES['price_history'])
+    FIELDNAMES = ['id', 'etf_code', 'etf_name', 'price', 'record_time', 'created_at']
+
+    def __init__(self, table: TableStorage = None):
+        self.table = table or create_table('price_history')
 
     def add_price_record(self, etf_code: str, etf_name: str, price: float) -> Dict[str, Any]:
         """
@@ -132,7 +508,6 @@ class PriceHistoryStorage(CSVStorage):
             添加的记录
         """
         record = {
-            'id': self.count() + 1,
             'etf_code': etf_code,
             'etf_name': etf_name,
             'price': round(price, 2),
@@ -140,15 +515,14 @@ class PriceHistoryStorage(CSVStorage):
             'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
 
-        fieldnames = ['id', 'etf_code', 'etf_name', 'price', 'record_time', 'created_at']
-        self.append(record, fieldnames)
+        self.table.append_with_id(record, self.FIELDNAMES)
 
         logger.info(f"添加价格记录: {etf_code} - {price}元")
         return record
 
     def get_latest_price(self) -> Optional[float]:
         """获取最新价格"""
-        last_record = self.read_last()
+        last_record = self.table.read_last()
         if last_record and 'price' in last_record:
             return float(last_record['price'])
         return None
@@ -161,26 +535,40 @@ class PriceHistoryStorage(CSVStorage):
             days: 天数
 
         返回:
-            历史记录列表
+            历史记录列表（按时间倒序）
         """
-        all_records = self.read_all()
-        if not all_records:
-            return []
+        # 假设每小时一条数据
+        return self.table.find_range('record_time', descending=True, limit=days * 24)
 
-        # 按时间倒序排列
-        all_records.sort(key=lambda x: x['record_time'], reverse=True)
+    def get_history_between(self, start: str = None, end: str = None, etf_code: str = None) -> List[Dict[str, Any]]:
+        """
+        获取时间范围内的价格记录（SQLite 后端使用索引查询）
+
+        参数:
+            start: 开始时间（包含），如 2024-01-01 00:00:00，None 表示不限
+            end: 结束时间（包含），None 表示不限
+            etf_code: 只查询某只ETF，None 表示全部
+
+        返回:
+            历史记录列表（按时间正序）
+        """
+        conditions = {'etf_code': etf_code} if etf_code else {}
+        return self.table.find_range('record_time', start, end, **conditions)
 
-        # 截取指定天数的数据
-        return all_records[:days * 24]  # 假设每小时一条数据
 
+class ETFTransactionStorage:
+    """
+    ETF上次交易数据存储（为每只ETF保存独立的上次交易价格和数量）
 
-class ETFTransactionStorage(CSVStorage):
-    """ETF上次交易数据存储（为每只ETF保存独立的上次交易价格和数量）"""
+    每次保存都会分配新的交易记录 ID，提醒状态按交易记录 ID 保存，交易数据更新后提醒重新开始。
+    """
 
-    def __init__(self):
-        super().__init__(CSV_FILES['user_transactions'])
+    FIELDNAMES = ['id', 'etf_code', 'transaction_price', 'transaction_quantity', 'updated_at']
 
-    def save_etf_transaction(self, etf_code: str, price: float, quantity: int):
+    def __init__(self, table: TableStorage = None):
+        self.table = table or create_table('user_transactions')
+
+    def save_etf_transaction(self, etf_code: str, price: float, quantity: int) -> int:
         """
         保存或更新ETF的上次交易数据
 
@@ -188,38 +576,33 @@ class ETFTransactionStorage(CSVStorage):
             etf_code: ETF代码
             price: 上次交易价格
             quantity: 交易数量
-        """
-        records = self.read_all()
 
-        # 查找是否已存在该ETF的记录
-        existing_idx = -1
-        for idx, record in enumerate(records):
-            if record['etf_code'] == etf_code:
-                existing_idx = idx
-                break
-
-        # 更新或添加记录
-        if existing_idx >= 0:
-            records[existing_idx]['transaction_price'] = round(price, 3)
-            records[existing_idx]['transaction_quantity'] = quantity
-            records[existing_idx]['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        else:
-            new_record = {
-                'etf_code': etf_code,
-                'transaction_price': round(price, 3),
-                'transaction_quantity': quantity,
-                'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
-            records.append(new_record)
-
-        # 重新写入文件
-        fieldnames = ['etf_code', 'transaction_price', 'transaction_quantity', 'updated_at']
-        with open(self.file_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(records)
+        返回:
+            交易记录 ID
+        """
+        # 旧版数据先补上交易记录 ID（同时升级表头），再写入新的行
+        self.assign_missing_ids()
+        record = {
+            'id': self.table.next_id(),
+            'etf_code': etf_code,
+            'transaction_price': round(price, 3),
+            'transaction_quantity': quantity,
+            'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+        self.table.upsert('etf_code', record, self.FIELDNAMES)
 
         logger.info(f"更新ETF交易数据: {etf_code} - {price}元 × {quantity}份")
+        return record['id']
+
+    @staticmethod
+    def _to_transaction(record: Dict[str, Any]) -> Dict[str, Any]:
+        """转换为 {id, code, price, quantity}，旧版数据没有 id 时为 None"""
+        return {
+            'id': int(record['id']) if record.get('id') else None,
+            'code': record['etf_code'],
+            'price': float(record['transaction_price']),
+            'quantity': int(record['transaction_quantity'])
+        }
 
     def get_etf_transaction(self, etf_code: str) -> Optional[Dict[str, Any]]:
         """
@@ -229,45 +612,48 @@ class ETFTransactionStorage(CSVStorage):
             etf_code: ETF代码
 
         返回:
-            交易数据或None
+            {id, code, price, quantity} 或None
         """
-        records = self.read_all()
-        for record in records:
-            if record['etf_code'] == etf_code:
-                return {
-                    'code': record['etf_code'],
-                    'price': float(record['transaction_price']),
-                    'quantity': int(record['transaction_quantity'])
-                }
-        return None
+        records = self.table.find(etf_code=etf_code)
+        if not records:
+            return None
+        return self._to_transaction(records[0])
 
     def get_all_etf_transactions(self) -> Dict[str, Dict[str, Any]]:
         """
         获取所有ETF的上次交易数据
 
         返回:
-            {etf_code: {code, price, quantity}}
+            {etf_code: {id, code, price, quantity}}
         """
-        records = self.read_all()
-        result = {}
-        for record in records:
-            result[record['etf_code']] = {
-                'code': record['etf_code'],
-                'price': float(record['transaction_price']),
-                'quantity': int(record['transaction_quantity'])
-            }
-        return result
+        return {record['etf_code']: self._to_transaction(record) for record in self.table.read_all()}
+
+    def assign_missing_ids(self) -> int:
+        """
+        为旧版数据中没有交易记录 ID 的行分配 ID
+
+        返回:
+            分配的数量
+        """
+        records = self.table.read_all()
+        missing = [record for record in records if not record.get('id')]
+        for record in missing:
+            record['id'] = self.table.next_id()
+        if missing:
+            self.table.replace_all(records, self.FIELDNAMES)
+            logger.info(f"为 {len(missing)} 条ETF交易数据分配交易记录 ID")
+        return len(missing)
 
     def has_etf_data(self, etf_code: str) -> bool:
         """检查某只ETF是否有交易数据"""
         return self.get_etf_transaction(etf_code) is not None
 
 
-class UserTransactionStorage(CSVStorage):
+class UserTransactionStorage:
     """用户交易记录存储（示例代码，新版本中可以移除或保留兼容性）"""
 
-    def __init__(self):
-        super().__init__(CSV_FILES['user_transactions'])
+    def __init__(self, table: TableStorage = None):
+        self.table = table or create_table('user_transactions')
 
     def add_transaction(self, etf_code: str, price: float, quantity: int,
                        transaction_type: str = 'buy', notes: str = '') -> int:
@@ -291,14 +677,60 @@ class UserTransactionStorage(CSVStorage):
 
     def get_latest_transaction(self) -> Optional[Dict[str, Any]]:
         """获取最近一笔交易记录"""
-        return self.read_last()
+        return self.table.read_last()
+
 
+class AlertStatusStorage:
+    """
+    提醒状态存储
 
-class AlertStatusStorage(CSVStorage):
-    """提醒状态存储"""
+    每个交易记录 ID 的最新状态缓存在内存中（首次查询时读取一次表，表被其他进程修改后重新加载）。
+    状态（是否在区间内、区间类型）没有变化时只更新内存，不再追加新行，
+    长时间监控时表的大小和每次查询的耗时都不会持续增长。
+    """
 
-    def __init__(self):
-        super().__init__(CSV_FILES['alert_status'])
+    FIELDNAMES = [
+        'id', 'transaction_id', 'etf_code', 'last_price', 'in_range',
+        'range_type', 'last_check_time', 'updated_at'
+    ]
+
+    def __init__(self, table: TableStorage = None):
+        self.table = table or create_table('alert_status')
+        # 缓存: 表的版本标识、{交易记录ID: 最新状态}
+        self._signature: Optional[Hashable] = None
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _load_latest(self) -> Dict[str, Dict[str, Any]]:
+        """
+        获取每个交易记录的最新状态，表变化后重新加载（调用方需持有 _lock）
+
+        返回:
+            {交易记录ID: 状态数据}，为内部数据
+        """
+        signature = self.table.signature()
+        if signature is not None and signature == self._signature:
+            return self._latest
+
+        latest = {}
+        for record in (self.table.read_all() if signature is not None else []):
+            transaction_id = str(record['transaction_id'])
+            current = latest.get(transaction_id)
+            # 按更新时间取最新的一条（时间相同时取后写入的）
+            if current is None or record['updated_at'] >= current['updated_at']:
+                latest[transaction_id] = record
+
+        self._latest = {
+            transaction_id: {
+                'last_price': float(record['last_price']),
+                'in_range': record['in_range'].lower() == 'true',
+                'range_type': record['range_type'] if record['range_type'] else None,
+                'last_check_time': record['last_check_time']
+            }
+            for transaction_id, record in latest.items()
+        }
+        self._signature = signature
+        return self._latest
 
     def get_status(self, transaction_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -310,58 +742,116 @@ class AlertStatusStorage(CSVStorage):
         返回:
             状态数据或 None
         """
-        records = self.read_all()
-
-        # 查找该交易 ID 的最新状态
-        transaction_records = [r for r in records if int(r['transaction_id']) == transaction_id]
-        if not transaction_records:
-            return None
-
-        # 按更新时间倒序，取最新的一条
-        transaction_records.sort(key=lambda x: x['updated_at'], reverse=True)
-        latest = transaction_records[0]
+        with self._lock:
+            status = self._load_latest().get(str(transaction_id))
+            return dict(status) if status is not None else None
 
-        return {
-            'last_price': float(latest['last_price']),
-            'in_range': latest['in_range'].lower() == 'true',
-            'range_type': latest['range_type'] if latest['range_type'] else None,
-            'last_check_time': latest['last_check_time']
-        }
-
-    def update_status(self, transaction_id: int, last_price: float, in_range: bool, range_type: str = None):
+    def update_status(self, transaction_id: int, last_price: float, in_range: bool, range_type: str = None,
+                      etf_code: str = None) -> bool:
         """
-        更新状态记录
+        更新状态记录（状态没有变化时只更新内存中的价格和检查时间）
 
         参数:
             transaction_id: 交易记录 ID
             last_price: 上次分析时的价格
             in_range: 是否在区间内
             range_type: 区间类型
+            etf_code: ETF代码
+
+        返回:
+            是否写入了新的状态记录
         """
-        record = {
-            'id': self.count() + 1,
-            'transaction_id': transaction_id,
-            'etf_code': ETF_CODE,  # 假设使用全局配置
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        status = {
             'last_price': round(last_price, 2),
-            'in_range': str(in_range).lower(),
-            'range_type': range_type if range_type else '',
-            'last_check_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'in_range': in_range,
+            'range_type': range_type if range_type else None,
+            'last_check_time': now
         }
 
-        fieldnames = [
-            'id', 'transaction_id', 'etf_code', 'last_price', 'in_range',
-            'range_type', 'last_check_time', 'updated_at'
-        ]
+        with self._lock:
+            latest = self._load_latest()
+            previous = latest.get(str(transaction_id))
+            latest[str(transaction_id)] = status
+            state = (status['in_range'], status['range_type'])
+            if previous is not None and (previous['in_range'], previous['range_type']) == state:
+                return False
+
+            record = {
+                'transaction_id': transaction_id,
+                'etf_code': etf_code or '',
+                'last_price': status['last_price'],
+                'in_range': str(in_range).lower(),
+                'range_type': range_type if range_type else '',
+                'last_check_time': now,
+                'updated_at': now
+            }
+            self.table.append_with_id(record, self.FIELDNAMES)
+            self._signature = self.table.signature()
+            return True
+
+
+class ETFListStorage:
+    """
+    ETF观察列表存储（支持动态添加/删除ETF）
+
+    列表缓存在内存中（按代码和组别索引），查询不再重复读取整张表：
+    表的版本标识变化时（如被其他进程或手工修改）重新加载，本实例写入后立即失效。
+    """
 
-        self.append(record, fieldnames)
+    FIELDNAMES = ['etf_code', 'etf_name', 'url', 'group', 'added_at']
 
+    def __init__(self, table: TableStorage = None):
+        self.table = table or create_table('etf_list')
+        # 缓存: 表的版本标识、{代码: ETF信息}、{组别: [代码, ...]}
+        self._signature: Optional[Hashable] = None
+        self._by_code: Dict[str, Dict[str, str]] = {}
+        self._by_group: Dict[Optional[str], List[str]] = {}
+        self._index_lock = threading.Lock()
 
-class ETFListStorage(CSVStorage):
-    """ETF观察列表存储（支持动态添加/删除ETF）"""
+    def exists(self) -> bool:
+        """检查观察列表是否已创建"""
+        return self.table.exists()
 
-    def __init__(self):
-        super().__init__(CSV_FILES['etf_list'])
+    def _load_index(self) -> Tuple[Dict[str, Dict[str, str]], Dict[Optional[str], List[str]]]:
+        """
+        获取索引，表变化后重新加载
+
+        返回:
+            ({代码: ETF信息}, {组别: [代码, ...]})，均为内部数据，调用方不能修改
+        """
+        with self._index_lock:
+            signature = self.table.signature()
+            if signature is not None and signature == self._signature:
+                return self._by_code, self._by_group
+
+            by_code = {}
+            raw_groups = {}
+            for record in (self.table.read_all() if signature is not None else []):
+                etf_code = record['etf_code']
+                by_code[etf_code] = {
+                    'code': etf_code,
+                    'name': record['etf_name'],
+                    'url': record['url'],
+                    'group': record.get('group', 'A股')
+                }
+                # 按原始的 group 字段分组（旧数据没有该字段时为 None，不属于任何组别）
+                raw_groups[etf_code] = record.get('group')
+
+            by_group = {}
+            for etf_code, group in raw_groups.items():
+                by_group.setdefault(group, []).append(etf_code)
+
+            self._by_code = by_code
+            self._by_group = by_group
+            self._signature = signature
+            logger.debug("加载ETF观察列表索引: {} 只", len(by_code))
+            return by_code, by_group
+
+    def _invalidate(self):
+        """本实例写入后使缓存失效（文件时间精度不足时也能读到新内容）"""
+        with self._index_lock:
+            self._signature = None
 
     def init_default_etfs(self):
         """初始化默认的16只ETF（仅在首次运行时）"""
@@ -408,8 +898,8 @@ class ETFListStorage(CSVStorage):
             'added_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
 
-        fieldnames = ['etf_code', 'etf_name', 'url', 'group', 'added_at']
-        self.append(record, fieldnames)
+        self.table.append(record, self.FIELDNAMES)
+        self._invalidate()
 
         logger.info(f"添加ETF到观察列表: {etf_code} - {etf_name} ({group})")
         return True
@@ -424,22 +914,13 @@ class ETFListStorage(CSVStorage):
         返回:
             是否删除成功
         """
-        records = self.read_all()
+        deleted = self.table.delete_where(etf_code=etf_code)
+        self._invalidate()
 
-        # 查找并删除
-        filtered_records = [r for r in records if r['etf_code'] != etf_code]
-
-        if len(filtered_records) == len(records):
+        if not deleted:
             logger.warning(f"ETF {etf_code} 不存在，无法删除")
             return False
 
-        # 重新写入文件
-        fieldnames = ['etf_code', 'etf_name', 'url', 'group', 'added_at']
-        with open(self.file_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(filtered_records)
-
         logger.info(f"从观察列表删除ETF: {etf_code}")
         return True
 
@@ -453,38 +934,49 @@ class ETFListStorage(CSVStorage):
         返回:
             {etf_code: {'code': ..., 'name': ..., 'url': ..., 'group': ...}}
         """
-        records = self.read_all()
-        result = {}
-        for record in records:
-            # 如果指定了group，只返回该组的ETF
-            if group is None or record.get('group') == group:
-                result[record['etf_code']] = {
-                    'code': record['etf_code'],
-                    'name': record['etf_name'],
-                    'url': record['url'],
-                    'group': record.get('group', 'A股')
-                }
-        return result
+        by_code, by_group = self._load_index()
+        codes = by_code.keys() if group is None else by_group.get(group, [])
+        # 返回副本，调用方修改结果不会影响缓存
+        return {etf_code: dict(by_code[etf_code]) for etf_code in codes}
+
+    def get_etf(self, etf_code: str) -> Optional[Dict[str, str]]:
+        """
+        获取单只ETF的信息
+
+        参数:
+            etf_code: ETF代码
+
+        返回:
+            {'code': ..., 'name': ..., 'url': ..., 'group': ...}，不存在时返回 None
+        """
+        info = self._load_index()[0].get(etf_code)
+        return dict(info) if info is not None else None
+
+    def get_etf_name(self, etf_code: str, default: str = None) -> Optional[str]:
+        """
+        获取ETF名称
+
+        参数:
+            etf_code: ETF代码
+            default: 不在观察列表中时的返回值
+
+        返回:
+            ETF名称
+        """
+        info = self._load_index()[0].get(etf_code)
+        return info['name'] if info is not None else default
 
     def etf_exists(self, etf_code: str) -> bool:
         """检查ETF是否已存在"""
-        records = self.read_all()
-        for record in records:
-            if record['etf_code'] == etf_code:
-                return True
-        return False
+        return etf_code in self._load_index()[0]
 
     def get_groups(self) -> List[str]:
         """获取所有组别列表"""
-        records = self.read_all()
-        groups = set()
-        for record in records:
-            groups.add(record.get('group', 'A股'))
-        return sorted(list(groups))
+        return sorted({info['group'] for info in self._load_index()[0].values()})
 
     def migrate_groups(self) -> bool:
         """为缺少group字段的旧数据添加组别（全部标记为A股）"""
-        records = self.read_all()
+        records = self.table.read_all()
         need_update = False
 
         for record in records:
@@ -494,25 +986,24 @@ class ETFListStorage(CSVStorage):
 
         if need_update:
             # 重写CSV文件，添加group列
-            fieldnames = ['etf_code', 'etf_name', 'url', 'group', 'added_at']
-            with open(self.file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(records)
+            self.table.replace_all(records, self.FIELDNAMES)
+            self._invalidate()
             logger.info("完成旧数据迁移：为缺少group字段的ETF添加组别信息")
             return True
         return False
 
     def get_etf_count(self) -> int:
         """获取ETF数量"""
-        return self.count()
+        return len(self._load_index()[0])
 
 
-class AlertHistoryStorage(CSVStorage):
+class AlertHistoryStorage:
     """提醒历史记录存储"""
 
-    def __init__(self):
-        super().__init__(CSV_FILES['alert_history'])
+    FIELDNAMES = ['id', 'transaction_id', 'alert_type', 'current_price', 'target_price', 'status', 'triggered_at']
+
+    def __init__(self, table: TableStorage = None):
+        self.table = table or create_table('alert_history')
 
     def add_alert(self, transaction_id: int, alert_type: str, current_price: float, target_price: float):
         """
@@ -525,7 +1016,6 @@ class AlertHistoryStorage(CSVStorage):
             target_price: 目标价格（交易价格）
         """
         record = {
-            'id': self.count() + 1,
             'transaction_id': transaction_id,
             'alert_type': alert_type,
             'current_price': round(current_price, 2),
@@ -534,19 +1024,28 @@ class AlertHistoryStorage(CSVStorage):
             'triggered_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
 
-        fieldnames = ['id', 'transaction_id', 'alert_type', 'current_price', 'target_price', 'status', 'triggered_at']
-        self.append(record, fieldnames)
+        self.table.append_with_id(record, self.FIELDNAMES)
 
         logger.info(f"添加提醒记录: {alert_type} - 当前价: {current_price}元")
 
 
-# 初始化全局存储实例
-price_storage = PriceHistoryStorage()
-transaction_storage = UserTransactionStorage()
-alert_status_storage = AlertStatusStorage()
-alert_history_storage = AlertHistoryStorage()
-etf_transaction_storage = ETFTransactionStorage()
-etf_list_storage = ETFListStorage()
+# 全局存储实例，首次访问时创建（导入本模块时不创建目录）
+_STORAGE_CLASSES = {
+    'price_storage': PriceHistoryStorage,
+    'transaction_storage': UserTransactionStorage,
+    'alert_status_storage': AlertStatusStorage,
+    'alert_history_storage': AlertHistoryStorage,
+    'etf_transaction_storage': ETFTransactionStorage,
+    'etf_list_storage': ETFListStorage
+}
+
+
+def __getattr__(name: str):
+    storage_class = _STORAGE_CLASSES.get(name)
+    if storage_class is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # 缓存到模块全局变量中，之后的访问不再经过 __getattr__
+    return globals().setdefault(name, storage_class())
 
 __all__ = [
     'price_storage',
@@ -555,5 +1054,7 @@ __all__ = [
     'alert_history_storage',
     'etf_transaction_storage',
     'etf_list_storage',
-    'CSVStorage'
+    'TableStorage',
+    'CSVStorage',
+    'create_table'
 ]
@@ -0,0 +1,457 @@
+"""
+SQLite 存储后端
+所有表保存在一个 SQLite 数据库中（WAL 模式），按代码、交易 ID 和时间字段建立索引，
+更新和删除只修改相关的行，范围查询使用索引而不是全表扫描
+
+- 每个线程使用独立的连接（后台刷新、asyncio.to_thread 等线程都可以直接读写）
+- 读出的行与 CSV 后端一致：值都是字符串，NULL 读出为空字符串
+- 自增 ID 在一个 BEGIN IMMEDIATE 事务中分配并写入，多个进程同时写入也不会冲突
+- 每张表有一个版本号（触发器在每次写入时递增），用于跨进程的缓存失效
+- 从 CSV 迁移: python -m src.storage_sqlite [--db 数据库文件] [--overwrite]
+"""
+import argparse
+import csv
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from src.logger import logger
+from src.storage import TableStorage
+from config.app import CSV_FILES, STORAGE_CONFIG
+
+# 表结构: 表名 -> {'columns': [(字段, 类型), ...], 'indexes': [(字段, ...), ...]}
+# 字段名与 CSV 表头一致；带自增 ID 的表以 id 作为主键
+TABLE_SCHEMAS = {
+    'price_history': {
+        'columns': [
+            ('id', 'INTEGER PRIMARY KEY'), ('etf_code', 'TEXT'), ('etf_name', 'TEXT'), ('price', 'REAL'),
+            ('record_time', 'TEXT'), ('created_at', 'TEXT')
+        ],
+        'indexes': [('etf_code', 'record_time'), ('record_time',)]
+    },
+    'user_transactions': {
+        'columns': [
+            ('id', 'INTEGER'), ('etf_code', 'TEXT'), ('transaction_price', 'REAL'), ('transaction_quantity', 'INTEGER'),
+            ('updated_at', 'TEXT')
+        ],
+        'indexes': [('etf_code',)]
+    },
+    'alert_status': {
+        'columns': [
+            ('id', 'INTEGER PRIMARY KEY'), ('transaction_id', 'INTEGER'), ('etf_code', 'TEXT'),
+            ('last_price', 'REAL'), ('in_range', 'TEXT'), ('range_type', 'TEXT'),
+            ('last_check_time', 'TEXT'), ('updated_at', 'TEXT')
+        ],
+        'indexes': [('transaction_id', 'updated_at'), ('etf_code',)]
+    },
+    'alert_history': {
+        'columns': [
+            ('id', 'INTEGER PRIMARY KEY'), ('transaction_id', 'INTEGER'), ('alert_type', 'TEXT'),
+            ('current_price', 'REAL'), ('target_price', 'REAL'), ('status', 'TEXT'), ('triggered_at', 'TEXT')
+        ],
+        'indexes': [('transaction_id', 'triggered_at'), ('triggered_at',)]
+    },
+    'etf_list': {
+        'columns': [
+            ('etf_code', 'TEXT'), ('etf_name', 'TEXT'), ('url', 'TEXT'), ('group', 'TEXT'), ('added_at', 'TEXT')
+        ],
+        'indexes': [('etf_code',), ('group',)]
+    }
+}
+
+# 迁移时每批写入的行数
+MIGRATE_BATCH_SIZE = 5000
+
+
+def _quote(name: str) -> str:
+    """给字段名和表名加引号（group 等是 SQL 关键字）"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+class SQLiteDatabase:
+    """SQLite 数据库（每个线程一个连接）"""
+
+    def __init__(self, path: str = None, timeout: float = None):
+        """
+        初始化数据库
+
+        参数:
+            path: 数据库文件路径，默认使用 STORAGE_CONFIG['sqlite_file']
+            timeout: 等待写锁的时间（秒）
+        """
+        self.path = Path(path or STORAGE_CONFIG['sqlite_file'])
+        self.timeout = timeout if timeout is not None else STORAGE_CONFIG['sqlite_timeout']
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def connection(self) -> sqlite3.Connection:
+        """获取当前线程的连接，首次使用时创建表和索引"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return conn
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=self.timeout)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        # WAL 模式下 NORMAL 不会损坏数据库，断电时最多丢失最后几次提交
+        conn.execute('PRAGMA synchronous=NORMAL')
+        with self._schema_lock:
+            if not self._schema_ready:
+                self._create_schema(conn)
+                self._schema_ready = True
+        self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection):
+        """创建表、索引、版本表和递增版本号的触发器；旧版数据库中缺少的字段用 ALTER TABLE 补上"""
+        statements = [
+            'CREATE TABLE IF NOT EXISTS table_versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL)'
+        ]
+        for table, schema in TABLE_SCHEMAS.items():
+            columns = ', '.join(f"{_quote(name)} {column_type}" for name, column_type in schema['columns'])
+            statements.append(f"CREATE TABLE IF NOT EXISTS {_quote(table)} ({columns})")
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({_quote(table)})")}
+            if existing:
+                statements.extend(
+                    f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(name)} {column_type}"
+                    for name, column_type in schema['columns'] if name not in existing
+                )
+            for fields in schema['indexes']:
+                index_name = f"idx_{table}_{'_'.join(fields)}"
+                statements.append(
+                    f"CREATE INDEX IF NOT EXISTS {_quote(index_name)} ON {_quote(table)} "
+                    f"({', '.join(_quote(field) for field in fields)})"
+                )
+            statements.append(f"INSERT OR IGNORE INTO table_versions (name, version) VALUES ('{table}', 0)")
+            for event in ('INSERT', 'UPDATE', 'DELETE'):
+                statements.append(
+                    f"CREATE TRIGGER IF NOT EXISTS {_quote(f'trg_{table}_{event.lower()}')} "
+                    f"AFTER {event} ON {_quote(table)} BEGIN "
+                    f"UPDATE table_versions SET version = version + 1 WHERE name = '{table}'; END"
+                )
+        with conn:
+            for statement in statements:
+                conn.execute(statement)
+
+    def close(self):
+        """关闭当前线程的连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+# 按文件路径共享的数据库实例
+_databases: Dict[str, SQLiteDatabase] = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(path: str = None) -> SQLiteDatabase:
+    """
+    获取数据库实例（同一文件只创建一个）
+
+    参数:
+        path: 数据库文件路径，默认使用 STORAGE_CONFIG['sqlite_file']
+    """
+    key = str(Path(path or STORAGE_CONFIG['sqlite_file']).resolve())
+    with _databases_lock:
+        database = _databases.get(key)
+        if database is None:
+            database = _databases[key] = SQLiteDatabase(path)
+        return database
+
+
+class SQLiteStorage(TableStorage):
+    """SQLite 中的一张表"""
+
+    def __init__(self, name: str, database: SQLiteDatabase = None):
+        """
+        初始化表存储
+
+        参数:
+            name: 表名（见 TABLE_SCHEMAS）
+            database: 数据库实例，默认使用配置的数据库文件
+        """
+        if name not in TABLE_SCHEMAS:
+            raise ValueError(f"未知的表: {name}")
+        self.name = name
+        self.database = database or get_database()
+        self.columns = [column for column, _ in TABLE_SCHEMAS[name]['columns']]
+        self._table = _quote(name)
+        # 本进程最后分配的 id（next_id 预先分配、还未写入的 id 不会再次分配）
+        self._last_id = 0
+        self._id_lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        return self.database.connection()
+
+    def _check_fields(self, fields: Iterable[str]) -> List[str]:
+        """检查字段名（字段名会拼接到 SQL 中，只允许表结构中的字段）"""
+        fields = list(fields)
+        unknown = [field for field in fields if field not in self.columns]
+        if unknown:
+            raise ValueError(f"表 {self.name} 没有字段: {', '.join(unknown)}")
+        return fields
+
+    def _conditions(self, conditions: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+        """生成等值条件: ([条件子句, ...], [参数, ...])"""
+        fields = self._check_fields(conditions)
+        return [f"{_quote(field)} = ?" for field in fields], [conditions[field] for field in fields]
+
+    @staticmethod
+    def _to_row(row: sqlite3.Row) -> Dict[str, str]:
+        """转换为与 CSV 后端相同的行格式（值都是字符串，NULL 为空字符串）"""
+        return {key: '' if value is None else str(value) for key, value in zip(row.keys(), row)}
+
+    @staticmethod
+    def _where(clauses: List[str]) -> str:
+        return ' WHERE ' + ' AND '.join(clauses) if clauses else ''
+
+    def _insert_sql(self, fields: List[str]) -> str:
+        return (f"INSERT INTO {self._table} ({', '.join(_quote(field) for field in fields)}) "
+                f"VALUES ({', '.join('?' for _ in fields)})")
+
+    def exists(self) -> bool:
+        """表是否写入过数据（表结构始终存在，以版本号判断，与 CSV 文件是否存在的含义一致）"""
+        return bool(self.signature())
+
+    def append(self, row: Dict[str, Any], fieldnames: List[str] = None):
+        """追加一行数据（fieldnames 仅为兼容 CSV 接口，字段以表结构为准）"""
+        fields = self._check_fields(row)
+        try:
+            with self._conn() as conn:
+                conn.execute(self._insert_sql(fields), [row[field] for field in fields])
+        except sqlite3.Error as e:
+            logger.error(f"写入 SQLite 失败: {e}")
+            raise
+
+    def read_all(self) -> List[Dict[str, Any]]:
+        """读取所有数据（按写入顺序）"""
+        rows = self._conn().execute(f"SELECT * FROM {self._table} ORDER BY rowid").fetchall()
+        return [self._to_row(row) for row in rows]
+
+    def read_last(self) -> Optional[Dict[str, Any]]:
+        """读取最后一行数据"""
+        row = self._conn().execute(f"SELECT * FROM {self._table} ORDER BY rowid DESC LIMIT 1").fetchone()
+        return self._to_row(row) if row is not None else None
+
+    def count(self) -> int:
+        """统计记录数"""
+        return self._conn().execute(f"SELECT COUNT(*) FROM {self._table}").fetchone()[0]
+
+    def replace_all(self, rows: List[Dict[str, Any]], fieldnames: List[str] = None):
+        """在一个事务中删除全部数据并写入新数据"""
+        with self._conn() as conn:
+            conn.execute(f"DELETE FROM {self._table}")
+            for row in rows:
+                fields = [field for field in row if field in self.columns]
+                conn.execute(self._insert_sql(fields), [row[field] for field in fields])
+
+    def delete(self):
+        """删除表中全部数据，版本号归零（exists() 返回 False）"""
+        with self._conn() as conn:
+            conn.execute(f"DELETE FROM {self._table}")
+            conn.execute("UPDATE table_versions SET version = 0 WHERE name = ?", (self.name,))
+        self._last_id = 0
+        logger.info(f"已清空表: {self.name}")
+
+    def signature(self) -> Optional[int]:
+        """表的版本号（每次写入递增，其他进程的写入也会反映出来），从未写入时为 0"""
+        row = self._conn().execute("SELECT version FROM table_versions WHERE name = ?", (self.name,)).fetchone()
+        return row[0] if row is not None else None
+
+    def find(self, **conditions) -> List[Dict[str, Any]]:
+        """按等值条件查询（使用索引）"""
+        clauses, params = self._conditions(conditions)
+        rows = self._conn().execute(
+            f"SELECT * FROM {self._table}{self._where(clauses)} ORDER BY rowid", params
+        ).fetchall()
+        return [self._to_row(row) for row in rows]
+
+    def find_range(self, field: str, start: Any = None, end: Any = None, descending: bool = False,
+                   limit: int = None, **conditions) -> List[Dict[str, Any]]:
+        """按字段范围查询并排序（使用 (等值字段, 范围字段) 索引，倒序时字段值相同的行后写入的在前）"""
+        self._check_fields([field])
+        clauses, params = self._conditions(conditions)
+        if start is not None:
+            clauses.append(f"{_quote(field)} >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append(f"{_quote(field)} <= ?")
+            params.append(end)
+
+        sql = f"SELECT * FROM {self._table}{self._where(clauses)}"
+        order = 'DESC' if descending else 'ASC'
+        sql += f" ORDER BY {_quote(field)} {order}, rowid {order}"
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return [self._to_row(row) for row in self._conn().execute(sql, params).fetchall()]
+
+    def upsert(self, key: str, row: Dict[str, Any], fieldnames: List[str] = None):
+        """按键字段更新已有的行，不存在时插入（在一个事务中完成）"""
+        fields = self._check_fields(row)
+        with self._conn() as conn:
+            cursor = conn.execute(
+                f"UPDATE {self._table} SET {', '.join(f'{_quote(field)} = ?' for field in fields)} "
+                f"WHERE {_quote(key)} = ?",
+                [row[field] for field in fields] + [row[key]]
+            )
+            if cursor.rowcount == 0:
+                conn.execute(self._insert_sql(fields), [row[field] for field in fields])
+
+    def delete_where(self, **conditions) -> int:
+        """删除满足全部等值条件的行"""
+        clauses, params = self._conditions(conditions)
+        with self._conn() as conn:
+            return conn.execute(f"DELETE FROM {self._table}{self._where(clauses)}", params).rowcount
+
+    def next_id(self) -> int:
+        """
+        预先分配一个自增 ID（主键索引上取最大值，同一进程内的多个线程不会拿到相同的 ID）
+
+        只在本进程内占用；新增记录请使用 append_with_id，分配和写入在同一个事务中完成。
+        """
+        with self._id_lock:
+            self._last_id = max(self._max_id(self._conn()), self._last_id) + 1
+            return self._last_id
+
+    def append_with_id(self, row: Dict[str, Any], fieldnames: List[str] = None) -> int:
+        """
+        追加一行并分配自增 ID（写入 row['id']）
+
+        BEGIN IMMEDIATE 在读取最大 id 之前就取得写锁，其他进程的写入要等本事务提交，
+        不会分配到相同的 id。
+
+        参数:
+            row: 行数据字典（不需要包含 id）
+            fieldnames: 仅为兼容 CSV 接口
+
+        返回:
+            分配的 ID
+        """
+        fields = self._check_fields([field for field in row if field != 'id'] + ['id'])
+        conn = self._conn()
+        try:
+            # 本进程内的写入先在锁上排队，不必在 SQLite 的忙等待中轮询
+            with self._id_lock:
+                conn.execute('BEGIN IMMEDIATE')
+                with conn:
+                    row['id'] = self._last_id = max(self._max_id(conn), self._last_id) + 1
+                    conn.execute(self._insert_sql(fields), [row[field] for field in fields])
+        except sqlite3.Error as e:
+            logger.error(f"写入 SQLite 失败: {e}")
+            raise
+        return row['id']
+
+    def _max_id(self, conn: sqlite3.Connection) -> int:
+        """表中最大的 id（主键索引，不扫描全表）"""
+        return conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {self._table}").fetchone()[0]
+
+
+def _convert_value(value: Optional[str], column_type: str) -> Any:
+    """CSV 中的空字符串在数值字段中存为 NULL"""
+    if value == '' and not column_type.startswith('TEXT'):
+        return None
+    return value
+
+
+def migrate_table(name: str, csv_path: str, database: SQLiteDatabase, overwrite: bool = False) -> Optional[int]:
+    """
+    把一个 CSV 文件迁移到 SQLite 表（流式读取，分批写入，在一个事务中完成）
+
+    参数:
+        name: 表名
+        csv_path: CSV 文件路径
+        database: 目标数据库
+        overwrite: 目标表已有数据时是否覆盖
+
+    返回:
+        迁移的行数，跳过时返回 None
+    """
+    path = Path(csv_path)
+    if not path.exists():
+        logger.info(f"{name}: CSV 文件不存在，跳过")
+        return None
+
+    table = SQLiteStorage(name, database)
+    existing = table.count()
+    if existing and not overwrite:
+        logger.warning(f"{name}: 目标表已有 {existing} 行数据，跳过（使用 --overwrite 覆盖）")
+        return None
+
+    column_types = dict(TABLE_SCHEMAS[name]['columns'])
+    conn = database.connection()
+    migrated = 0
+    with open(path, 'r', encoding='utf-8', newline='') as f, conn:
+        reader = csv.DictReader(f)
+        fields = [field for field in (reader.fieldnames or []) if field in column_types]
+        # 旧版观察列表没有 group 字段，与 migrate_groups 一致标记为 A股
+        add_group = name == 'etf_list' and 'group' not in fields
+        insert_fields = fields + (['group'] if add_group else [])
+        sql = table._insert_sql(insert_fields)
+
+        conn.execute(f"DELETE FROM {_quote(name)}")
+        batch = []
+        for record in reader:
+            values = [_convert_value(record.get(field), column_types[field]) for field in fields]
+            if add_group:
+                values.append('A股')
+            batch.append(values)
+            if len(batch) >= MIGRATE_BATCH_SIZE:
+                conn.executemany(sql, batch)
+                migrated += len(batch)
+                batch = []
+        if batch:
+            conn.executemany(sql, batch)
+            migrated += len(batch)
+
+    logger.info(f"{name}: 已迁移 {migrated} 行")
+    return migrated
+
+
+def migrate_csv_to_sqlite(db_path: str = None, csv_files: Dict[str, str] = None,
+                          overwrite: bool = False) -> Dict[str, Optional[int]]:
+    """
+    把全部 CSV 文件迁移到 SQLite 数据库（CSV 文件保持不变）
+
+    参数:
+        db_path: 数据库文件路径，默认使用 STORAGE_CONFIG['sqlite_file']
+        csv_files: {表名: CSV 文件路径}，默认使用 CSV_FILES
+        overwrite: 目标表已有数据时是否覆盖
+
+    返回:
+        {表名: 迁移的行数}，跳过的表为 None
+    """
+    database = get_database(db_path)
+    csv_files = csv_files or CSV_FILES
+    results = {}
+    for name in TABLE_SCHEMAS:
+        if name in csv_files:
+            results[name] = migrate_table(name, csv_files[name], database, overwrite)
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="把 CSV 数据迁移到 SQLite 数据库")
+    parser.add_argument('--db', help="数据库文件，默认使用 SQLITE_FILE 配置")
+    parser.add_argument('--overwrite', action='store_true', help="目标表已有数据时覆盖")
+    args = parser.parse_args(argv)
+
+    results = migrate_csv_to_sqlite(args.db, overwrite=args.overwrite)
+    database = get_database(args.db)
+    print(f"数据库: {database.path}")
+    for name, migrated in results.items():
+        print(f"  {name:<20}{'跳过' if migrated is None else f'{migrated} 行'}")
+    print("在 .env 中设置 STORAGE_BACKEND=sqlite 后生效")
+    return 0
+
+__all__ = ['SQLiteStorage', 'SQLiteDatabase', 'TABLE_SCHEMAS', 'get_database', 'migrate_csv_to_sqlite']
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+价格监控模块
+无界面的持续监控模式：按固定间隔轮询自选列表中的全部ETF，只处理价格或交易数据有变化的部分
+"""
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from src.logger import logger
+from src.quote import Quote
+from src.alert import check_alert_status
+from src.data_source_manager import fetch_etf_prices
+from src.storage import etf_list_storage, etf_transaction_storage, price_storage
+from config.app import WATCH_CONFIG
+
+
+class PriceWatcher:
+    """
+    价格监控器
+
+    内存中只保存上一轮的价格快照和检查提醒时使用的交易数据，两者都按当前自选列表裁剪，
+    长时间运行内存占用保持不变。提醒去重使用 alert_status 中持久化的状态，重启后不会重复提醒。
+    """
+
+    def __init__(self, interval: float = None):
+        """
+        初始化价格监控器
+
+        参数:
+            interval: 轮询间隔（秒），默认使用 WATCH_CONFIG['interval']
+        """
+        self.interval = interval or WATCH_CONFIG['interval']
+        self._snapshot: Dict[str, float] = {}
+        # 上次检查提醒时的交易数据 {ETF代码: (交易记录ID, 交易价格)}
+        self._checked_transactions: Dict[str, Tuple[int, float]] = {}
+        self._stop_event = threading.Event()
+        self.cycles = 0
+
+    def stop(self):
+        """请求停止监控（当前一轮结束后退出）"""
+        self._stop_event.set()
+
+    def run(self, max_cycles: int = None):
+        """
+        持续监控，直到调用 stop() 或达到指定轮数
+
+        每轮的开始时间按固定节拍计算；某一轮耗时超过间隔时不补跑，直接开始下一轮。
+
+        参数:
+            max_cycles: 最多运行的轮数，None 表示一直运行
+        """
+        logger.info(f"开始监控ETF价格，轮询间隔 {self.interval} 秒")
+        next_run = time.monotonic()
+
+        while not self._stop_event.is_set():
+            started = time.monotonic()
+            try:
+                self.run_cycle()
+            except Exception as e:
+                logger.error(f"监控轮询失败: {e}")
+
+            elapsed = time.monotonic() - started
+            if elapsed > self.interval:
+                logger.warning(f"本轮监控耗时 {elapsed:.1f} 秒，超过轮询间隔 {self.interval} 秒")
+
+            if max_cycles is not None and self.cycles >= max_cycles:
+                break
+
+            next_run = max(next_run + self.interval, time.monotonic())
+            self._stop_event.wait(next_run - time.monotonic())
+
+        logger.info(f"停止监控ETF价格，共运行 {self.cycles} 轮")
+
+    def run_cycle(self) -> Dict[str, float]:
+        """
+        执行一轮监控：获取最新价格、与上一轮快照比较、保存有变化的价格，
+        并对价格或交易数据有变化的ETF检查提醒
+
+        返回:
+            本轮价格有变化的ETF {ETF代码: 价格}
+        """
+        self.cycles += 1
+        watchlist = etf_list_storage.get_all_etfs()
+        self._prune(list(watchlist.keys()))
+        if not watchlist:
+            logger.info("自选列表为空，跳过本轮监控")
+            return {}
+
+        # 轮询间隔通常比行情缓存的有效期长，每轮都重新请求（休市期间仍使用收盘后的缓存）
+        results = fetch_etf_prices(list(watchlist.keys()), force_refresh=True)
+        changes = self._diff(results)
+        for etf_code, (price, name) in changes.items():
+            price_storage.add_price_record(etf_code, name, price)
+
+        transactions = self._load_transactions()
+        alerts = 0
+        for etf_code, transaction in transactions.items():
+            result = results.get(etf_code)
+            if result is None:
+                continue
+            checked = (transaction['id'], transaction['price'])
+            if etf_code not in changes and self._checked_transactions.get(etf_code) == checked:
+                continue
+            self._checked_transactions[etf_code] = checked
+            price, name = result
+            alerts += self._check_alert(etf_code, name, price, transaction)
+
+        failed = sum(1 for result in results.values() if result is None)
+        logger.info(
+            f"第 {self.cycles} 轮监控完成: {len(watchlist)} 只ETF, "
+            f"{len(changes)} 只价格变化, {alerts} 条提醒, {failed} 只获取失败"
+        )
+        return {etf_code: price for etf_code, (price, _) in changes.items()}
+
+    @staticmethod
+    def _load_transactions() -> Dict[str, Dict]:
+        """读取全部ETF的交易数据，旧版数据没有交易记录 ID 时先补上"""
+        transactions = etf_transaction_storage.get_all_etf_transactions()
+        if any(transaction['id'] is None for transaction in transactions.values()):
+            etf_transaction_storage.assign_missing_ids()
+            transactions = etf_transaction_storage.get_all_etf_transactions()
+        return transactions
+
+    def _diff(self, results: Dict[str, Optional[Quote]]) -> Dict[str, Tuple[float, str]]:
+        """
+        与上一轮快照比较，返回价格有变化（或首次获取）的ETF，并更新快照
+
+        参数:
+            results: {ETF代码: Quote 或 None}
+
+        返回:
+            {ETF代码: (价格, 名称)}
+        """
+        changes = {}
+        for etf_code, result in results.items():
+            if result is None:
+                continue
+            price, name = result
+            if self._snapshot.get(etf_code) != price:
+                self._snapshot[etf_code] = price
+                changes[etf_code] = (price, name)
+        return changes
+
+    def _prune(self, etf_codes: List[str]):
+        """移除已不在自选列表中的ETF的快照"""
+        watched = set(etf_codes)
+        for state in (self._snapshot, self._checked_transactions):
+            for etf_code in [code for code in state if code not in watched]:
+                del state[etf_code]
+
+    def _check_alert(self, etf_code: str, name: str, price: float, transaction: Dict) -> bool:
+        """
+        检查价格是否进入新的提醒区间（使用 alert.check_alert_status，按交易记录 ID 持久化去重）
+
+        参数:
+            etf_code: ETF代码
+            name: ETF名称
+            price: 当前价格
+            transaction: 交易数据 {id, code, price, quantity}
+
+        返回:
+            是否触发提醒
+        """
+        result = check_alert_status(price, transaction['price'], transaction['id'], etf_code=etf_code)
+        if not result['should_alert']:
+            return False
+
+        logger.warning(
+            f"交易提醒: {name}({etf_code}) 当前价 {price} 元，"
+            f"较上次交易价 {transaction['price']} 元 {result['current_change']:+.2f}%，"
+            f"{result['alert_reason']}: {result['matched_range']}"
+        )
+        return True
+
+
+__all__ = ['PriceWatcher']
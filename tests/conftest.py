@@ -0,0 +1,22 @@
+"""
+pytest 公共配置
+
+在导入任何项目模块之前把数据与日志目录指向临时目录，避免测试读写真实的 data/ 与 logs/。
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+_TMP_ROOT = tempfile.mkdtemp(prefix='etf_tracker_tests_')
+os.environ['DATA_DIR'] = os.path.join(_TMP_ROOT, 'data')
+os.environ['LOG_DIR'] = os.path.join(_TMP_ROOT, 'logs')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+os.environ.setdefault('LOG_ENQUEUE', 'false')
+os.environ.setdefault('DEBUG_CAPTURE_ENABLED', 'false')
+os.environ.setdefault('MARKET_HOURS_ENABLED', 'false')
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
@@ -0,0 +1,102 @@
+"""熔断器状态机"""
+
+import pytest
+
+from src import circuit_breaker
+from src.circuit_breaker import CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def make_breaker():
+    return CircuitBreaker('test', window=4, failure_threshold=0.5, min_calls=4, open_seconds=30)
+
+
+def trip(breaker):
+    for _ in range(4):
+        breaker.record(breaker.allow_request(), False)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_opens_when_failure_rate_reaches_threshold(clock):
+    breaker = make_breaker()
+    for success in (True, True, False):
+        breaker.record(breaker.allow_request(), success)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record(breaker.allow_request(), False)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow_request() is None
+
+
+def test_half_open_allows_a_single_probe(clock):
+    breaker = make_breaker()
+    trip(breaker)
+
+    clock[0] += 31
+    probe = breaker.allow_request()
+    assert probe is not None
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request() is None
+
+    breaker.record(probe, True)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.snapshot()['calls'] == 0
+
+
+def test_failed_probe_reopens(clock):
+    breaker = make_breaker()
+    trip(breaker)
+
+    clock[0] += 31
+    breaker.record(breaker.allow_request(), False)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.snapshot()['retry_in'] == pytest.approx(30)
+
+
+def test_late_result_does_not_resolve_half_open(clock):
+    breaker = make_breaker()
+    straggler = breaker.allow_request()
+    for _ in range(4):
+        breaker.record(breaker.allow_request(), False)
+
+    clock[0] += 31
+    probe = breaker.allow_request()
+
+    # 熔断前发出的请求此时才返回，不能替探测请求做决定
+    breaker.record(straggler, True)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request() is None
+
+    breaker.record(probe, False)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_late_failure_after_recovery_is_not_counted(clock):
+    breaker = make_breaker()
+    stragglers = [breaker.allow_request() for _ in range(4)]
+    trip(breaker)
+
+    clock[0] += 31
+    breaker.record(breaker.allow_request(), True)
+    for ticket in stragglers:
+        breaker.record(ticket, False)
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.snapshot()['calls'] == 0
+
+
+def test_released_probe_frees_the_slot(clock):
+    breaker = make_breaker()
+    trip(breaker)
+
+    clock[0] += 31
+    probe = breaker.allow_request()
+    breaker.release(probe)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request() is not None
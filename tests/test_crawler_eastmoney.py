@@ -0,0 +1,55 @@
+"""东方财富爬虫：secid 构造、行情解析与批量结果映射"""
+
+from src.crawler_eastmoney import EastMoneyCrawler
+from src.secid_cache import SecidCache
+
+
+def make_crawler(tmp_path):
+    secids = SecidCache(file_path=str(tmp_path / 'secid_cache.json'))
+    secids.set('SCHD', '107', persist=False)
+    return EastMoneyCrawler(secids=secids)
+
+
+def test_pure_code_strips_a_share_prefix_and_uppercases_us_codes():
+    assert EastMoneyCrawler._get_pure_code('SZ159915') == '159915'
+    assert EastMoneyCrawler._get_pure_code('sh510300') == '510300'
+    assert EastMoneyCrawler._get_pure_code('schd') == 'SCHD'
+
+
+def test_lowercase_us_code_builds_uppercase_secid(tmp_path):
+    assert make_crawler(tmp_path)._get_secid('schd') == '107.SCHD'
+
+
+def test_batch_maps_results_back_to_lowercase_codes(tmp_path, monkeypatch):
+    crawler = make_crawler(tmp_path)
+    requested = []
+
+    def fake_request_batch(secids):
+        requested.extend(secids)
+        return {'rc': 0, 'data': {'diff': [
+            {'f2': 80.12, 'f12': 'SCHD', 'f13': 107},
+            {'f2': 2.345, 'f12': '159915', 'f13': 0},
+        ]}}
+
+    monkeypatch.setattr(crawler, '_request_batch', fake_request_batch)
+    monkeypatch.setattr(crawler, '_get_etf_name', lambda code: code)
+
+    results = crawler.fetch_prices_batch(['schd', 'SZ159915'])
+
+    assert requested == ['107.SCHD', '0.159915']
+    assert results['schd'].price == 80.12
+    assert results['schd'].code == 'schd'
+    assert results['SZ159915'].price == 2.345
+
+
+def test_single_quote_is_parsed_from_requested_fields_only(tmp_path):
+    fields = EastMoneyCrawler.QUOTE_FIELDS.split(',')
+    values = {'f43': 2345, 'f44': 2360, 'f45': 2330, 'f46': 2340, 'f47': 1200, 'f48': 281400.0,
+              'f60': 2333, 'f86': 1760598003, 'f19': 2344, 'f39': 2346}
+    assert sorted(fields) == sorted(values)
+
+    quote = make_crawler(tmp_path)._parse_quote_from_api({'rc': 0, 'data': values}, 'SZ159915', '创业板ETF')
+
+    assert (quote.price, quote.name) == (2.345, '创业板ETF')
+    assert (quote.high, quote.low, quote.open, quote.prev_close) == (2.36, 2.33, 2.34, 2.333)
+    assert (quote.bid, quote.ask, quote.volume, quote.timestamp) == (2.344, 2.346, 120000, 1760598003)
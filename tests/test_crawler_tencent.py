@@ -0,0 +1,60 @@
+"""腾讯财经爬虫：美股ETF（含观察列表"美股"组）走 Yahoo Finance"""
+
+import asyncio
+
+import pytest
+
+from src import storage
+from src.crawler_tencent import TencentCrawler
+from src.quote import Quote
+from src.storage import CSVStorage, ETFListStorage
+
+
+@pytest.fixture
+def crawler(tmp_path, monkeypatch):
+    etf_list = ETFListStorage(CSVStorage(str(tmp_path / 'etf_list.csv')))
+    etf_list.add_etf('VOO', 'Vanguard S&P 500 ETF', '', '美股')
+    etf_list.add_etf('SZ159915', '创业板ETF', '', 'A股')
+    monkeypatch.setattr(storage, 'etf_list_storage', etf_list, raising=False)
+
+    crawler = TencentCrawler()
+    requests = {'yahoo': [], 'tencent': []}
+
+    def fetch_from_yahoo(etf_code):
+        requests['yahoo'].append(etf_code)
+        return Quote(etf_code, etf_code, 500.0, source='yahoo')
+
+    async def fetch_from_yahoo_async(etf_code):
+        return fetch_from_yahoo(etf_code)
+
+    def request_text(url):
+        requests['tencent'].append(url)
+        return None
+
+    monkeypatch.setattr(crawler, '_fetch_from_yahoo', fetch_from_yahoo)
+    monkeypatch.setattr(crawler, '_fetch_from_yahoo_async', fetch_from_yahoo_async)
+    monkeypatch.setattr(crawler, '_request_text', request_text)
+    crawler.requests = requests
+    return crawler
+
+
+def test_us_detection_includes_watchlist_group(crawler):
+    assert crawler._is_us_etf('SCHD')
+    assert crawler._is_us_etf('voo')
+    assert not crawler._is_us_etf('SZ159915')
+
+
+def test_group_only_us_code_uses_yahoo_in_single_fetch(crawler):
+    assert crawler.fetch_price_sync('VOO').price == 500.0
+    assert crawler.requests == {'yahoo': ['VOO'], 'tencent': []}
+
+
+def test_group_only_us_code_uses_yahoo_in_async_fetch(crawler):
+    assert asyncio.run(crawler.fetch_price_async('VOO')).price == 500.0
+    assert crawler.requests == {'yahoo': ['VOO'], 'tencent': []}
+
+
+def test_a_share_code_still_uses_tencent(crawler):
+    assert crawler.fetch_price_sync('SZ159915') is None
+    assert crawler.requests['yahoo'] == []
+    assert crawler.requests['tencent'][0].endswith('=sz159915')
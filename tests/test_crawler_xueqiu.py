@@ -0,0 +1,55 @@
+"""雪球页面解析：内嵌行情对象的快速解析与 DOM 解析兜底"""
+
+from pathlib import Path
+
+from src.crawler import XueqiuCrawler
+
+SAMPLE_PAGE = Path(__file__).resolve().parent.parent / 'benchmarks' / 'pages' / 'synthetic_SZ159915.html'
+
+
+def test_current_outside_quote_object_is_ignored():
+    html = """
+    <script>
+      SNB.data.index = {"symbol": "SZ399006", "current": 2134.56};
+      SNB.data.related = [{"symbol": "SH510300", "current": 3.912}];
+      SNB.data.quote = {"symbol": "SZ159915", "name": "创业板ETF", "current": 2.154, "percent": 1.27};
+    </script>
+    """
+    assert XueqiuCrawler()._parse_price_fast(html, 'SZ159915') == 2.154
+
+
+def test_quote_object_of_another_symbol_is_skipped():
+    html = """
+    <script>
+      window.related = {quote: {"symbol": "SH510300", "current": 3.912}};
+      SNB = {data: {"quote": {"symbol": "SZ159915", "current": "2.154"}}};
+    </script>
+    """
+    assert XueqiuCrawler()._parse_price_fast(html, 'sz159915') == 2.154
+
+
+def test_unquoted_keys_inside_quote_object():
+    html = '<script>SNB = {data: {quote: { symbol: "SZ159915", current: "2.154" }}};</script>'
+    assert XueqiuCrawler()._parse_price_fast(html, 'SZ159915') == 2.154
+
+
+def test_page_without_quote_object_has_no_fast_price():
+    html = '<script>var chart = {"current": 99.5};</script>'
+    assert XueqiuCrawler()._parse_price_fast(html, 'SZ159915') is None
+
+
+def test_falls_back_to_dom_when_no_embedded_quote():
+    html = """
+    <html><body>
+      <div class="stock-info"><span class="stock-symbol">SZ159915</span> <span class="stock-current">2.154</span></div>
+    </body></html>
+    """
+    crawler = XueqiuCrawler()
+    assert crawler._parse_price_fast(html, 'SZ159915') is None
+    assert crawler.parse_price(html, 'SZ159915') == 2.154
+
+
+def test_sample_page_fast_and_dom_agree():
+    html = SAMPLE_PAGE.read_text(encoding='utf-8')
+    crawler = XueqiuCrawler()
+    assert crawler.parse_price(html, 'SZ159915') == crawler._parse_price_dom(html, 'SZ159915') == 2.154
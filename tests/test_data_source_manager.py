@@ -0,0 +1,138 @@
+"""数据源管理器：批量获取、逐只重试与行情缓存"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.data_source_manager import ETFDataSourceManager
+from src.quote import Quote
+
+
+class FakeCrawler:
+    """按预设价格返回行情的爬虫，记录每次调用"""
+
+    def __init__(self, source, batch_prices=None, single_prices=None, delay=0.0, batch_delay=0.0):
+        self.source = source
+        self.batch_prices = batch_prices or {}
+        self.single_prices = single_prices or {}
+        self.delay = delay
+        self.batch_delay = batch_delay
+        self.batch_calls = []
+        self.single_calls = []
+
+    def _quote(self, etf_code, price):
+        return Quote(etf_code, f'{self.source}-{etf_code}', price, source=self.source) if price else None
+
+    def _is_us_etf(self, etf_code):
+        return False
+
+    def fetch_prices_batch(self, etf_codes):
+        self.batch_calls.append(list(etf_codes))
+        time.sleep(self.batch_delay)
+        return {code: self._quote(code, self.batch_prices.get(code)) for code in etf_codes}
+
+    def fetch_price_sync(self, etf_code):
+        self.single_calls.append(etf_code)
+        return self._quote(etf_code, self.single_prices.get(etf_code))
+
+    async def fetch_price_async(self, etf_code):
+        self.single_calls.append(etf_code)
+        await asyncio.sleep(self.delay)
+        return self._quote(etf_code, self.single_prices.get(etf_code))
+
+
+@pytest.fixture
+def manager():
+    manager = ETFDataSourceManager()
+    manager.hedge_enabled = False
+    manager.market_hours_enabled = False
+    yield manager
+    manager.close()
+
+
+def install(manager, tencent, eastmoney):
+    manager._tencent_crawler = tencent
+    manager._eastmoney_crawler = eastmoney
+
+
+def test_batch_falls_back_to_eastmoney_then_per_code(manager):
+    tencent = FakeCrawler('tencent', batch_prices={'SZ159915': 2.1})
+    eastmoney = FakeCrawler('eastmoney', batch_prices={'SH510300': 3.9}, single_prices={'SH512880': 1.05})
+    install(manager, tencent, eastmoney)
+
+    results = manager.fetch_prices_batch(['SZ159915', 'SH510300', 'SH512880'])
+
+    assert {code: quote.price for code, quote in results.items()} == {
+        'SZ159915': 2.1, 'SH510300': 3.9, 'SH512880': 1.05
+    }
+    assert eastmoney.batch_calls == [['SH510300', 'SH512880']]
+    # 逐只重试只针对两个批量接口都没有拿到的代码
+    assert tencent.single_calls == ['SH512880']
+    assert eastmoney.single_calls == ['SH512880']
+
+
+def test_batch_without_fallback_skips_retries(manager):
+    tencent = FakeCrawler('tencent')
+    eastmoney = FakeCrawler('eastmoney', batch_prices={'SZ159915': 2.1})
+    install(manager, tencent, eastmoney)
+
+    assert manager.fetch_prices_batch(['SZ159915'], use_fallback=False) == {'SZ159915': None}
+    assert eastmoney.batch_calls == []
+    assert tencent.single_calls == []
+
+
+def test_cached_prices_are_served_without_request(manager):
+    tencent = FakeCrawler('tencent', batch_prices={'SZ159915': 2.1})
+    install(manager, tencent, FakeCrawler('eastmoney'))
+
+    manager.fetch_prices_cached(['SZ159915'])
+    results = manager.fetch_prices_cached(['SZ159915'])
+
+    assert results['SZ159915'].price == 2.1
+    assert len(tencent.batch_calls) == 1
+
+
+def test_hedged_batch_races_slow_primary(manager, monkeypatch):
+    tencent = FakeCrawler('tencent', batch_prices={'SZ159915': 2.1, 'SH510300': 3.8}, batch_delay=0.5)
+    eastmoney = FakeCrawler('eastmoney', batch_prices={'SZ159915': 2.2, 'SH510300': 3.9})
+    install(manager, tencent, eastmoney)
+    manager.hedge_enabled = True
+    monkeypatch.setattr(manager, '_hedge_delay', lambda source, batch=False: 0.05)
+
+    started = time.perf_counter()
+    results = manager.fetch_prices_batch(['SZ159915', 'SH510300'])
+
+    assert time.perf_counter() - started < 0.4
+    assert {code: quote.source for code, quote in results.items()} == {
+        'SZ159915': 'eastmoney', 'SH510300': 'eastmoney'
+    }
+    assert eastmoney.batch_calls == [['SZ159915', 'SH510300']]
+
+
+def test_hedged_batch_merges_partial_results(manager, monkeypatch):
+    tencent = FakeCrawler('tencent', batch_prices={'SZ159915': 2.1, 'SH510300': 3.8}, batch_delay=0.2)
+    eastmoney = FakeCrawler('eastmoney', batch_prices={'SZ159915': 2.2})
+    install(manager, tencent, eastmoney)
+    manager.hedge_enabled = True
+    monkeypatch.setattr(manager, '_hedge_delay', lambda source, batch=False: 0.05)
+
+    results = manager.fetch_prices_batch(['SZ159915', 'SH510300'])
+
+    # 东方财富先返回但缺少 SH510300，由随后返回的腾讯财经补齐
+    assert results['SZ159915'].source == 'eastmoney'
+    assert results['SH510300'].source == 'tencent'
+
+
+def test_hedged_batch_fast_primary_uses_plain_fallback(manager, monkeypatch):
+    tencent = FakeCrawler('tencent', batch_prices={'SZ159915': 2.1})
+    eastmoney = FakeCrawler('eastmoney', batch_prices={'SH510300': 3.9})
+    install(manager, tencent, eastmoney)
+    manager.hedge_enabled = True
+    monkeypatch.setattr(manager, '_hedge_delay', lambda source, batch=False: 1.0)
+
+    results = manager.fetch_prices_batch(['SZ159915', 'SH510300'])
+
+    assert results['SZ159915'].source == 'tencent'
+    assert results['SH510300'].source == 'eastmoney'
+    assert eastmoney.batch_calls == [['SH510300']]
@@ -0,0 +1,39 @@
+"""HTTP客户端注册表：后台事件循环与异步客户端复用"""
+
+import threading
+
+import pytest
+
+from src.http_client import HTTPClientRegistry
+
+
+async def current_client(registry):
+    return registry.get_async_client('https://example.com/path')
+
+
+def test_async_client_is_reused_across_run_calls():
+    registry = HTTPClientRegistry()
+    try:
+        first = registry.run(current_client(registry))
+        second = registry.run(current_client(registry))
+        assert first is second
+        assert not first.is_closed
+    finally:
+        registry.close()
+
+    assert first.is_closed
+    assert not any(thread.name == 'http-event-loop' for thread in threading.enumerate())
+
+
+def test_run_propagates_exceptions():
+    async def fail():
+        raise ValueError('boom')
+
+    registry = HTTPClientRegistry()
+    try:
+        with pytest.raises(ValueError):
+            registry.run(fail())
+        # 事件循环在异常后仍然可用
+        assert registry.run(current_client(registry)) is not None
+    finally:
+        registry.close()
@@ -0,0 +1,45 @@
+"""Quote 与旧的 (价格, 名称) 元组保持兼容"""
+
+from src.quote import Quote
+
+
+def make_quote(**kwargs):
+    fields = {'code': '510300', 'name': '沪深300ETF', 'price': 3.9, 'prev_close': 3.8, 'source': 'tencent'}
+    fields.update(kwargs)
+    return Quote(**fields)
+
+
+def test_unpacks_as_price_and_name():
+    price, name = make_quote()
+    assert (price, name) == (3.9, '沪深300ETF')
+
+
+def test_indexing_and_len_match_tuple():
+    quote = make_quote()
+    assert quote[0] == 3.9
+    assert quote[1] == '沪深300ETF'
+    assert quote[-1] == '沪深300ETF'
+    assert quote[:] == (3.9, '沪深300ETF')
+    assert len(quote) == 2
+    assert tuple(quote) == (3.9, '沪深300ETF')
+
+
+def test_equals_tuple_and_quote():
+    quote = make_quote()
+    assert quote == (3.9, '沪深300ETF')
+    assert quote == make_quote()
+    assert quote != make_quote(source='eastmoney')
+    assert quote != (3.8, '沪深300ETF')
+
+
+def test_replace_returns_modified_copy():
+    quote = make_quote()
+    renamed = quote.replace(code='SCHD', name='Schwab US Dividend Equity ETF')
+
+    assert (renamed.code, renamed.name, renamed.price) == ('SCHD', 'Schwab US Dividend Equity ETF', 3.9)
+    assert (quote.code, quote.name) == ('510300', '沪深300ETF')
+
+
+def test_change_rate():
+    assert round(make_quote().change_rate, 4) == round((3.9 - 3.8) / 3.8 * 100, 4)
+    assert make_quote(prev_close=None).change_rate is None
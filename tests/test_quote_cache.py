@@ -0,0 +1,91 @@
+"""行情缓存的新鲜期、过期可用期和容量淘汰"""
+
+import time
+
+from src.quote import Quote
+from src.quote_cache import QuoteCache
+
+
+def make_cache(**kwargs):
+    options = {'ttl': 10, 'stale_ttl': 50, 'max_size': 100}
+    options.update(kwargs)
+    return QuoteCache(**options)
+
+
+def test_fresh_entry():
+    cache = make_cache()
+    cache.set('510300', 3.9, '沪深300ETF', 'tencent')
+
+    entry = cache.get('510300')
+    assert entry['price'] == 3.9
+    assert entry['source'] == 'tencent'
+    assert cache.is_fresh(entry)
+    assert cache.is_usable(entry)
+
+
+def test_stale_entry_is_usable_but_not_fresh():
+    cache = make_cache()
+    cache.set('510300', 3.9, '沪深300ETF', 'tencent', fetched_at=time.time() - 30)
+
+    entry = cache.get('510300')
+    assert not cache.is_fresh(entry)
+    assert cache.is_usable(entry)
+
+
+def test_entry_past_stale_window_is_unusable():
+    cache = make_cache()
+    cache.set('510300', 3.9, '沪深300ETF', 'tencent', fetched_at=time.time() - 61)
+
+    entry = cache.get('510300')
+    assert not cache.is_fresh(entry)
+    assert not cache.is_usable(entry)
+
+
+def test_zero_ttl_means_always_refetch():
+    cache = make_cache(ttl=0, stale_ttl=0)
+    cache.set('510300', 3.9, '沪深300ETF', 'tencent', fetched_at=time.time() - 0.01)
+
+    entry = cache.get('510300')
+    assert not cache.is_fresh(entry)
+    assert not cache.is_usable(entry)
+
+
+def test_missing_entry_returns_none():
+    assert make_cache().get('510300') is None
+
+
+def test_get_returns_copy():
+    cache = make_cache()
+    cache.set('510300', 3.9, '沪深300ETF', 'tencent')
+
+    cache.get('510300')['price'] = 0
+    assert cache.get('510300')['price'] == 3.9
+
+
+def test_set_builds_quote_when_missing():
+    cache = make_cache()
+    cache.set('510300', 3.9, '沪深300ETF', 'tencent')
+
+    quote = cache.get('510300')['quote']
+    assert isinstance(quote, Quote)
+    assert (quote.code, quote.price, quote.source) == ('510300', 3.9, 'tencent')
+
+
+def test_evicts_least_recently_used_when_full():
+    cache = make_cache(max_size=2)
+    cache.set('510300', 3.9, '沪深300ETF', 'tencent')
+    cache.set('510500', 5.8, '中证500ETF', 'tencent')
+    cache.get('510300')
+    cache.set('159915', 2.1, '创业板ETF', 'tencent')
+
+    assert len(cache) == 2
+    assert cache.get('510500') is None
+    assert cache.get('510300') is not None
+    assert cache.get('159915') is not None
+
+
+def test_clear():
+    cache = make_cache()
+    cache.set('510300', 3.9, '沪深300ETF', 'tencent')
+    cache.clear()
+    assert len(cache) == 0
@@ -0,0 +1,106 @@
+"""按主机令牌桶限流"""
+
+import asyncio
+
+import pytest
+
+from src import rate_limiter
+from src.rate_limiter import RateLimiter, TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(rate_limiter.time, 'monotonic', lambda: now[0])
+    monkeypatch.setattr(rate_limiter.time, 'sleep', sleep)
+    return now, sleeps
+
+
+def test_burst_then_waits_for_refill(clock):
+    now, sleeps = clock
+    bucket = TokenBucket(rate=2, burst=3)
+
+    assert [bucket._reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket._reserve() == pytest.approx(0.5)
+    # 预定的令牌排队，下一个请求要再多等一个补充周期
+    assert bucket._reserve() == pytest.approx(1.0)
+
+    now[0] += 1.0
+    assert bucket._reserve() == pytest.approx(0.5)
+
+
+def test_refill_is_capped_at_capacity(clock):
+    now, _ = clock
+    bucket = TokenBucket(rate=10, burst=2)
+    now[0] += 60
+
+    assert [bucket._reserve() for _ in range(2)] == [0.0, 0.0]
+    assert bucket._reserve() == pytest.approx(0.1)
+
+
+def test_acquire_sleeps_for_reserved_wait(clock):
+    _, sleeps = clock
+    bucket = TokenBucket(rate=4, burst=1)
+
+    bucket.acquire()
+    bucket.acquire()
+
+    assert sleeps == [pytest.approx(0.25)]
+
+
+def test_acquire_async_waits_without_blocking(clock, monkeypatch):
+    waits = []
+
+    async def fake_sleep(seconds):
+        waits.append(seconds)
+
+    monkeypatch.setattr(rate_limiter.asyncio, 'sleep', fake_sleep)
+    bucket = TokenBucket(rate=1, burst=1)
+
+    async def main():
+        await bucket.acquire_async()
+        await bucket.acquire_async()
+
+    asyncio.run(main())
+    assert waits == [pytest.approx(1.0)]
+
+
+@pytest.mark.parametrize('rate', [0, -1])
+def test_non_positive_rate_disables_limiting(clock, rate):
+    _, sleeps = clock
+    bucket = TokenBucket(rate=rate, burst=0)
+
+    for _ in range(100):
+        assert bucket._reserve() == 0.0
+        bucket.acquire()
+    assert sleeps == []
+
+
+def test_buckets_are_per_host(clock):
+    limiter = RateLimiter(rate=1, burst=1, host_limits={'qt.gtimg.cn': (0, 1)})
+
+    a = limiter.bucket('https://push2.eastmoney.com/api/qt/stock/get?secid=1.510300')
+    b = limiter.bucket('https://push2.eastmoney.com/api/qt/ulist.np/get')
+    c = limiter.bucket('https://query1.finance.yahoo.com/v8/finance/chart/SCHD')
+    assert a is b
+    assert a is not c
+
+    assert a._reserve() == 0.0
+    assert c._reserve() == 0.0
+    assert a._reserve() == pytest.approx(1.0)
+
+    tencent = limiter.bucket('https://qt.gtimg.cn/q=sh510300')
+    assert tencent.rate == 0
+    assert all(tencent._reserve() == 0.0 for _ in range(10))
+
+
+def test_zero_default_rate_is_not_replaced_by_config():
+    limiter = RateLimiter(rate=0, burst=0, host_limits={})
+    assert limiter.rate == 0
+    assert limiter.bucket('https://example.com/')._reserve() == 0.0
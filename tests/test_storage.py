@@ -0,0 +1,132 @@
+"""CSV 存储：自增 ID 分配与追加写入"""
+
+import threading
+
+from src.storage import CSVStorage, ETFTransactionStorage, PriceHistoryStorage
+
+FIELDS = ['id', 'etf_code', 'price']
+
+
+def make_row(code='SZ159915', price=1.0):
+    return {'etf_code': code, 'price': price}
+
+
+def test_ids_continue_after_reopen(tmp_path):
+    path = tmp_path / 'prices.csv'
+    table = CSVStorage(str(path))
+    assert [table.append_with_id(make_row(), FIELDS) for _ in range(3)] == [1, 2, 3]
+
+    # 模拟进程重启：新实例只能从文件得到已用过的 ID
+    reopened = CSVStorage(str(path))
+    assert reopened.append_with_id(make_row(), FIELDS) == 4
+    assert [row['id'] for row in reopened.read_all()] == ['1', '2', '3', '4']
+
+
+def test_out_of_order_rows_do_not_reuse_ids(tmp_path):
+    path = tmp_path / 'prices.csv'
+    table = CSVStorage(str(path))
+    first, second = table.next_id(), table.next_id()
+    table.append({'id': second, **make_row()}, FIELDS)
+    table.append({'id': first, **make_row()}, FIELDS)
+
+    assert CSVStorage(str(path)).next_id() == 3
+
+
+def test_foreign_append_is_seen(tmp_path):
+    path = tmp_path / 'prices.csv'
+    table = CSVStorage(str(path))
+    table.append_with_id(make_row(), FIELDS)
+
+    # 另一个进程（另一个实例）追加了更大的 ID
+    other = CSVStorage(str(path))
+    other.append({'id': 10, **make_row()}, FIELDS)
+
+    assert table.append_with_id(make_row(), FIELDS) == 11
+
+
+def test_truncated_last_line_is_not_merged_with_next_row(tmp_path):
+    path = tmp_path / 'prices.csv'
+    table = CSVStorage(str(path))
+    table.append_with_id(make_row(), FIELDS)
+    # 模拟进程在写入一行的中途崩溃
+    with open(path, 'ab') as f:
+        f.write(b'2,SZ1599')
+
+    reopened = CSVStorage(str(path))
+    assert reopened.append_with_id(make_row('SH510300', 2.0), FIELDS) == 3
+    rows = reopened.read_all()
+    assert rows[-1] == {'id': '3', 'etf_code': 'SH510300', 'price': '2.0'}
+
+
+def test_concurrent_appends_are_written_in_id_order(tmp_path):
+    table = CSVStorage(str(tmp_path / 'prices.csv'))
+
+    def worker():
+        for _ in range(50):
+            table.append_with_id(make_row(), FIELDS)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [int(row['id']) for row in table.read_all()] == list(range(1, 201))
+
+
+def test_rewritten_file_is_rescanned(tmp_path):
+    table = CSVStorage(str(tmp_path / 'prices.csv'))
+    for _ in range(3):
+        table.append_with_id(make_row(), FIELDS)
+    table.replace_all([{'id': 7, **make_row()}], FIELDS)
+
+    assert table.append_with_id(make_row(), FIELDS) == 8
+
+
+def test_price_history_records_get_ids(tmp_path):
+    storage = PriceHistoryStorage(CSVStorage(str(tmp_path / 'price_history.csv')))
+    first = storage.add_price_record('SZ159915', '创业板ETF', 2.345)
+    second = storage.add_price_record('SZ159915', '创业板ETF', 2.351)
+
+    assert (first['id'], second['id']) == (1, 2)
+    assert storage.get_latest_price() == 2.35
+
+
+LEGACY_TRANSACTIONS = (
+    'etf_code,transaction_price,transaction_quantity,updated_at\r\n'
+    'SH510300,3.9,2000,2024-01-01 10:00:00\r\n'
+)
+
+
+def test_append_upgrades_legacy_header(tmp_path):
+    path = tmp_path / 'legacy.csv'
+    path.write_text('etf_code,price\r\nSH510300,3.9\r\n', encoding='utf-8')
+    table = CSVStorage(str(path))
+
+    assert table.append_with_id(make_row(), FIELDS) == 1
+    assert path.read_text(encoding='utf-8').splitlines()[0] == 'id,etf_code,price'
+    assert table.read_all() == [
+        {'id': '', 'etf_code': 'SH510300', 'price': '3.9'},
+        {'id': '1', 'etf_code': 'SZ159915', 'price': '1.0'},
+    ]
+
+
+def test_saving_transaction_to_legacy_file_assigns_ids_first(tmp_path):
+    path = tmp_path / 'user_transactions.csv'
+    path.write_text(LEGACY_TRANSACTIONS, encoding='utf-8')
+    storage = ETFTransactionStorage(CSVStorage(str(path)))
+
+    assert storage.save_etf_transaction('SZ159915', 2.0, 1000) == 2
+    assert storage.get_all_etf_transactions() == {
+        'SH510300': {'id': 1, 'code': 'SH510300', 'price': 3.9, 'quantity': 2000},
+        'SZ159915': {'id': 2, 'code': 'SZ159915', 'price': 2.0, 'quantity': 1000},
+    }
+
+
+def test_updating_transaction_in_legacy_file(tmp_path):
+    path = tmp_path / 'user_transactions.csv'
+    path.write_text(LEGACY_TRANSACTIONS, encoding='utf-8')
+    storage = ETFTransactionStorage(CSVStorage(str(path)))
+
+    assert storage.save_etf_transaction('SH510300', 4.0, 3000) == 2
+    assert storage.get_etf_transaction('SH510300') == {'id': 2, 'code': 'SH510300', 'price': 4.0, 'quantity': 3000}
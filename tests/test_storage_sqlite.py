@@ -0,0 +1,168 @@
+"""SQLite 存储后端：后端切换、自增 ID、CSV 迁移以及与 CSV 后端的一致性"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from config.app import STORAGE_CONFIG
+from src.storage import (
+    AlertHistoryStorage, CSVStorage, ETFListStorage, ETFTransactionStorage, PriceHistoryStorage, create_table
+)
+from src.storage_sqlite import SQLiteDatabase, SQLiteStorage, migrate_csv_to_sqlite
+
+PRICE_FIELDS = PriceHistoryStorage.FIELDNAMES
+# 与写入时间有关的字段，两个后端的取值可能相差一秒，比较时去掉
+TIME_FIELDS = {'record_time', 'created_at', 'updated_at', 'added_at', 'triggered_at', 'last_check_time'}
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = SQLiteDatabase(str(tmp_path / 'etf_tracker.db'))
+    yield database
+    database.close()
+
+
+def without_time(rows):
+    return [{key: value for key, value in row.items() if key not in TIME_FIELDS} for row in rows]
+
+
+def test_create_table_follows_backend_setting(monkeypatch):
+    assert isinstance(create_table('price_history', 'csv'), CSVStorage)
+    assert isinstance(create_table('price_history', 'sqlite'), SQLiteStorage)
+
+    monkeypatch.setitem(STORAGE_CONFIG, 'backend', 'sqlite')
+    assert isinstance(create_table('etf_list'), SQLiteStorage)
+
+    with pytest.raises(ValueError):
+        create_table('etf_list', 'mysql')
+
+
+def test_append_with_id_is_sequential(database):
+    table = SQLiteStorage('price_history', database)
+    ids = [table.append_with_id({'etf_code': 'SZ159915', 'price': 1.0}) for _ in range(3)]
+    assert ids == [1, 2, 3]
+
+
+def test_append_with_id_respects_reserved_ids(database):
+    table = SQLiteStorage('price_history', database)
+    reserved = table.next_id()
+    assert table.append_with_id({'etf_code': 'SZ159915', 'price': 1.0}) == reserved + 1
+
+
+def test_two_connections_never_share_an_id(tmp_path):
+    # 两个数据库实例各自有连接，相当于两个进程写同一个文件
+    path = str(tmp_path / 'shared.db')
+    first = SQLiteStorage('alert_history', SQLiteDatabase(path))
+    second = SQLiteStorage('alert_history', SQLiteDatabase(path))
+
+    ids = []
+    for _ in range(5):
+        ids.append(first.append_with_id({'transaction_id': 1, 'alert_type': 'x'}))
+        ids.append(second.append_with_id({'transaction_id': 1, 'alert_type': 'x'}))
+
+    assert ids == list(range(1, 11))
+
+
+def test_concurrent_threads_get_unique_ids(database):
+    table = SQLiteStorage('price_history', database)
+
+    def worker():
+        for _ in range(25):
+            table.append_with_id({'etf_code': 'SZ159915', 'price': 1.0})
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [int(row['id']) for row in table.read_all()] == list(range(1, 101))
+
+
+def test_rows_are_returned_as_strings(database):
+    table = SQLiteStorage('price_history', database)
+    table.append_with_id({'etf_code': 'SZ159915', 'etf_name': None, 'price': 2.35})
+
+    assert table.read_last() == {
+        'id': '1', 'etf_code': 'SZ159915', 'etf_name': '', 'price': '2.35', 'record_time': '', 'created_at': ''
+    }
+
+
+def test_migrate_csv_to_sqlite(tmp_path, database):
+    price_csv = CSVStorage(str(tmp_path / 'price_history.csv'))
+    for price in (1.0, 1.1):
+        price_csv.append_with_id({'etf_code': 'SZ159915', 'etf_name': '创业板ETF', 'price': price,
+                                  'record_time': '2024-01-02 10:00:00', 'created_at': ''}, PRICE_FIELDS)
+    # 旧版观察列表没有 group 列
+    legacy_list = CSVStorage(str(tmp_path / 'etf_list.csv'))
+    legacy_list.append({'etf_code': 'SZ159915', 'etf_name': '创业板ETF', 'url': '', 'added_at': ''},
+                       ['etf_code', 'etf_name', 'url', 'added_at'])
+    csv_files = {'price_history': str(price_csv.file_path), 'etf_list': str(legacy_list.file_path),
+                 'alert_history': str(tmp_path / 'missing.csv')}
+
+    results = migrate_csv_to_sqlite(str(database.path), csv_files)
+
+    assert results == {'price_history': 2, 'alert_history': None, 'etf_list': 1}
+    prices = SQLiteStorage('price_history', database)
+    assert without_time(prices.read_all()) == without_time(price_csv.read_all())
+    assert SQLiteStorage('etf_list', database).read_all()[0]['group'] == 'A股'
+    # 迁移后继续分配的 ID 接在已有数据之后
+    assert prices.append_with_id({'etf_code': 'SZ159915', 'price': 1.2}) == 3
+
+    # 目标表已有数据时默认跳过，--overwrite 时覆盖
+    assert migrate_csv_to_sqlite(str(database.path), csv_files)['price_history'] is None
+    assert migrate_csv_to_sqlite(str(database.path), csv_files, overwrite=True)['price_history'] == 2
+
+
+def run_scenario(make_table):
+    """在指定后端上执行同一组业务操作，返回各存储类的输出"""
+    prices = PriceHistoryStorage(make_table('price_history'))
+    prices.add_price_record('SZ159915', '创业板ETF', 2.345)
+    prices.add_price_record('SH510300', '沪深300ETF', 3.9)
+
+    transactions = ETFTransactionStorage(make_table('user_transactions'))
+    transactions.save_etf_transaction('SZ159915', 2.1, 1000)
+    transactions.save_etf_transaction('SZ159915', 2.2, 500)
+    transactions.save_etf_transaction('SH510300', 3.8, 200)
+
+    etf_list = ETFListStorage(make_table('etf_list'))
+    etf_list.add_etf('SZ159915', '创业板ETF', 'https://example.com/159915', 'A股')
+    etf_list.add_etf('SCHD', 'Schwab US Dividend Equity ETF', 'https://example.com/schd', '美股')
+    etf_list.remove_etf('SZ159915')
+
+    alerts = AlertHistoryStorage(make_table('alert_history'))
+    alerts.add_alert(7, '[+3%~+5%]', 2.2, 2.1)
+
+    return {
+        'history': without_time(prices.get_history_between(etf_code='SZ159915')),
+        'latest_price': prices.get_latest_price(),
+        'transactions': transactions.get_all_etf_transactions(),
+        'transaction': transactions.get_etf_transaction('SZ159915'),
+        'etfs': without_time(etf_list.get_all_etfs().values()),
+        'groups': etf_list.get_groups(),
+        'alerts': without_time(alerts.table.read_all()),
+    }
+
+
+def test_backends_return_the_same_results(tmp_path, database):
+    csv_result = run_scenario(lambda name: CSVStorage(str(tmp_path / f'{name}.csv')))
+    sqlite_result = run_scenario(lambda name: SQLiteStorage(name, database))
+
+    assert sqlite_result == csv_result
+    assert csv_result['history'] == [{'id': '1', 'etf_code': 'SZ159915', 'etf_name': '创业板ETF', 'price': '2.35'}]
+
+
+def test_missing_columns_are_added_to_old_databases(tmp_path):
+    path = tmp_path / 'old.db'
+    conn = sqlite3.connect(str(path))
+    conn.execute('CREATE TABLE user_transactions (etf_code TEXT, transaction_price REAL, '
+                 'transaction_quantity INTEGER, updated_at TEXT)')
+    conn.execute("INSERT INTO user_transactions VALUES ('SZ159915', 2.0, 1000, '')")
+    conn.commit()
+    conn.close()
+
+    transactions = ETFTransactionStorage(SQLiteStorage('user_transactions', SQLiteDatabase(str(path))))
+    assert transactions.get_etf_transaction('SZ159915')['id'] is None
+    assert transactions.assign_missing_ids() == 1
+    assert transactions.get_etf_transaction('SZ159915')['id'] == 1
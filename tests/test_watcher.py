@@ -0,0 +1,131 @@
+"""监控模式：每轮获取最新价格，提醒按交易记录 ID 持久化去重"""
+
+import pytest
+
+from src import alert, watcher
+from src.quote import Quote
+from src.storage import (
+    AlertHistoryStorage, AlertStatusStorage, CSVStorage, ETFListStorage, ETFTransactionStorage, PriceHistoryStorage
+)
+from src.watcher import PriceWatcher
+
+
+class FakePrices:
+    """代替 fetch_etf_prices，返回预设价格并记录调用参数"""
+
+    def __init__(self):
+        self.prices = {}
+        self.calls = []
+
+    def __call__(self, etf_codes, force_refresh=False):
+        self.calls.append(force_refresh)
+        return {code: Quote(code, f'名称{code}', self.prices[code]) if code in self.prices else None
+                for code in etf_codes}
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    def table(name):
+        return CSVStorage(str(tmp_path / f'{name}.csv'))
+
+    etf_list = ETFListStorage(table('etf_list'))
+    etf_list.add_etf('SZ159915', '创业板ETF', '', 'A股')
+    transactions = ETFTransactionStorage(table('user_transactions'))
+    history = AlertHistoryStorage(table('alert_history'))
+    prices = FakePrices()
+
+    monkeypatch.setattr(watcher, 'etf_list_storage', etf_list)
+    monkeypatch.setattr(watcher, 'etf_transaction_storage', transactions)
+    monkeypatch.setattr(watcher, 'price_storage', PriceHistoryStorage(table('price_history')))
+    monkeypatch.setattr(watcher, 'fetch_etf_prices', prices)
+    monkeypatch.setattr(alert, 'alert_status_storage', AlertStatusStorage(table('alert_status')))
+    monkeypatch.setattr(alert, 'alert_history_storage', history)
+    return {'prices': prices, 'transactions': transactions, 'history': history, 'table': table}
+
+
+def test_cycles_request_fresh_quotes(env):
+    env['prices'].prices['SZ159915'] = 2.0
+    PriceWatcher(1).run_cycle()
+    assert env['prices'].calls == [True]
+
+
+def test_alert_is_recorded_once_with_integer_transaction_id(env):
+    transaction_id = env['transactions'].save_etf_transaction('SZ159915', 2.0, 1000)
+    env['prices'].prices['SZ159915'] = 2.07
+    price_watcher = PriceWatcher(1)
+
+    price_watcher.run_cycle()
+    env['prices'].prices['SZ159915'] = 2.08
+    price_watcher.run_cycle()
+
+    alerts = env['history'].table.read_all()
+    assert len(alerts) == 1
+    assert alerts[0]['transaction_id'] == str(transaction_id)
+    assert alerts[0]['alert_type'] == '[+3% ~ +5%]'
+
+
+def test_restart_does_not_repeat_alert(env):
+    env['transactions'].save_etf_transaction('SZ159915', 2.0, 1000)
+    env['prices'].prices['SZ159915'] = 2.07
+    PriceWatcher(1).run_cycle()
+
+    # 新的监控进程没有内存中的状态，依靠持久化的提醒状态去重
+    PriceWatcher(1).run_cycle()
+
+    assert len(env['history'].table.read_all()) == 1
+
+
+def test_transaction_change_is_evaluated_without_price_change(env):
+    env['transactions'].save_etf_transaction('SZ159915', 2.0, 1000)
+    env['prices'].prices['SZ159915'] = 2.07
+    price_watcher = PriceWatcher(1)
+    price_watcher.run_cycle()
+
+    # 价格不变，但用户更新了交易价格，进入新的区间
+    env['transactions'].save_etf_transaction('SZ159915', 2.16, 1000)
+    price_watcher.run_cycle()
+
+    alerts = env['history'].table.read_all()
+    assert [row['alert_type'] for row in alerts] == ['[+3% ~ +5%]', '[-5% ~ -3%]']
+    assert alerts[0]['transaction_id'] != alerts[1]['transaction_id']
+
+
+def test_legacy_transactions_get_ids(env):
+    legacy = env['table']('user_transactions')
+    legacy.delete()
+    legacy.append({'etf_code': 'SZ159915', 'transaction_price': 2.0, 'transaction_quantity': 1000,
+                   'updated_at': ''}, ['etf_code', 'transaction_price', 'transaction_quantity', 'updated_at'])
+    env['prices'].prices['SZ159915'] = 2.07
+
+    PriceWatcher(1).run_cycle()
+
+    assert env['transactions'].get_etf_transaction('SZ159915')['id'] == 1
+    assert env['history'].table.read_all()[0]['transaction_id'] == '1'
+
+
+def test_unchanged_alert_state_is_not_appended(env):
+    env['transactions'].save_etf_transaction('SZ159915', 2.0, 1000)
+    price_watcher = PriceWatcher(1)
+    for price in (2.07, 2.08, 2.09, 2.20, 2.21, 2.07):
+        env['prices'].prices['SZ159915'] = price
+        price_watcher.run_cycle()
+
+    # 只有状态变化时写入: 进入区间、离开区间、重新进入区间
+    status_rows = alert.alert_status_storage.table.read_all()
+    assert [row['in_range'] for row in status_rows] == ['true', 'false', 'true']
+    assert len(env['history'].table.read_all()) == 2
+
+
+def test_alert_status_reloads_after_foreign_write(env):
+    storage = alert.alert_status_storage
+    storage.update_status(1, 2.07, True, '[+3% ~ +5%]', etf_code='SZ159915')
+    assert storage.get_status(1)['in_range'] is True
+
+    # 其他进程写入了新的状态
+    other = AlertStatusStorage(env['table']('alert_status'))
+    other.update_status(1, 2.20, False, etf_code='SZ159915')
+
+    assert storage.get_status(1) == {
+        'last_price': 2.2, 'in_range': False, 'range_type': None,
+        'last_check_time': other.get_status(1)['last_check_time']
+    }